@@ -0,0 +1,45 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import numpy as np  # pip install numpy
+
+# single channel, unpacked pixel formats only. packed formats (Mono12p,
+# Mono10p, ...) must be converted with BufferFactory.convert() first
+_BITS_PER_PIXEL_TO_DTYPE = {
+    8: np.uint8,
+    16: np.uint16,
+    32: np.uint32
+}
+
+
+def dtype_from_bits_per_pixel(bits_per_pixel):
+
+    try:
+        return np.dtype(_BITS_PER_PIXEL_TO_DTYPE[bits_per_pixel])
+    except KeyError:
+        raise ValueError(f'{bits_per_pixel} bits per pixel is not supported, '
+                         f'convert the buffer to Mono8 or Mono16 first')
+
+
+def buffer_as_ndarray(buffer):
+    """
+    zero copy (height, width) view over the image data of a buffer. The view
+    is only valid until the buffer is requeued or destroyed.
+    """
+    dtype = dtype_from_bits_per_pixel(buffer.bits_per_pixel)
+    height = buffer.height
+    width = buffer.width
+
+    array = np.ctypeslib.as_array(buffer.pdata,
+                                  shape=(height * width * dtype.itemsize,))
+    return array.view(dtype).reshape(height, width)
@@ -73,6 +73,14 @@ class Device():
         self.__WAIT_ON_EVENT_TIMEOUT_MILLISEC = _WAIT_ON_EVENT_TIMEOUT_MILLISEC_DEFAULT
         self.__DEFAULT_NUM_BUFFERS = _NUM_OF_BUFFERS_DEFAULT
 
+        # nodemap type name -> Nodemap. one instance per nodemap so its node
+        # cache is kept between accesses
+        self.__nodemaps = {}
+
+        # changes whenever the buffers of the stream are allocated or
+        # freed, so a buffer can tell whether it can still be requeued
+        self._stream_id = 0
+
     def __str__(self):
 
         ip_int = self.tl_device_nodemap.get_node('GevDeviceIPAddress').value
@@ -348,6 +356,7 @@ class Device():
         # dont move into the __init__ of the cntxmngr because self will
         # refer to the cntxmngr class instead of device
         self.__number_of_buffers_when_stream_started = number_of_buffers
+        self._stream_id += 1
 
         class start_stream_cntxmngr():
 
@@ -411,6 +420,7 @@ class Device():
         if self.__number_of_buffers_when_stream_started != -1:
             self._xdev.xDeviceStopStream()
             self.__number_of_buffers_when_stream_started = -1
+            self._stream_id += 1
 
     # get_buffer ----------------------------------------------------------
 
@@ -858,13 +868,33 @@ class Device():
 
     # ---------------------------------------------------------------------
 
-    def __get_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetNodeMap()
-        nodemap = _nodemap.Nodemap(hxnodemap)
+    def __get_cached_nodemap(self, nodemap_type_name, xget_nodemap):
+        try:
+            return self.__nodemaps[nodemap_type_name]
+        except KeyError:
+            pass
 
-        nodemap._nodemap_type_name = 'device_nodemap'
+        nodemap = _nodemap.Nodemap(xget_nodemap())
+        nodemap._nodemap_type_name = nodemap_type_name
+        self.__nodemaps[nodemap_type_name] = nodemap
         return nodemap
 
+    def _invalidate_nodemaps(self):
+        # called by system.destroy_device(); cached nodes would point to
+        # freed memory once the device is destroyed
+        for nodemap in self.__nodemaps.values():
+            nodemap._invalidate()
+        self.__nodemaps = {}
+
+    def _invalidate_stream(self):
+        # called by system.destroy_device(); the buffers are freed with the
+        # device
+        self._stream_id += 1
+
+    def __get_nodemap(self):
+        return self.__get_cached_nodemap('device_nodemap',
+                                         self._xdev.xDeviceGetNodeMap)
+
     nodemap = property(__get_nodemap)
     """
     used to access a device's complete feature set of nodes.\n
@@ -929,11 +959,8 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_device_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLDeviceNodeMap()
-        nodemap = _nodemap.Nodemap(hxnodemap)
-
-        nodemap._nodemap_type_name = 'device_tl_device_nodemap'
-        return nodemap
+        return self.__get_cached_nodemap('device_tl_device_nodemap',
+                                         self._xdev.xDeviceGetTLDeviceNodeMap)
 
     tl_device_nodemap = property(__get_tl_device_nodemap)
     """
@@ -996,11 +1023,8 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_stream_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLStreamNodeMap()
-        nodemap = _nodemap.Nodemap(hxnodemap)
-
-        nodemap._nodemap_type_name = 'device_tl_stream_nodemap'
-        return nodemap
+        return self.__get_cached_nodemap('device_tl_stream_nodemap',
+                                         self._xdev.xDeviceGetTLStreamNodeMap)
 
     tl_stream_nodemap = property(__get_tl_stream_nodemap)
     """
@@ -1049,11 +1073,8 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_interface_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLInterfaceNodeMap()
-        nodemap = _nodemap.Nodemap(hxnodemap)
-
-        nodemap._nodemap_type_name = 'device_tl_interface_nodemap'
-        return nodemap
+        return self.__get_cached_nodemap('device_tl_interface_nodemap',
+                                         self._xdev.xDeviceGetTLInterfaceNodeMap)
 
     tl_interface_nodemap = property(__get_tl_interface_nodemap)
     """
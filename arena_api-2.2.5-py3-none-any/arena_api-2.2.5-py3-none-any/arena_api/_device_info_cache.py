@@ -0,0 +1,154 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# device info key -> _xSystem function taking the device index, in the
+# order of the keys of system.device_infos dicts
+_FIELDS = {
+    'model': 'xSystemGetDeviceModel',
+    'vendor': 'xSystemGetDeviceVendor',
+    'serial': 'xSystemGetDeviceSerial',
+    'ip': 'xSystemGetDeviceIpAddressStr',
+    'subnetmask': 'xSystemGetDeviceSubnetMaskStr',
+    'defaultgateway': 'xSystemGetDeviceDefaultGatewayStr',
+    'mac': 'xSystemGetDeviceMacAddressStr',
+    'name': 'xSystemGetDeviceUserDefinedName',
+    'version': 'xSystemGetDeviceVersion',
+    'dhcp': 'xSystemIsDeviceDHCPConfigurationEnabled',
+    'presistentip': 'xSystemIsDevicePersistentIpConfigurationEnabled',
+    'lla': 'xSystemIsDeviceLLAConfigurationEnabled'
+}
+
+INDEX_KEYS = ('mac', 'serial', 'ip')
+
+
+class _DeviceEntry:
+    # one enumerated device, its fields are read on first use
+
+    def __init__(self, xsystem, index):
+        self.xsystem = xsystem
+        self.index = index
+        self.fields = {}
+
+    def get(self, key):
+        try:
+            return self.fields[key]
+        except KeyError:
+            value = getattr(self.xsystem, _FIELDS[key])(self.index)
+            self.fields[key] = value
+            return value
+
+    def as_dict(self):
+        return {key: self.get(key) for key in _FIELDS}
+
+
+class DeviceInfoCache:
+    #
+    # the devices enumerated by the system. the list is read again only
+    # when acSystemUpdateDevicesHasChanged reports a change or after
+    # invalidate(); until then every device info is read once, a field at
+    # a time as it is used, and lookups by mac, serial or ip go through
+    # dicts built on first use
+    #
+
+    def __init__(self, xsystem):
+        self.__xsystem = xsystem
+        self.__lock = threading.RLock()
+        self.__entries = None
+        self.__indexes = {}
+        self.__infos = None
+        self.__updated_at = None
+        self.__is_stale = False
+
+    def invalidate(self):
+        # the entries stay usable to create devices until the next update
+        with self.__lock:
+            self.__is_stale = True
+
+    def is_empty(self):
+        return self.__entries is None
+
+    def __update_devices(self, timeout_millisec, per_interface):
+        # with several interfaces each one is updated on its own thread, so
+        # the discovery timeouts overlap instead of adding up. the ArenaC
+        # calls release the GIL
+        number_of_interfaces = self.__xsystem.xSystemGetNumInterfaces() \
+            if per_interface else 0
+        if number_of_interfaces < 2:
+            return self.__xsystem.xSystemUpdateDevicesHasChanged(
+                timeout_millisec)
+
+        def update_devices_on_interface(index):
+            return self.__xsystem.xSystemUpdateDevicesOnInterface(
+                index, timeout_millisec)
+
+        with ThreadPoolExecutor(max_workers=number_of_interfaces) as pool:
+            has_changed = list(pool.map(update_devices_on_interface,
+                                        range(number_of_interfaces)))
+        return any(has_changed)
+
+    def update(self, timeout_millisec, max_age_sec=0.0, per_interface=False):
+        """
+        Asks the system for changes, unless the last update is younger
+        than max_age_sec. Returns True if the devices were read again.
+        """
+        with self.__lock:
+            is_cached = self.__entries is not None and not self.__is_stale
+            if is_cached and \
+                    time.monotonic() - self.__updated_at < max_age_sec:
+                return False
+
+            has_changed = self.__update_devices(timeout_millisec,
+                                                per_interface)
+            self.__updated_at = time.monotonic()
+            if is_cached and not has_changed:
+                return False
+
+            number_of_devices = self.__xsystem.xSystemGetNumDevices()
+            self.__entries = [_DeviceEntry(self.__xsystem, index)
+                              for index in range(number_of_devices)]
+            self.__indexes = {}
+            self.__infos = None
+            self.__is_stale = False
+            return True
+
+    def device_infos(self):
+        # a copy, so user changes do not reach the cache
+        with self.__lock:
+            if self.__entries is None:
+                return []
+            if self.__infos is None:
+                self.__infos = [entry.as_dict() for entry in self.__entries]
+            return [dict(info) for info in self.__infos]
+
+    def __get_index(self, key):
+        index = self.__indexes.get(key)
+        if index is None:
+            index = {entry.get(key): entry for entry in self.__entries}
+            self.__indexes[key] = index
+        return index
+
+    def find(self, key, value):
+        """
+        Entry of the device whose key is value, or None.
+        """
+        if key not in INDEX_KEYS:
+            raise ValueError(f'devices can be found by {INDEX_KEYS} '
+                             f'instead of \'{key}\'')
+        with self.__lock:
+            if self.__entries is None:
+                return None
+            return self.__get_index(key).get(value)
@@ -11,6 +11,8 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 import enum
+from collections import namedtuple
+from types import MappingProxyType
 
 from arena_api import _node_helpers
 from arena_api import enums as _enums
@@ -57,14 +59,18 @@ def __base_node__repr__(node):
 
 
 class Node():
+    # nodes are created by the thousand when walking categories, slots keep
+    # them small. __weakref__ lets caches hold them weakly
+    __slots__ = ('xnode', '__weakref__')
+    # typed nodes wrap their acNode once, with the _x class of their type,
+    # and keep their typed attribute, like xinteger, as the same object
+    _xnode_class = _xNode
 
     def __repr__(self):
         return __base_node__repr__(self)
 
     def __init__(self, xhnode):
-        self.xnode = _xNode(xhnode)
-        self.__child_nodes = {}
-        self.__parent_nodes = {}
+        self.xnode = self._xnode_class(xhnode)
 
     def __eq__(self, other):
         # for testing sometimes we dont need the same node when we choose
@@ -295,10 +301,12 @@ class Node():
 
 
 class NodeString(Node):
+    __slots__ = ('xstring',)
+    _xnode_class = _xString
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xstring = _xString(hxnode)
+        self.xstring = self.xnode
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -335,6 +343,8 @@ class NodeString(Node):
 
 
 class NodeInteger(Node):
+    __slots__ = ('xinteger',)
+    _xnode_class = _xInteger
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -376,7 +386,7 @@ class NodeInteger(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xinteger = _xInteger(hxnode)
+        self.xinteger = self.xnode
 
     # TODO SFW-2179
     def __raise_type_error_if_not_expected_type(self, value, expected_type):
@@ -450,6 +460,8 @@ class NodeInteger(Node):
 
 
 class NodeFloat(Node):
+    __slots__ = ('xfloat',)
+    _xnode_class = _xFloat
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -491,7 +503,7 @@ class NodeFloat(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xfloat = _xFloat(hxnode)
+        self.xfloat = self.xnode
 
     # TODO SFW-2179
     # TODO SFW-2537
@@ -584,6 +596,8 @@ class NodeFloat(Node):
 
 
 class NodeBoolean(Node):
+    __slots__ = ('xboolean',)
+    _xnode_class = _xBoolean
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -600,7 +614,7 @@ class NodeBoolean(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xboolean = _xBoolean(hxnode)
+        self.xboolean = self.xnode
 
     # TODO SFW-2179
     def __raise_type_error_if_not_expected_type(self, value, expected_type):
@@ -621,7 +635,19 @@ class NodeBoolean(Node):
     value = property(__get_value, __set_value)
 
 
+# read only tables of the entries of an enumeration node. they hold what
+# does not change for the life of the node: the entries and their int
+# values and handles, not which entries are available
+_EnumentryTable = namedtuple(
+    '_EnumentryTable',
+    ['symbolic_to_int', 'int_to_symbolic', 'hxentries'])
+
+_AVAILABLE_ACCESS_MODES = (_enums.AccessMode.RO, _enums.AccessMode.RW)
+
+
 class NodeEnumeration(Node):
+    __slots__ = ('xenumeration', '__enumentry_table', '__enumentry_nodes')
+    _xnode_class = _xEnumeration
 
     def __repr__(self):
 
@@ -654,9 +680,9 @@ class NodeEnumeration(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xenumeration = _xEnumeration(hxnode)
-        self.__entries_names = []
-        self.__entries_nodes = {}
+        self.xenumeration = self.xnode
+        self.__enumentry_table = None
+        self.__enumentry_nodes = None
 
     # value ---------------------------------------------------------------
 
@@ -696,9 +722,104 @@ class NodeEnumeration(Node):
 
     value = property(__get_value, __set_value)
 
+    # enumentry table -----------------------------------------------------
+
+    def __build_enumentry_table(self):
+        xenumeration = self.xenumeration
+        symbolic_to_int = {}
+        int_to_symbolic = {}
+        hxentries = {}
+        for index in range(xenumeration.xEnumerationGetNumEntries()):
+            hxentry, _ = \
+                xenumeration.xEnumerationGetEntryAndAccessModeByIndex(index)
+            xentry = _xEnumentry(hxentry)
+            symbolic = xentry.xEnumEntryGetSymbolic()
+            int_value = xentry.xEnumEntryGetIntValue()
+
+            symbolic_to_int[symbolic] = int_value
+            int_to_symbolic[int_value] = symbolic
+            hxentries[symbolic] = hxentry
+
+        return _EnumentryTable(MappingProxyType(symbolic_to_int),
+                               MappingProxyType(int_to_symbolic),
+                               hxentries)
+
+    def __get_enumentry_table(self):
+        if self.__enumentry_table is None:
+            self.__enumentry_table = self.__build_enumentry_table()
+        return self.__enumentry_table
+
+    def refresh_enumentries(self):
+        """
+        Drops the cached entry tables so they are read again on next use.
+        The tables only hold the entries and their int values, the
+        availability of the entries is always read live, so this is only
+        needed if the node map itself was reloaded.
+        """
+        self.__enumentry_table = None
+        self.__enumentry_nodes = None
+
+    def __get_symbolic_to_int(self):
+        return self.__get_enumentry_table().symbolic_to_int
+
+    symbolic_to_int = property(__get_symbolic_to_int)
+    """
+    A read only mapping of every entry symbolic to its int value. Cached,
+    see ``refresh_enumentries()``.
+    """
+
+    def __get_int_to_symbolic(self):
+        return self.__get_enumentry_table().int_to_symbolic
+
+    int_to_symbolic = property(__get_int_to_symbolic)
+    """
+    A read only mapping of every entry int value to its symbolic. Cached,
+    see ``refresh_enumentries()``.
+    """
+
+    def is_enumentry_available(self, symbolic):
+        """
+        **Returns**:
+            - ``True`` if the entry exists and is currently readable, \
+            read from the entry node only.
+        """
+        hxentry = self.__get_enumentry_table().hxentries.get(symbolic)
+        if hxentry is None:
+            return False
+        return _xNode(hxentry).xNodeGetAccessMode() in _AVAILABLE_ACCESS_MODES
+
+    # int_value -----------------------------------------------------------
+
+    def __get_int_value(self):
+        symbolic = self.xenumeration.xEnumerationGetCurrentSymbolic()
+        return self.__get_enumentry_table().symbolic_to_int[symbolic]
+
+    def __set_int_value(self, int_value):
+        if not isinstance(int_value, int) or isinstance(int_value, bool):
+            raise TypeError(f'int expected instead of '
+                            f'{type(int_value).__name__}')
+        if int_value not in self.__get_enumentry_table().int_to_symbolic:
+            raise ValueError(f'\n{int_value} is not the int value of an '
+                             f'enumentry\nenumentries int values for this '
+                             f'node are:\n'
+                             f'\t{dict(self.int_to_symbolic)}')
+        self.xenumeration.xEnumerationSetByIntValue(int_value)
+
+    int_value = property(__get_int_value, __set_int_value)
+    """
+    The int value of the current entry. Setting it skips the symbolic
+    string round trip of ``value``, which suits enumerations switched
+    often such as selectors.
+
+    >>> pixel_format = nodemap['PixelFormat']
+    >>> mono8 = pixel_format.symbolic_to_int['Mono8']
+    >>> pixel_format.int_value = mono8
+    """
+
     # enumentry_names -----------------------------------------------------
     def __get_enumentry_names(self):
-
+        # read live, the available entries change with other features, for
+        # example PixelFormat with binning
         num_of_entries = self.xenumeration.xEnumerationGetNumSymbbolics()
         entries_names = map(self.xenumeration.xEnumerationGetSymbolicByIndex,
                             range(num_of_entries))
@@ -708,11 +829,22 @@ class NodeEnumeration(Node):
 
     # enumentry_nodes -----------------------------------------------------
     def __get_enumentry_nodes(self):
+        # the available entries are read live, their node instances are
+        # created once
+        if self.__enumentry_nodes is None:
+            self.__enumentry_nodes = {}
         entries_nodes = {}
         for enum_name in self.enumentry_names:
-            hxentry_node = self.xenumeration.xEnumerationGetEntryByName(
-                enum_name)
-            enum_entry_node = NodeEnumentry(hxentry_node)
+            enum_entry_node = self.__enumentry_nodes.get(enum_name)
+            if enum_entry_node is None:
+                hxentry_node = self.__get_enumentry_table().hxentries.get(
+                    enum_name)
+                if hxentry_node is None:
+                    hxentry_node = \
+                        self.xenumeration.xEnumerationGetEntryByName(
+                            enum_name)
+                enum_entry_node = NodeEnumentry(hxentry_node)
+                self.__enumentry_nodes[enum_name] = enum_entry_node
             entries_nodes[enum_name] = enum_entry_node
         return entries_nodes
 
@@ -720,6 +852,9 @@ class NodeEnumeration(Node):
 
 
 class NodeEnumentry(Node):
+    __slots__ = ('xenumentry',)
+    _xnode_class = _xEnumentry
+
     # needs more design thoughts
     def __repr__(self):
 
@@ -737,7 +872,7 @@ class NodeEnumentry(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xenumentry = _xEnumentry(hxnode)
+        self.xenumentry = self.xnode
 
     # ---------------------------------------------------------------------
     # overrides the base calss , node , name property because enums needs
@@ -762,6 +897,9 @@ class NodeEnumentry(Node):
 
 
 class NodeCategory(Node):
+    __slots__ = ('xcategory',)
+    _xnode_class = _xCategory
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
 
@@ -777,7 +915,7 @@ class NodeCategory(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xcategory = _xCategory(hxnode)
+        self.xcategory = self.xnode
 
     def __get_features(self):
         features_nodes = {}
@@ -798,6 +936,8 @@ class NodeCategory(Node):
 # TODO SFW-2185
 # TODO SFW-2117
 class NodeRegister(Node):
+    __slots__ = ('xregister',)
+    _xnode_class = _xRegister
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -805,7 +945,7 @@ class NodeRegister(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xregister = _xRegister(hxnode)
+        self.xregister = self.xnode
 
     def get(self, register_length):
         if not isinstance(register_length, int):
@@ -824,6 +964,8 @@ class NodeRegister(Node):
 
 
 class NodeCommand(Node):
+    __slots__ = ('xcommand',)
+    _xnode_class = _xCommand
 
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
@@ -831,7 +973,7 @@ class NodeCommand(Node):
 
     def __init__(self, hxnode):
         super().__init__(hxnode)
-        self.xcommand = _xCommand(hxnode)
+        self.xcommand = self.xnode
 
     def execute(self):
         # Excutes the command node
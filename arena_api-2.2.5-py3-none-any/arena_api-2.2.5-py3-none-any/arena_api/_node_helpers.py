@@ -14,12 +14,79 @@
 from arena_api import _node
 from arena_api.enums import InterfaceType as _InterfaceType
 
+# nodes whose value changes the range or availability of other nodes are
+# written before them. nodes not listed are written after, in the order
+# they are given. selectors not listed are placed by
+# sort_selectors_first() from what the node map reports
+_WRITE_ORDER = (
+    'TriggerSelector',
+    'TriggerMode',
+    'TriggerSource',
+    'TriggerActivation',
+    'BinningSelector',
+    'BinningHorizontalMode',
+    'BinningVerticalMode',
+    'BinningHorizontal',
+    'BinningVertical',
+    'DecimationHorizontal',
+    'DecimationVertical',
+    'PixelFormat',
+    # Width/OffsetX and Height/OffsetY are swapped when growing the size
+    # needs the offset to shrink first
+    'Width',
+    'OffsetX',
+    'Height',
+    'OffsetY',
+    'ExposureAuto',
+    'ExposureTime',
+    'GainAuto',
+    'Gain',
+    'AcquisitionFrameRateEnable',
+    'AcquisitionFrameRate'
+)
+_WRITE_RANK = {name: rank for rank, name in enumerate(_WRITE_ORDER)}
+
+
+def sort_in_write_order(nodes_names):
+    # stable, so unlisted names keep their order
+    return sorted(nodes_names,
+                  key=lambda name: _WRITE_RANK.get(name, len(_WRITE_ORDER)))
+
+
+def sort_selectors_first(nodes_names, selected_features):
+    # selected_features maps a selector name to the names of the features
+    # it selects. each selector is moved before the first feature it
+    # selects, chained selectors before theirs, the rest keeps its order
+    selectors_names = {}
+    for selector_name, features_names in selected_features.items():
+        for feature_name in features_names:
+            selectors_names.setdefault(feature_name, []).append(
+                selector_name)
+
+    given = set(nodes_names)
+    placed = set()
+    ordered = []
+
+    def place(name):
+        if name in placed:
+            return
+        placed.add(name)
+        for selector_name in selectors_names.get(name, ()):
+            if selector_name in given:
+                place(selector_name)
+        ordered.append(name)
+
+    for name in nodes_names:
+        place(name)
+    return ordered
+
 
 def cast_from_general_node_to_specific_node_type(base_node):
 
     node_type = base_node.interface_type
     specific_node = None
-    hxnode = base_node.xnode.hxnode.value
+    # the acNode itself, so the specific node shares it
+    hxnode = base_node.xnode.hxnode
 
     # string node
     if node_type == _InterfaceType.STRING:
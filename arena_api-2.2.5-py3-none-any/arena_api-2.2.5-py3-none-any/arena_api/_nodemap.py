@@ -12,11 +12,19 @@
 # -----------------------------------------------------------------------------
 
 import difflib
+import enum
+from collections import namedtuple
 
 from arena_api import _node_helpers, _node
+from arena_api.enums import AccessMode as _AccessMode
+from arena_api.enums import InterfaceType as _InterfaceType
+from arena_api._xlayer.xarena._xnode import _xCategory, _xNode, _xSelector
 from arena_api._xlayer.xarena._xnodemap import _xNodemap
 from arena_api._xlayer.xarena._xfeaturestream import _xFeaturestream
 
+_FeatureIndexEntry = namedtuple(
+    '_FeatureIndexEntry', ['name', 'interface_type', 'index', 'category'])
+
 
 class Nodemap():
     """
@@ -30,6 +38,26 @@ class Nodemap():
         self.__xnodemap = _xNodemap(xhnodemap)
         self.DEFAULT_POLL_TIME_MILLISEC = 1000
         self._nodemap_type_name = 'default_name_nodemap'
+        # node name -> typed node. node handles stay valid until the device
+        # is destroyed, which clears this cache
+        self.__node_cache = {}
+        # node name -> _xNodemap value function, filled from the type of
+        # the cached node the first time a name is used by get_values()
+        # or set_values()
+        self.__value_getters = {}
+        self.__value_setters = {}
+        # feature name -> _FeatureIndexEntry, built on first use
+        self.__feature_index = None
+        # node name -> names of the features it selects, empty when the
+        # node is not a selector
+        self.__selected_features = {}
+        # mistyped name -> suggestions
+        self.__suggestions = {}
+        # incremented when the caches above are cleared, so what was
+        # derived from them elsewhere, like a ConfigPlan order, is too
+        self.__cache_generation = 0
+        # False once the device that owns the nodemap is destroyed
+        self.__is_valid = True
 
     def __repr__(self):
         return str(self.feature_names)
@@ -128,35 +156,86 @@ class Nodemap():
         # TODO SFW-2286
         return self.__xnodemap.xNodeMapTryLock()
 
+    # feature index -------------------------------------------------------
+
+    def __build_feature_index(self):
+        xnodemap = self.__xnodemap
+        features = []
+        categories = {}
+        for node_index in range(xnodemap.xNodeMapGetNumNodes()):
+            hxnode = xnodemap.xNodeMapGetNodeByIndex(node_index)
+            xnode = _xNode(hxnode)
+            if not xnode.xNodeIsFeature():
+                continue
+            name = xnode.xNodeGetName()
+            interface_type = _InterfaceType(
+                xnode.xNodeGetPrincipalInterfaceType())
+            features.append((name, interface_type, node_index))
+
+            if interface_type == _InterfaceType.CATEGORY:
+                xcategory = _xCategory(hxnode)
+                for feature_index in range(
+                        xcategory.xCategoryGetNumFeatures()):
+                    hxfeature = xcategory.xCategoryGetFeature(feature_index)
+                    categories.setdefault(_xNode(hxfeature).xNodeGetName(),
+                                          name)
+
+        return {
+            name: _FeatureIndexEntry(name, interface_type, node_index,
+                                     categories.get(name))
+            for name, interface_type, node_index in sorted(features)
+        }
+
+    def __get_feature_index(self):
+        if self.__feature_index is None:
+            self.__feature_index = self.__build_feature_index()
+        return self.__feature_index
+
+    feature_index = property(__get_feature_index)
+    """
+    A ``dict`` of feature name to a named tuple of ``name``,
+    ``interface_type``, ``index`` and ``category``, sorted by name.
+    ``category`` is the name of the category node the feature is listed
+    under, or ``None`` for the root category.
+
+    :getter: Returns the index, it is built the first time it is used.
+    :type: ``dict``. Do not modify it.\n
+
+    :warning:\n
+    - the index is not rebuilt by itself, call ``refresh()`` after \
+    loading a different device XML.
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def refresh(self):
+        """
+        Drops the feature index and the cached nodes so they are read
+        again from the node map on next use.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        self._clear_node_cache()
+
     # feature_names -------------------------------------------------------
 
     def __get_feature_names(self):
-        # have to read it everytime because some features might become
-        # unavailable under certain settings
-        num_of_nodes = self.__xnodemap.xNodeMapGetNumNodes()
-        nodes_names = []
-        for node_index in range(num_of_nodes):
-            hxnode = self.__xnodemap.xNodeMapGetNodeByIndex(node_index)
-            node_ = _node.Node(hxnode)
-            if node_.is_feature:
-                specific_node = _node_helpers.cast_from_general_node_to_specific_node_type(
-                    node_)
-                nodes_names.append(specific_node.name)
-
-        return sorted(nodes_names)
+        return list(self.__get_feature_index())
 
     feature_names = property(__get_feature_names)
     """
     A ``list`` of feature nodes' names.
     
-    :getter: Returns the current default number of buffers.
+    :getter: Returns the sorted feature names from ``feature_index``.
     :type: ``list`` of ``str``.\n
 
     :warning:\n
-    - any node becomes unavailable would not show in the \
-    feature_names list.\n
-    - expensive to call because ``arena_api`` acquires all nodes\
-    in the node map then check if ``_node.is_feature`` evaluates to true.
+    - the names include features that are currently unavailable, \
+    check ``is_readable``/``is_writable`` of the node before using it.
     **------------------------------------------------------------------**\
     **-------------------------------------------------------------------**
     """
@@ -255,6 +334,11 @@ class Nodemap():
     def __get_node(self, node_name):
 
         # input is already checked if it is a str or not
+        try:
+            return self.__node_cache[node_name]
+        except KeyError:
+            pass
+
         hxnode = self.__xnodemap.xNodeMapGetNode(node_name)
 
         if not hxnode:
@@ -273,12 +357,486 @@ class Nodemap():
         node_ = _node.Node(hxnode)
         specific_node = _node_helpers.cast_from_general_node_to_specific_node_type(
             node_)
+        self.__node_cache[node_name] = specific_node
         return specific_node
 
+    def _clear_node_cache(self):
+        # called by refresh() and when the device that owns the nodemap is
+        # destroyed
+        self.__node_cache.clear()
+        self.__value_getters.clear()
+        self.__value_setters.clear()
+        self.__feature_index = None
+        self.__selected_features.clear()
+        self.__suggestions.clear()
+        self.__cache_generation += 1
+
+    def _get_cache_generation(self):
+        return self.__cache_generation
+
+    def _invalidate(self):
+        # called by system.destroy_device(), the handles of the nodemap
+        # point to freed memory
+        self.__is_valid = False
+        self._clear_node_cache()
+
+    def _is_valid(self):
+        return self.__is_valid
+
+    # get_values / set_values ---------------------------------------------
+
+    def __get_value_getter(self, node_name):
+        try:
+            return self.__value_getters[node_name]
+        except KeyError:
+            pass
+
+        node_ = self.__get_node(node_name)
+        xnodemap = self.__xnodemap
+        if isinstance(node_, _node.NodeInteger):
+            getter = xnodemap.xNodeMapGetIntegerValue
+        elif isinstance(node_, _node.NodeFloat):
+            getter = xnodemap.xNodeMapGetFloatValue
+        elif isinstance(node_, _node.NodeBoolean):
+            getter = xnodemap.xNodeMapGetBooleanValue
+        elif isinstance(node_, _node.NodeString):
+            getter = xnodemap.xNodeMapGetStringValue
+        elif isinstance(node_, _node.NodeEnumeration):
+            getter = xnodemap.xNodeMapGetEnumerationValue
+        else:
+            raise TypeError(f'\'{node_name}\' is a '
+                            f'{type(node_).__name__}, it has no value')
+
+        self.__value_getters[node_name] = getter
+        return getter
+
+    def __get_value_setter(self, node_name):
+        try:
+            return self.__value_setters[node_name]
+        except KeyError:
+            pass
+
+        node_ = self.__get_node(node_name)
+        xnodemap = self.__xnodemap
+        if isinstance(node_, _node.NodeInteger):
+            setter = (int, xnodemap.xNodeMapSetIntegerValue)
+        elif isinstance(node_, _node.NodeFloat):
+            setter = (float, xnodemap.xNodeMapSetFloatValue)
+        elif isinstance(node_, _node.NodeBoolean):
+            setter = (bool, xnodemap.xNodeMapSetBooleanValue)
+        elif isinstance(node_, _node.NodeString):
+            setter = (str, xnodemap.xNodeMapSetStringValue)
+        elif isinstance(node_, _node.NodeEnumeration):
+            setter = (str, xnodemap.xNodeMapSetEnumerationValue)
+        elif isinstance(node_, _node.NodeCommand):
+            setter = (bool, None)
+        else:
+            raise TypeError(f'\'{node_name}\' is a '
+                            f'{type(node_).__name__}, it can not be set')
+
+        self.__value_setters[node_name] = setter
+        return setter
+
+    def get_values(self, nodes_names):
+        """
+        Reads the values of multiple nodes in one call, with the node map
+        locked for the whole batch. Values are read through the node map
+        directly, so no node instance is created after the first call for
+        a given name.
+
+        **Args**:
+            nodes_names :
+                - a ``list`` or ``tuple`` of ``str``.
+
+        **Raises**:
+            - ``ValueError`` :
+                - a name does not match any node in this node map.
+            - ``TypeError`` :
+                - a node has no value, a category or command node for \
+                example.
+
+        **Returns**:
+            - a ``dict`` that has node name as a key and the node value \
+            as the value. Enumeration values are the symbolic ``str``.
+
+        >>> values = device.nodemap.get_values(['Width', 'Height',
+        >>>                                     'PixelFormat'])
+        >>> print(values)
+        {'Width': 1280, 'Height': 1024, 'PixelFormat': 'Mono8'}
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        """
+        if not isinstance(nodes_names, (list, tuple)):
+            raise TypeError(f'expected list or tuple instead of '
+                            f'{type(nodes_names).__name__}')
+        self.__check__get_nodes_as_dict_input_parameter_nodes_names(
+            nodes_names)
+
+        getters = [(name, self.__get_value_getter(name))
+                   for name in nodes_names]
+
+        values = {}
+        self.__xnodemap.xNodeMapLock()
+        try:
+            for name, getter in getters:
+                values[name] = getter(name)
+        finally:
+            self.__xnodemap.xNodeMapUnlock()
+        return values
+
+    def set_values(self, nodes_values):
+        """
+        Writes the values of multiple nodes in one call, in the order of
+        ``nodes_values``, with the node map locked for the whole batch.
+        Command nodes are executed when their value is ``True``.
+
+        **Args**:
+            nodes_values :
+                - a ``dict`` that has node name as a key and the value \
+                to set as the value. Enumeration values can be a ``str``, \
+                an enumentry node or an ``enum`` member.
+
+        **Raises**:
+            - ``ValueError`` :
+                - a name does not match any node in this node map.
+            - ``TypeError`` :
+                - a value type does not match its node type. Nothing is \
+                written when this is raised.
+
+        **Returns**:
+            - ``None``.
+
+        >>> device.nodemap.set_values({'Width': 640,
+        >>>                            'Height': 480,
+        >>>                            'PixelFormat': 'Mono8',
+        >>>                            'ExposureTime': 5000.0})
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        """
+        writes = self.__check_nodes_values(nodes_values)
+
+        self.__xnodemap.xNodeMapLock()
+        try:
+            for name, value, setter in writes:
+                if setter is not None:
+                    setter(name, value)
+                elif value:
+                    self.__xnodemap.xNodeMapExecute(name)
+        finally:
+            self.__xnodemap.xNodeMapUnlock()
+
+    def __check_nodes_values(self, nodes_values):
+        if not isinstance(nodes_values, dict):
+            raise TypeError(f'expected dict instead of '
+                            f'{type(nodes_values).__name__}')
+        self.__check__get_nodes_as_dict_input_parameter_nodes_names(
+            list(nodes_values))
+
+        # check every value before writing any so a bad entry does not
+        # leave the batch half written
+        writes = []
+        for name, value in nodes_values.items():
+            expected_type, setter = self.__get_value_setter(name)
+            if setter is self.__xnodemap.xNodeMapSetEnumerationValue and \
+                    isinstance(value, (_node.NodeEnumentry, enum.Enum)):
+                value = value.name
+            if not isinstance(value, expected_type):
+                raise TypeError(f'\'{name}\' expected '
+                                f'{expected_type.__name__} instead of '
+                                f'{type(value).__name__}')
+            writes.append((name, value, setter))
+        return writes
+
+    # apply ---------------------------------------------------------------
+
+    def __get_selected_features(self, node_name):
+        try:
+            return self.__selected_features[node_name]
+        except KeyError:
+            pass
+
+        xselector = _xSelector(self.__get_node(node_name).xnode.hxnode)
+        selected = ()
+        if xselector.xSelectorIsSelector():
+            selected = tuple(
+                _xNode(xselector.xSelectorGetSelectedFeature(index))
+                .xNodeGetName()
+                for index in range(
+                    xselector.xSelectorGetNumSelectedFeatures()))
+        self.__selected_features[node_name] = selected
+        return selected
+
+    def __sort_writes(self, writes):
+        by_name = {write[0]: write for write in writes}
+        names = _node_helpers.sort_in_write_order(by_name)
+        # a selector, like GainSelector or LineSelector, is written before
+        # the features it selects so they go to the selected entry
+        names = _node_helpers.sort_selectors_first(
+            names, {name: self.__get_selected_features(name)
+                    for name in names})
+        return [by_name[name] for name in names]
+
+    def __swap_sizes_and_offsets(self, writes):
+        # growing the size past its current max needs the offset written
+        # first, the max already accounts for the current offset
+        by_name = {write[0]: write for write in writes}
+        names = [write[0] for write in writes]
+        for size_name, offset_name in (('Width', 'OffsetX'),
+                                       ('Height', 'OffsetY')):
+            if size_name in by_name and offset_name in by_name:
+                size_max = self.__get_node(size_name).max
+                if by_name[size_name][1] > size_max:
+                    size_index = names.index(size_name)
+                    offset_index = names.index(offset_name)
+                    names[size_index], names[offset_index] = \
+                        names[offset_index], names[size_index]
+
+        return [by_name[name] for name in names]
+
+    @staticmethod
+    def __write_in_passes(writes, written):
+        # a write that fails because another node has not been written yet
+        # is retried in the next pass. stops when a pass writes nothing
+        pending = writes
+        while pending:
+            failed = []
+            last_error = None
+            for write in pending:
+                name, value, setter = write
+                try:
+                    setter(name, value)
+                except TypeError:
+                    # invalid parameter, retrying would not help
+                    raise
+                except Exception as error:
+                    failed.append(write)
+                    last_error = error
+                else:
+                    written.append(write)
+            if len(failed) == len(pending):
+                raise last_error
+            pending = failed
+
+    def apply(self, config):
+        """
+        Writes a configuration as one transaction. Only the nodes whose
+        current value differs from ``config`` are written, ordered so that
+        nodes which change the range of other nodes, such as
+        ``PixelFormat`` or ``BinningHorizontal``, are written before them,
+        selectors are written before the features they select,
+        and ``Width``/``OffsetX`` and ``Height``/``OffsetY`` are written in
+        the order their current max allows. A write that fails on a range
+        constraint is retried after the other writes. If a write still
+        fails, the nodes already written are set back to their previous
+        values and the error is raised.\n
+        Costs one read per node in ``config`` plus the ``Width`` and
+        ``Height`` max when offsets are also given.
+
+        **Args**:
+            config :
+                - a ``dict`` that has node name as a key and the value \
+                to set as the value, same as ``set_values()`` without \
+                command nodes.
+
+        **Raises**:
+            - ``TypeError`` :
+                - a value type does not match its node type. Nothing is \
+                written.
+            - the error of the write that failed, after the rollback.
+
+        **Returns**:
+            - a ``dict`` of the previous values of the nodes that were \
+            written. Passing it to ``apply()`` undoes the configuration.
+
+        >>> previous = device.nodemap.apply({'BinningHorizontal': 2,
+        >>>                                  'Width': 640,
+        >>>                                  'OffsetX': 320,
+        >>>                                  'PixelFormat': 'Mono16'})
+        >>> # ...
+        >>> device.nodemap.apply(previous)
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        """
+        writes = self.__check_nodes_values(config)
+        getters = [(name, self.__get_value_getter(name)) for name in config]
+
+        xnodemap = self.__xnodemap
+        xnodemap.xNodeMapLock()
+        try:
+            previous_values = {name: getter(name) for name, getter in getters}
+            return self.__write_transaction(self.__sort_writes(writes),
+                                            previous_values, True)
+        finally:
+            xnodemap.xNodeMapUnlock()
+
+    def __write_transaction(self, writes, previous_values, only_changed):
+        # the node map must be locked by the caller and writes sorted by
+        # __sort_writes(). nodes missing from previous_values could not be
+        # read, they are always written and can not be rolled back
+        if only_changed:
+            writes = [write for write in writes
+                      if write[0] not in previous_values or
+                      previous_values[write[0]] != write[1]]
+        writes = self.__swap_sizes_and_offsets(writes)
+
+        written = []
+        try:
+            self.__write_in_passes(writes, written)
+        except Exception as error:
+            rollback = [(name, previous_values[name], setter)
+                        for name, _, setter in reversed(written)
+                        if name in previous_values]
+            try:
+                self.__write_in_passes(rollback, [])
+            except Exception as rollback_error:
+                raise RuntimeError(
+                    f'failed to roll back {[w[0] for w in rollback]} '
+                    f'after a failed write: {rollback_error}') from error
+            raise
+
+        return {name: previous_values[name] for name, _, _ in written
+                if name in previous_values}
+
+    # config plans --------------------------------------------------------
+
+    def _compile_writes(self, config):
+        # for ConfigPlan: the checked (name, value, setter) writes of
+        # config, the setter of a command is None, and the value getter of
+        # every other node
+        writes = self.__check_nodes_values(config)
+        getters = [(name, self.__get_value_getter(name))
+                   for name, _, setter in writes if setter is not None]
+        return writes, getters
+
+    def _sort_writes(self, writes):
+        # for ConfigPlan: the compiled writes without commands in the order
+        # apply() writes them, before the size and offset swap. it holds
+        # until _get_cache_generation() changes
+        return self.__sort_writes(writes)
+
+    def _replay_writes(self, writes, previous_values):
+        # apply() of writes sorted by _sort_writes(), with previous_values
+        # read by the caller. the node map must be locked by the caller
+        return self.__write_transaction(writes, previous_values, True)
+
+    # snapshot / restore --------------------------------------------------
+
+    def __get_getters_by_interface_type(self):
+        xnodemap = self.__xnodemap
+        return {
+            _InterfaceType.INTEGER: xnodemap.xNodeMapGetIntegerValue,
+            _InterfaceType.FLOAT: xnodemap.xNodeMapGetFloatValue,
+            _InterfaceType.BOOLEAN: xnodemap.xNodeMapGetBooleanValue,
+            _InterfaceType.STRING: xnodemap.xNodeMapGetStringValue,
+            _InterfaceType.ENUMERATION: xnodemap.xNodeMapGetEnumerationValue
+        }
+
+    def snapshot(self):
+        """
+        Reads the value of every feature node that is currently readable
+        and writable, with the node map locked. The result only holds
+        ``int``, ``float``, ``bool`` and ``str`` values so it can be saved
+        with ``json.dump()`` and given back to ``restore()``.\n
+        Only the entry of the current selector value is captured for
+        selected features: with ``GainSelector`` set to ``'All'``,
+        ``Gain`` holds the gain of ``'All'`` only. Take one snapshot per
+        selector value to save the others.
+
+        **Returns**:
+            - a ``dict`` that has node name as a key and the node value \
+            as the value, sorted by name.
+
+        >>> import json
+        >>> with open('scan_profile.json', 'w') as f:
+        >>>     json.dump(device.nodemap.snapshot(), f)
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        """
+        getters = self.__get_getters_by_interface_type()
+        feature_index = self.__get_feature_index()
+        xnodemap = self.__xnodemap
+
+        snapshot = {}
+        xnodemap.xNodeMapLock()
+        try:
+            for name, entry in feature_index.items():
+                getter = getters.get(entry.interface_type)
+                if getter is None:
+                    continue
+                _, access_mode = \
+                    xnodemap.xNodeMapGetNodeByIndexAndAccessMode(entry.index)
+                if access_mode != _AccessMode.RW:
+                    continue
+                snapshot[name] = getter(name)
+        finally:
+            xnodemap.xNodeMapUnlock()
+        return snapshot
+
+    def restore(self, snapshot, only_changed=True):
+        """
+        Writes back a ``snapshot()``. With ``only_changed``, the current
+        values are read first and only the nodes that differ are written,
+        so restoring a profile that is almost active costs one read per
+        node and a few writes. Writes are ordered and retried like
+        ``apply()`` and are rolled back if one keeps failing. Selectors
+        are written before the features they select.
+
+        **Args**:
+            snapshot :
+                - a ``dict`` from ``snapshot()``, or loaded back from \
+                its json.
+            only_changed :
+                - ``False`` writes every node of the snapshot.
+
+        **Raises**:
+            - ``ValueError`` :
+                - a name does not match any node in this node map.
+            - ``TypeError`` :
+                - a value type does not match its node type. Nothing is \
+                written.
+
+        **Returns**:
+            - a ``dict`` of the previous values of the nodes that were \
+            written.
+
+        >>> import json
+        >>> with open('scan_profile.json') as f:
+        >>>     device.nodemap.restore(json.load(f))
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        """
+        writes = self.__check_nodes_values(snapshot)
+        getters = [(name, self.__get_value_getter(name)) for name in snapshot]
+
+        xnodemap = self.__xnodemap
+        xnodemap.xNodeMapLock()
+        try:
+            previous_values = {}
+            for name, getter in getters:
+                try:
+                    previous_values[name] = getter(name)
+                except Exception:
+                    # not readable in the current state, written anyway
+                    pass
+            return self.__write_transaction(self.__sort_writes(writes),
+                                            previous_values, only_changed)
+        finally:
+            xnodemap.xNodeMapUnlock()
+
     def __find_closest_matches_to_node_name(self, find_this):
-        all_nodes_names = self.feature_names
+        try:
+            return self.__suggestions[find_this]
+        except KeyError:
+            pass
+
         close = difflib.get_close_matches(
-            find_this, all_nodes_names, n=16, cutoff=0.15)
+            find_this, self.__get_feature_index(), n=16, cutoff=0.15)
+        self.__suggestions[find_this] = close
         return close
 
     def write_streamable_node_values_to(self, file_name=None):
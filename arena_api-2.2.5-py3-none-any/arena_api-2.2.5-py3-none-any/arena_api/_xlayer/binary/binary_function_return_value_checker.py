@@ -12,27 +12,19 @@
 # -----------------------------------------------------------------------------
 
 
-_error_to_exception_dict = None
-_get_msg_func = None
-
-
 class BinaryFunctionReturnValueChecker:
     def __init__(self, error_to_exception_dict, get_msg_func):
 
-        # very ugly idea , but it works
-        global _error_to_exception_dict, _get_msg_func
-        _error_to_exception_dict = error_to_exception_dict
-        _get_msg_func = get_msg_func
-
-    # must be static
-    @staticmethod
-    def raise_if_error(ret_err, raise_if_error, arguments):
-        # because this is a static function that is used as sort of callback
-        # when the binary function returns we need to expose the global
-        # vars while using it
-        global _error_to_exception_dict, _get_msg_func
+        # kept per checker, not in module globals, so each binary raises
+        # with its own errors. SaveC is configured after ArenaC, when the
+        # first writer or recorder is created
+        self._error_to_exception_dict = error_to_exception_dict
+        self._get_msg_func = get_msg_func
 
-        if _error_to_exception_dict[ret_err]:
+    def raise_if_error(self, ret_err, func, arguments):
+        # used as the errcheck of the binary functions, so it is called
+        # with the returned value, the function and its arguments
+        if self._error_to_exception_dict[ret_err]:
             # not success
-            msg = _get_msg_func(ret_err)
-            raise _error_to_exception_dict[ret_err](msg)
+            msg = self._get_msg_func(ret_err)
+            raise self._error_to_exception_dict[ret_err](msg)
@@ -0,0 +1,120 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import platform
+import struct
+import tempfile
+from pathlib import Path
+
+from arena_api import arena_api_config
+from arena_api._xlayer.info import Info
+
+# bump when the validators change what they accept
+_CACHE_FORMAT = 1
+_CACHE_FILE_NAME = 'binary_validation.json'
+
+
+def _get_cache_dir():
+    info = Info()
+    if info.is_windows:
+        root = (os.environ.get('LOCALAPPDATA') or
+                Path.home() / 'AppData' / 'Local')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(root) / 'arena_api'
+
+
+class BinaryValidationCache:
+    #
+    # remembers binaries that passed BinaryValidator so the next processes
+    # skip the validation. an entry is keyed by the pathname and only used
+    # if the resolved path, size and mtime of the binary, the platform and
+    # the validation config are unchanged. failures are never cached.
+    # any error reading or writing the cache is ignored, the binary is
+    # then validated as if the cache did not exist
+    #
+
+    def __init__(self, config):
+        self._config = config
+        self._enabled = getattr(arena_api_config,
+                                'BINARY_VALIDATION_CACHE', True)
+        self._pathname = None
+        self._fingerprint = self._get_fingerprint()
+        try:
+            self._pathname = _get_cache_dir() / _CACHE_FILE_NAME
+        except (KeyError, RuntimeError):
+            # no home directory to put the cache in
+            self._enabled = False
+
+    def _get_fingerprint(self):
+        # everything that can change the result for the same binary
+        config_items = sorted((key, repr(value))
+                              for key, value in self._config.items())
+        text = repr((_CACHE_FORMAT,
+                     platform.system(),
+                     platform.machine(),
+                     struct.calcsize('P'),
+                     config_items))
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _get_entry(self, pathname):
+        target = os.path.realpath(str(pathname))
+        stat = os.stat(target)
+        return {
+            'target': target,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'fingerprint': self._fingerprint
+        }
+
+    def _read(self):
+        try:
+            with open(str(self._pathname), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def is_valid(self, pathname):
+        if not self._enabled or not pathname:
+            return False
+        try:
+            entry = self._get_entry(pathname)
+        except OSError:
+            return False
+        return self._read().get(str(pathname)) == entry
+
+    def add(self, pathname):
+        if not self._enabled:
+            return
+        try:
+            entries = self._read()
+            entries[str(pathname)] = self._get_entry(pathname)
+
+            # written to a temporary file then renamed so processes
+            # starting at the same time never read a partial file
+            self._pathname.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_pathname = tempfile.mkstemp(
+                dir=str(self._pathname.parent), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(temp_pathname, str(self._pathname))
+            except BaseException:
+                os.remove(temp_pathname)
+                raise
+        except OSError:
+            pass
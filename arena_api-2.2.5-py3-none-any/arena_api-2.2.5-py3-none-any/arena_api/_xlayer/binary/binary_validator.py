@@ -11,6 +11,8 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+from arena_api._xlayer.binary.binary_validation_cache import \
+    BinaryValidationCache
 from arena_api._xlayer.info import Info
 
 _info = Info()
@@ -38,7 +40,6 @@ if _info.is_windows:
 
 if _info.is_linux:
     import os
-    import subprocess
     from pathlib import Path
 
 
@@ -125,38 +126,10 @@ class PlatformValidatorLinux:
             raise ValueError(f'\'{pathname}\' is not a 32-bits ARM binary.')
 
     def _is_arm64_binary(self, pathname):
-
-        cmd_str = f'file {pathname} -L'
-
-        complete_process = subprocess.run(cmd_str,
-                                          shell=True,
-                                          stdout=subprocess.PIPE,
-                                          encoding='utf-8')
-        # output example
-        # temp/lib/libarenac.so: ELF 64-bit LSB shared object, ARM
-        # aarch64, version 1 (SYSV), dynamically linked, BuildID[sha1]=
-        # 682bf5f106153a181e7a381512a442232348d935, not stripped
-        output = complete_process.stdout
-        is_64 = True if ' 64-bit ' in output else False
-        is_arm = True if ' ARM' in output else False
-        return is_64 and is_arm
+        return _info.is_so_64_arm(pathname)
 
     def _is_arm32_binary(self, pathname):
-
-        cmd_str = f'file {pathname} -L'
-
-        complete_process = subprocess.run(cmd_str,
-                                          shell=True,
-                                          stdout=subprocess.PIPE,
-                                          encoding='utf-8')
-        # output example
-        # temp/lib/libarenac.so: ELF 64-bit LSB shared object, ARM
-        # aarch64, version 1 (SYSV), dynamically linked, BuildID[sha1]=
-        # 682bf5f106153a181e7a381512a442232348d935, not stripped
-        output = complete_process.stdout
-        is_32 = True if ' 32-bit ' in output else False
-        is_arm = True if ' ARM' in output else False
-        return is_32 and is_arm
+        return _info.is_so_32_arm(pathname)
 
         # version ---------------------------------------------------------------------
 
@@ -300,6 +273,7 @@ class BinaryValidator:
         self._path_validator = None
         self._platform_validator = None
         self._version_validator = None
+        self._cache = BinaryValidationCache(self._config)
 
         # path
         self._path_validator = PathValidator()
@@ -312,7 +286,13 @@ class BinaryValidator:
             self._version_validator = VersionValidatorLinux(self._config)
 
     def validate(self, pathname):
+        # same binary, platform and config as a previous validation
+        if self._cache.is_valid(pathname):
+            return
+
         # order matter
         self._path_validator.validate(pathname)
         self._platform_validator.validate(pathname)
         self._version_validator.validate(pathname)
+
+        self._cache.add(pathname)
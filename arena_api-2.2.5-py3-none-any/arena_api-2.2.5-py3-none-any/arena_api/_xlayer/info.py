@@ -11,10 +11,23 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+import os
 import platform
 import struct
-import subprocess
-import os
+
+# ELF header -------------------------------------------------------------------
+# e_ident[0:4] magic, e_ident[4] class, e_ident[5] data encoding,
+# e_type at 16, e_machine at 18
+_ELF_MAGIC = b'\x7fELF'
+_ELF_EI_CLASS = 4
+_ELF_EI_DATA = 5
+_ELF_E_MACHINE_OFFSET = 18
+_ELF_HEADER_SIZE = 20
+_ELF_CLASS_TO_BITS = {1: 32, 2: 64}
+_ELF_DATA_TO_BYTE_ORDER = {1: '<', 2: '>'}
+# EM_ARM, EM_AARCH64
+_ELF_MACHINES_ARM = (40, 183)
+
 
 class Info():
 
@@ -63,64 +76,53 @@ class Info():
         return False if ((struct.calcsize('P') * 8) == 32) else True
 
     # shared obj --------------------------------------------------------------
+    def read_elf_header(self, path_to_so):
+        # reads the class and the machine from the ELF header instead of
+        # running 'file -L'. open() follows symlinks like -L does.
+        # returns (bits, machine) where bits is 32 or 64 and machine is
+        # e_machine, or (None, None) if the file is not an ELF file
+        try:
+            with open(str(path_to_so), 'rb') as f:
+                header = f.read(_ELF_HEADER_SIZE)
+        except OSError:
+            return None, None
+
+        if len(header) < _ELF_HEADER_SIZE or header[:4] != _ELF_MAGIC:
+            return None, None
+
+        bits = _ELF_CLASS_TO_BITS.get(header[_ELF_EI_CLASS])
+        byte_order = _ELF_DATA_TO_BYTE_ORDER.get(header[_ELF_EI_DATA])
+        if bits is None or byte_order is None:
+            return None, None
+
+        machine, = struct.unpack_from(f'{byte_order}H', header,
+                                      _ELF_E_MACHINE_OFFSET)
+        return bits, machine
+
     def is_so_64(self, path_to_so):
         if not self.is_linux:
             return False
 
-        cmd_str = f'file {path_to_so} -L'
-
-        complete_process = subprocess.run(cmd_str,
-                                          shell=True,
-                                          stdout=subprocess.PIPE,
-                                          encoding='utf-8')
-        # output example
-        # temp/lib/libarenac.so: ELF 64-bit LSB shared object, ARM
-        # aarch64, version 1 (SYSV), dynamically linked, BuildID[sha1]=
-        # 682bf5f106153a181e7a381512a442232348d935, not stripped
-        output = complete_process.stdout
-        return True if '64-bit' in output else False
+        bits, _ = self.read_elf_header(path_to_so)
+        return bits == 64
 
     def is_so_64_arm(self, path_to_so):
-        # file command runs on both. the platform does not have to be arm
+        # the header is read on both. the platform does not have to be arm
         # to check the binary type
         if not self.is_linux:
             return False
 
-        cmd_str = f'file {path_to_so} -L'
-
-        complete_process = subprocess.run(cmd_str,
-                                          shell=True,
-                                          stdout=subprocess.PIPE,
-                                          encoding='utf-8')
-        # output example
-        # temp/lib/libarenac.so: ELF 64-bit LSB shared object, ARM
-        # aarch64, version 1 (SYSV), dynamically linked, BuildID[sha1]=
-        # 682bf5f106153a181e7a381512a442232348d935, not stripped
-        output = complete_process.stdout
-        is_64 = True if ' 64-bit ' in output else False
-        is_arm = True if ' ARM' in output else False
-        return is_64 and is_arm
+        bits, machine = self.read_elf_header(path_to_so)
+        return bits == 64 and machine in _ELF_MACHINES_ARM
 
     def is_so_32_arm(self, path_to_so):
-        # file command runs on both. the platform does not have to be arm
+        # the header is read on both. the platform does not have to be arm
         # to check the binary type
         if not self.is_linux:
             return False
 
-        cmd_str = f'file {path_to_so} -L'
-
-        complete_process = subprocess.run(cmd_str,
-                                          shell=True,
-                                          stdout=subprocess.PIPE,
-                                          encoding='utf-8')
-        # output example
-        # temp/lib/libarenac.so: ELF 64-bit LSB shared object, ARM
-        # aarch64, version 1 (SYSV), dynamically linked, BuildID[sha1]=
-        # 682bf5f106153a181e7a381512a442232348d935, not stripped
-        output = complete_process.stdout
-        is_32 = True if ' 32-bit ' in output else False
-        is_arm = True if ' ARM' in output else False
-        return is_32 and is_arm
+        bits, machine = self.read_elf_header(path_to_so)
+        return bits == 32 and machine in _ELF_MACHINES_ARM
 
     def is_so_arm(self, path_to_so):
         return True if self.is_so_64_arm(path_to_so) or self.is_so_32_arm(path_to_so) else False
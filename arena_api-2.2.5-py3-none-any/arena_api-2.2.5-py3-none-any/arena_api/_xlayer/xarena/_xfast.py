@@ -0,0 +1,343 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Fast binding mode, enabled with ``ARENAC_FAST_BINDINGS`` in
+``arena_api_config``.
+
+install() replaces the _x wrappers of the hottest ArenaC functions with
+versions that:
+    - call their own function pointer, fetched once, that has no errcheck
+    - check the returned AC_ERROR with a plain ``if ret:``
+    - reuse per thread out parameters and string buffers instead of
+      allocating ctypes scalars, byref objects and 500 byte buffers on
+      every call
+The errcheck of every other configured ArenaC function is replaced by a
+closure that does not go through module globals.
+'''
+
+import threading
+from ctypes import byref, create_string_buffer
+
+from arena_api._xlayer.xarena.arenac import harenac
+from arena_api._xlayer.xarena.arenac_configurator import (
+    _error_to_exception_dict, _get_msg_func)
+from arena_api._xlayer.xarena.arenac_defaults import \
+    XARENA_STR_BUFFER_SIZE_DEFAULT
+from arena_api._xlayer.xarena.arenac_types import (ac_access_mode, acBuffer,
+                                                   acNode, bool8_t, double,
+                                                   int64_t, size_t, uint64_t)
+from arena_api._xlayer.xarena._xbuffer import _xBuffer
+from arena_api._xlayer.xarena._xdevice import _xDevice
+from arena_api._xlayer.xarena._xnode import (_xBoolean, _xCommand,
+                                             _xEnumeration, _xFloat,
+                                             _xInteger, _xNode, _xString)
+from arena_api._xlayer.xarena._xnodemap import _xNodemap
+
+# ArenaC functions that get a fast _x wrapper
+HOT_FUNCTIONS = (
+    'acIntegerGetValue',
+    'acIntegerSetValue',
+    'acFloatGetValue',
+    'acFloatSetValue',
+    'acBooleanGetValue',
+    'acBooleanSetValue',
+    'acStringGetValue',
+    'acEnumerationGetCurrentSymbolic',
+    'acEnumerationSetBySymbolic',
+    'acCommandExecute',
+    'acNodeGetName',
+    'acNodeGetAccessMode',
+    'acNodeMapGetNode',
+    'acNodeMapGetIntegerValue',
+    'acNodeMapGetFloatValue',
+    'acDeviceGetBuffer',
+    'acDeviceRequeueBuffer',
+    'acImageGetWidth',
+    'acImageGetHeight',
+    'acImageGetTimestampNs'
+)
+
+_installed = False
+
+
+def _raise(ret_err):
+    raise _error_to_exception_dict[ret_err](_get_msg_func(ret_err))
+
+
+def _errcheck(ret_err, func, arguments):
+    if ret_err:
+        _raise(ret_err)
+
+
+class _OutParameters(threading.local):
+    # __init__ runs once per thread, on its first use. every wrapper copies
+    # the value out before returning so the objects can be reused by the
+    # next call on the same thread
+
+    def __init__(self):
+        self.int64 = int64_t(0)
+        self.int64_ref = byref(self.int64)
+        self.uint64 = uint64_t(0)
+        self.uint64_ref = byref(self.uint64)
+        self.double = double(0)
+        self.double_ref = byref(self.double)
+        self.bool8 = bool8_t(False)
+        self.bool8_ref = byref(self.bool8)
+        self.size = size_t(0)
+        self.size_ref = byref(self.size)
+        self.access_mode = ac_access_mode(0)
+        self.access_mode_ref = byref(self.access_mode)
+        self.node = acNode(None)
+        self.node_ref = byref(self.node)
+        self.buffer = acBuffer(None)
+        self.buffer_ref = byref(self.buffer)
+        self.str_buf = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
+        self.str_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
+        self.str_len_ref = byref(self.str_len)
+
+
+_out = _OutParameters()
+
+
+def _function(name):
+    # a new function pointer, separate from the one on harenac, so its
+    # errcheck can be left unset
+    configured = getattr(harenac, name)
+    function = harenac[name]
+    function.argtypes = configured.argtypes
+    function.restype = configured.restype
+    return function
+
+
+def _install_node_wrappers(f):
+    acIntegerGetValue = f['acIntegerGetValue']
+    acIntegerSetValue = f['acIntegerSetValue']
+    acFloatGetValue = f['acFloatGetValue']
+    acFloatSetValue = f['acFloatSetValue']
+    acBooleanGetValue = f['acBooleanGetValue']
+    acBooleanSetValue = f['acBooleanSetValue']
+    acStringGetValue = f['acStringGetValue']
+    acEnumerationGetCurrentSymbolic = f['acEnumerationGetCurrentSymbolic']
+    acEnumerationSetBySymbolic = f['acEnumerationSetBySymbolic']
+    acCommandExecute = f['acCommandExecute']
+    acNodeGetName = f['acNodeGetName']
+    acNodeGetAccessMode = f['acNodeGetAccessMode']
+
+    def xIntegerGetValue(self):
+        out = _out
+        ret = acIntegerGetValue(self.hxnode, out.int64_ref)
+        if ret:
+            _raise(ret)
+        return out.int64.value
+
+    def xIntegerSetValue(self, value):
+        ret = acIntegerSetValue(self.hxnode, value)
+        if ret:
+            _raise(ret)
+
+    def xFloatGetValue(self):
+        out = _out
+        ret = acFloatGetValue(self.hxnode, out.double_ref)
+        if ret:
+            _raise(ret)
+        return out.double.value
+
+    def xFloatSetValue(self, value):
+        ret = acFloatSetValue(self.hxnode, value)
+        if ret:
+            _raise(ret)
+
+    def xBooleanGetValue(self):
+        out = _out
+        ret = acBooleanGetValue(self.hxnode, out.bool8_ref)
+        if ret:
+            _raise(ret)
+        return out.bool8.value
+
+    def xBooleanSetValue(self, value):
+        ret = acBooleanSetValue(self.hxnode, value)
+        if ret:
+            _raise(ret)
+
+    def xStringGetValue(self):
+        out = _out
+        out.str_len.value = XARENA_STR_BUFFER_SIZE_DEFAULT
+        ret = acStringGetValue(self.hxnode, out.str_buf,
+                               out.str_len_ref)
+        if ret:
+            _raise(ret)
+        return out.str_buf.value.decode()
+
+    def xEnumerationGetCurrentSymbolic(self):
+        out = _out
+        out.str_len.value = XARENA_STR_BUFFER_SIZE_DEFAULT
+        ret = acEnumerationGetCurrentSymbolic(self.hxnode, out.str_buf,
+                                              out.str_len_ref)
+        if ret:
+            _raise(ret)
+        return out.str_buf.value.decode()
+
+    def xEnumerationSetBySymbolic(self, value):
+        ret = acEnumerationSetBySymbolic(self.hxnode, value.encode())
+        if ret:
+            _raise(ret)
+
+    def xCommandExecute(self):
+        ret = acCommandExecute(self.hxnode)
+        if ret:
+            _raise(ret)
+
+    def xNodeGetName(self):
+        out = _out
+        out.str_len.value = XARENA_STR_BUFFER_SIZE_DEFAULT
+        ret = acNodeGetName(self.hxnode, out.str_buf, out.str_len_ref)
+        if ret:
+            _raise(ret)
+        return out.str_buf.value.decode()
+
+    def xNodeGetAccessMode(self):
+        out = _out
+        ret = acNodeGetAccessMode(self.hxnode, out.access_mode_ref)
+        if ret:
+            _raise(ret)
+        return out.access_mode.value
+
+    _xInteger.xIntegerGetValue = xIntegerGetValue
+    _xInteger.xIntegerSetValue = xIntegerSetValue
+    _xFloat.xFloatGetValue = xFloatGetValue
+    _xFloat.xFloatSetValue = xFloatSetValue
+    _xBoolean.xBooleanGetValue = xBooleanGetValue
+    _xBoolean.xBooleanSetValue = xBooleanSetValue
+    _xString.xStringGetValue = xStringGetValue
+    _xEnumeration.xEnumerationGetCurrentSymbolic = \
+        xEnumerationGetCurrentSymbolic
+    _xEnumeration.xEnumerationSetBySymbolic = xEnumerationSetBySymbolic
+    _xCommand.xCommandExecute = xCommandExecute
+    _xNode.xNodeGetName = xNodeGetName
+    _xNode.xNodeGetAccessMode = xNodeGetAccessMode
+
+
+def _install_nodemap_wrappers(f):
+    acNodeMapGetNode = f['acNodeMapGetNode']
+    acNodeMapGetIntegerValue = f['acNodeMapGetIntegerValue']
+    acNodeMapGetFloatValue = f['acNodeMapGetFloatValue']
+
+    def xNodeMapGetNode(self, node_name):
+        out = _out
+        out.node.value = None
+        ret = acNodeMapGetNode(self.h_nodemap, node_name.encode(),
+                               out.node_ref)
+        if ret:
+            _raise(ret)
+        return out.node.value
+
+    def xNodeMapGetIntegerValue(self, node_name):
+        out = _out
+        ret = acNodeMapGetIntegerValue(self.h_nodemap, node_name.encode(),
+                                       out.int64_ref)
+        if ret:
+            _raise(ret)
+        return out.int64.value
+
+    def xNodeMapGetFloatValue(self, node_name):
+        out = _out
+        ret = acNodeMapGetFloatValue(self.h_nodemap, node_name.encode(),
+                                     out.double_ref)
+        if ret:
+            _raise(ret)
+        return out.double.value
+
+    _xNodemap.xNodeMapGetNode = xNodeMapGetNode
+    _xNodemap.xNodeMapGetIntegerValue = xNodeMapGetIntegerValue
+    _xNodemap.xNodeMapGetFloatValue = xNodeMapGetFloatValue
+
+
+def _install_stream_wrappers(f):
+    acDeviceGetBuffer = f['acDeviceGetBuffer']
+    acDeviceRequeueBuffer = f['acDeviceRequeueBuffer']
+    acImageGetWidth = f['acImageGetWidth']
+    acImageGetHeight = f['acImageGetHeight']
+    acImageGetTimestampNs = f['acImageGetTimestampNs']
+
+    def xDeviceGetBuffer(self, timeout):
+        out = _out
+        out.buffer.value = None
+        ret = acDeviceGetBuffer(self.hxdevice, timeout, out.buffer_ref)
+        if ret:
+            _raise(ret)
+        return out.buffer.value
+
+    def xDeviceRequeueBuffer(self, buffer_p):
+        ret = acDeviceRequeueBuffer(self.hxdevice, buffer_p)
+        if ret:
+            _raise(ret)
+
+    def xImageGetWidth(self):
+        out = _out
+        ret = acImageGetWidth(self.hxbuffer, out.size_ref)
+        if ret:
+            _raise(ret)
+        return out.size.value
+
+    def xImageGetHeight(self):
+        out = _out
+        ret = acImageGetHeight(self.hxbuffer, out.size_ref)
+        if ret:
+            _raise(ret)
+        return out.size.value
+
+    def xImageGetTimestampNs(self):
+        out = _out
+        ret = acImageGetTimestampNs(self.hxbuffer, out.uint64_ref)
+        if ret:
+            _raise(ret)
+        return out.uint64.value
+
+    _xDevice.xDeviceGetBuffer = xDeviceGetBuffer
+    _xDevice.xDeviceRequeueBuffer = xDeviceRequeueBuffer
+    _xBuffer.xImageGetWidth = xImageGetWidth
+    _xBuffer.xImageGetHeight = xImageGetHeight
+    _xBuffer.xImageGetTimestampNs = xImageGetTimestampNs
+
+
+def _replace_errchecks(library, errcheck):
+    # only the function pointers configured so far, cached on the library.
+    # the _FuncPtr class is in vars() too, setting its errcheck would hide
+    # the ctypes descriptor from every function pointer of the library
+    for function in list(vars(library).values()):
+        if isinstance(function, library._FuncPtr) and \
+                function.errcheck is not None:
+            function.errcheck = errcheck
+
+
+def install():
+    global _installed
+    if _installed:
+        return
+    # by name, importing arenac_sim would load the simulator for nothing
+    if type(harenac).__name__ == 'SimulatedArenaC':
+        raise Exception('fast bindings need the ArenaC binary, they can not '
+                        'be used with arena_api_config.ARENAC_SIMULATED')
+
+    _replace_errchecks(harenac, _errcheck)
+
+    functions = {name: _function(name) for name in HOT_FUNCTIONS}
+    _install_node_wrappers(functions)
+    _install_nodemap_wrappers(functions)
+    _install_stream_wrappers(functions)
+    _installed = True
+
+
+def is_installed():
+    return _installed
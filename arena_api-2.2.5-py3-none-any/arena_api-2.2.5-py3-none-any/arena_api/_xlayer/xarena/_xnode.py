@@ -30,12 +30,22 @@ from arena_api._xlayer.xarena.arenac_types import (ac_access_mode,
                                                    int64_t, size_t, uint8_t)
 
 
+def _to_acnode(hxnode):
+    # a node created from another node's acNode shares it instead of
+    # wrapping the handle again
+    if isinstance(hxnode, acNode):
+        return hxnode
+    return acNode(hxnode)
+
+
 class _xNode():
+    __slots__ = ('hxnode',)
+
     def __init__(self, hxnode):
         # TODO SFW-2546
         if not hxnode:
             raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+        self.hxnode = _to_acnode(hxnode)
 
     # Gets General --------------------------------------------------------
 
@@ -492,12 +502,13 @@ class _xNode():
 
 
 class _xSelector():
+    __slots__ = ('hxnode',)
 
     def __init__(self, hxnode):
         # TODO SFW-2546
         if not hxnode:
             raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+        self.hxnode = _to_acnode(hxnode)
 
     # Selecting -----------------------------------------------------------
 
@@ -606,13 +617,9 @@ class _xSelector():
         return selected_feature_node.value, access_mode.value
 
 
-class _xString():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xString(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     def xStringSetValue(self, value):
 
@@ -652,13 +659,9 @@ class _xString():
         return length.value
 
 
-class _xInteger():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xInteger(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     # Get -----------------------------------------------------------------
 
@@ -782,13 +785,9 @@ class _xInteger():
             max_value)
 
 
-class _xFloat():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xFloat(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     # Get -----------------------------------------------------------------
 
@@ -949,13 +948,9 @@ class _xFloat():
             max_value)
 
 
-class _xBoolean():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xBoolean(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     def xBooleanGetValue(self):
 
@@ -980,13 +975,9 @@ class _xBoolean():
             value)
 
 
-class _xEnumeration():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xEnumeration(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     # Gets ----------------------------------------------------------------
 
@@ -1164,14 +1155,9 @@ class _xEnumeration():
             value_str_p)
 
 
-class _xEnumentry():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            # shouldi check the type here ?
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xEnumentry(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     # Gets ----------------------------------------------------------------
 
@@ -1229,13 +1215,9 @@ class _xEnumentry():
         return is_selfclearing.value
 
 
-class _xCategory():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xCategory(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     def xCategoryGetNumFeatures(self):
 
@@ -1283,13 +1265,9 @@ class _xCategory():
         return feature_node.value, access_mode.value
 
 
-class _xRegister():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xRegister(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     def xRegisterSet(self, hregister, register_len):
 
@@ -1319,13 +1297,9 @@ class _xRegister():
         return buffer_p.value
 
 
-class _xCommand():
-
-    def __init__(self, hxnode):
-        # TODO SFW-2546
-        if not hxnode:
-            raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+class _xCommand(_xNode):
+    # also has the xNode functions, a typed node uses it as its xnode
+    __slots__ = ()
 
     def xCommandExecute(self):
 
@@ -1348,12 +1322,13 @@ class _xCommand():
 
 
 class _xValue():
+    __slots__ = ('hxnode',)
 
     def __init__(self, hxnode):
         # TODO SFW-2546
         if not hxnode:
             raise TypeError('Node handle is None')
-        self.hxnode = acNode(hxnode)
+        self.hxnode = _to_acnode(hxnode)
 
     def xValueToString(self):
 
@@ -258,17 +258,14 @@ class _xNodemap():
 
         node_name_p = char_ptr(node_name.encode())
         value_p = char_ptr(value.encode())
-        value_len = size_t(len(value))
         # AC_ERROR acNodeMapSetStringValue(
         #   acNodeMap hNodeMap,
-        #   char * pNodeName,
-        #   char* pSymbolicBuf,
-        #   size_t* pBufLen)
+        #   const char* pNodeName,
+        #   const char* pValue)
         harenac.acNodeMapSetStringValue(
             self.h_nodemap,
             node_name_p,
-            value_p,
-            byref(value_len))
+            value_p)
 
     def xNodeMapSetIntegerValue(self, node_name, value):
 
@@ -281,7 +278,7 @@ class _xNodemap():
         harenac.acNodeMapSetIntegerValue(
             self.h_nodemap,
             node_name_p,
-            byref(value))
+            value)
 
     def xNodeMapSetFloatValue(self, node_name, value):
 
@@ -309,8 +306,6 @@ class _xNodemap():
             node_name_p,
             value)
 
-        return node_name_p.value
-
     def xNodeMapSetEnumerationValue(self, node_name, value):
 
         node_name_p = char_ptr(node_name.encode())
@@ -11,6 +11,7 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+from arena_api import arena_api_config
 from arena_api._xlayer.binary.binary import Binary
 from arena_api._xlayer.binary.binary_loader import BinaryLoader
 from arena_api._xlayer.xarena.arenac_configurator import ArenaCConfigurator
@@ -138,8 +139,15 @@ _config['user_min_version_arm'] = supported_dll_versions['arm'][_config['name']]
 _config['user_max_version_arm'] = supported_dll_versions['arm'][_config['name']]['max']
 
 
-_arenac_binary = Binary(_config)
-_configurator = ArenaCConfigurator(_arenac_binary.hbinary)
-_configurator.configure()
+if getattr(arena_api_config, 'ARENAC_SIMULATED', False):
+    # no binary is loaded, nor validated
+    from arena_api._xlayer.xarena.arenac_sim import SimulatedArenaC
 
-harenac = _arenac_binary.hbinary
+    harenac = SimulatedArenaC(
+        getattr(arena_api_config, 'ARENAC_SIMULATION', None))
+else:
+    _arenac_binary = Binary(_config)
+    _configurator = ArenaCConfigurator(_arenac_binary.hbinary)
+    _configurator.configure()
+
+    harenac = _arenac_binary.hbinary
@@ -1203,18 +1203,22 @@ class ArenaCConfigurator:
 
         # AC_ERROR acNodeMapGetEnumerationValue(
         #   acNodeMap hNodeMap,
+        #   const char* pNodeName,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
         self.handle.acNodeMapGetEnumerationValue.argtypes = [
             acNodeMap,
             char_ptr,
+            char_ptr,
             POINTER(size_t)]
 
         # AC_ERROR acNodeMapSetStringValue(
         #   acNodeMap hNodeMap,
-        #   char* pValue)
+        #   const char* pNodeName,
+        #   const char* pValue)
         self.handle.acNodeMapSetStringValue.argtypes = [
             acNodeMap,
+            char_ptr,
             char_ptr]
 
         # AC_ERROR acNodeMapSetIntegerValue(
@@ -1246,9 +1250,11 @@ class ArenaCConfigurator:
 
         # AC_ERROR acNodeMapSetEnumerationValue(
         #   acNodeMap hNodeMap,
-        #   char* pSymbolic)
+        #   const char* pNodeName,
+        #   const char* pSymbolic)
         self.handle.acNodeMapSetEnumerationValue.argtypes = [
             acNodeMap,
+            char_ptr,
             char_ptr]
 
         # AC_ERROR acNodeMapExecute(
@@ -0,0 +1,1619 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Simulated ArenaC, used as ``harenac`` when ``ARENAC_SIMULATED`` is set in
+``arena_api_config``.
+
+SimulatedArenaC answers the ArenaC functions used by _xGlobal, _xSystem,
+_xDevice, _xBuffer, _xNodemap and _xNode with the same calling convention
+as the binary: arguments are ctypes objects, out parameters are byref()
+objects and errors raise the exception the errcheck of the binary would
+raise. Any other ArenaC function raises NotImplementedError.
+
+Each simulated device has a device nodemap with the common image format,
+acquisition, gain and transport layer features, and TL device, stream and
+interface nodemaps. Frames are produced at the configured rate, with
+optional jitter and dropped frames, into preallocated buffers and hold a
+moving gradient. Software trigger, NewestOnly buffer handling and buffer
+overflow when frames are not requeued fast enough are simulated.
+
+simulate_disconnect() takes a device off the network: its disconnect
+callbacks are called and it is enumerated again, with its power on
+settings, after a downtime.
+'''
+
+import ctypes
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from arena_api._xlayer.xarena.arenac_configurator import (
+    _ArenaCErr, _error_to_exception_dict, _get_msg_func)
+from arena_api._xlayer.xarena.arenac_defaults import (AC_INFINITE,
+                                                      NUM_OF_BUFFERS_DEFAULT)
+from arena_api._xlayer.xarena.arenac_types import uint8_t
+from arena_api.enums import (AccessMode, CachingMode, DisplayNotation,
+                             IncMode, InterfaceType, Namespace,
+                             PayloadType, PixelEndianness, PixelFormat,
+                             Representation, Visibility)
+
+SIMULATION_DEFAULTS = {
+    'devices': 1,
+    'model': 'SIM-050S-M',
+    'sensor_width': 2448,
+    'sensor_height': 2048,
+    # None starts at the sensor size
+    'width': None,
+    'height': None,
+    'pixel_format': 'Mono8',
+    # frames per second when AcquisitionFrameRateEnable is False
+    'frame_rate': 30.0,
+    'exposure_time': 5000.0,
+    # probability of a frame to be lost, it is counted as missed
+    'drop_rate': 0.0,
+    # each frame is late by a random time up to jitter_sec
+    'jitter_sec': 0.0,
+    # network interfaces, the devices are spread over them
+    'interfaces': 1,
+    # time a device discovery takes on one interface, bounded by the
+    # timeout. acSystemUpdateDevices goes through the interfaces in turn
+    'discovery_sec': 0.0,
+    # time acSystemCreateDevice takes to open a device
+    'open_sec': 0.0,
+    # time a device is off the network after DeviceReset
+    'reset_sec': 1.0,
+    'seed': None
+}
+
+SIMULATED_PIXEL_FORMATS = ('Mono8', 'Mono10', 'Mono12', 'Mono12p', 'Mono16',
+                           'BayerRG8', 'BayerRG12p', 'BayerRG16', 'RGB8',
+                           'BGR8')
+
+# size of the gradient period, a frame is a window into a pattern that is
+# one period longer than the frame
+_PATTERN_PERIOD = 256
+
+_RO = AccessMode.RO.value
+_RW = AccessMode.RW.value
+_WO = AccessMode.WO.value
+_NI = AccessMode.NI.value
+
+
+class _SimError(Exception):
+
+    def __init__(self, error, message):
+        super().__init__(message)
+        self.error = error
+        self.message = message
+
+
+def _value(arg):
+    # ctypes scalars and handles to python values, python values as is
+    return arg.value if hasattr(arg, 'value') else arg
+
+
+def _text(arg):
+    value = _value(arg)
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _set(out_ref, value):
+    out_ref._obj.value = value
+
+
+def _set_text(buf, len_ref, text):
+    encoded = text.encode()
+    if len(encoded) + 1 > _value(len_ref._obj):
+        raise _SimError(_ArenaCErr.BUFFER_TOO_SMALL,
+                        f'buffer too small for {len(encoded) + 1} bytes')
+    buf.value = encoded
+    _set(len_ref, len(encoded) + 1)
+
+
+def _ip_to_str(ip):
+    return '.'.join(str((ip >> shift) & 0xFF) for shift in (24, 16, 8, 0))
+
+
+def _mac_to_str(mac):
+    return ':'.join(f'{(mac >> shift) & 0xFF:02x}'
+                    for shift in range(40, -8, -8))
+
+
+def _bits_per_pixel(pixel_format):
+    # PFNC codes hold the bits per pixel in bits 16 to 23
+    return (pixel_format >> 16) & 0xFF
+
+
+def _resolve(attribute):
+    return attribute() if callable(attribute) else attribute
+
+
+# nodes -----------------------------------------------------------------------
+
+
+class _SimNode:
+
+    handle = None
+    description = ''
+    tooltip = ''
+    unit = ''
+    visibility = Visibility.BEGINNER.value
+    representation = Representation.LINEAR.value
+    caching_mode = CachingMode.WRITE_THROUGH.value
+    polling_time = -1
+    is_feature = True
+    getter = None
+    on_set = None
+    # nodes that become read only while the device is streaming
+    locked_while_streaming = False
+    device = None
+    minimum = None
+    maximum = None
+    inc = 1
+    int_value = 0
+    max_length = 256
+    # nodes whose value depends on this one when it is a selector
+    selected = ()
+
+    def __init__(self, name, interface_type, value=None, access_mode=_RW,
+                 **attributes):
+        self.name = name
+        self.interface_type = interface_type
+        self.value = value
+        self._access_mode = access_mode
+        self.features = []
+        self.entries = []
+        for attribute, attribute_value in attributes.items():
+            setattr(self, attribute, attribute_value)
+
+    @property
+    def access_mode(self):
+        access_mode = _resolve(self._access_mode)
+        if access_mode == _RW and self.locked_while_streaming and \
+                self.device is not None and self.device.is_streaming:
+            return _RO
+        return access_mode
+
+    def is_readable(self):
+        return self.access_mode in (_RO, _RW)
+
+    def is_writable(self):
+        return self.access_mode in (_WO, _RW)
+
+    def get(self):
+        if not self.is_readable():
+            raise _SimError(_ArenaCErr.ACCESS_DENIED,
+                            f'{self.name} is not readable')
+        return self.getter() if self.getter else self.value
+
+    def set(self, value):
+        if not self.is_writable():
+            raise _SimError(_ArenaCErr.ACCESS_DENIED,
+                            f'{self.name} is not writable')
+
+        if self.interface_type in (InterfaceType.INTEGER,
+                                   InterfaceType.FLOAT):
+            minimum, maximum = _resolve(self.minimum), _resolve(self.maximum)
+            if not minimum <= value <= maximum:
+                raise _SimError(_ArenaCErr.INVALID_VALUE,
+                                f'{self.name} value {value} is out of '
+                                f'range [{minimum}, {maximum}]')
+            if self.interface_type == InterfaceType.INTEGER and \
+                    (value - minimum) % self.inc:
+                raise _SimError(_ArenaCErr.INVALID_VALUE,
+                                f'{self.name} value {value} does not '
+                                f'match increment {self.inc}')
+
+        elif self.interface_type == InterfaceType.ENUMERATION:
+            entry = self.get_entry(value)
+            if entry is None or not entry.is_readable():
+                raise _SimError(_ArenaCErr.INVALID_VALUE,
+                                f'{self.name} has no available entry '
+                                f'{value}')
+
+        elif self.interface_type == InterfaceType.STRING and \
+                len(value) > self.max_length:
+            raise _SimError(_ArenaCErr.INVALID_VALUE,
+                            f'{self.name} value is longer than '
+                            f'{self.max_length}')
+
+        self.value = value
+        if self.on_set:
+            self.on_set(value)
+
+    def get_entry(self, symbolic):
+        for entry in self.entries:
+            if entry.name == symbolic:
+                return entry
+        return None
+
+
+def _integer(name, value, minimum, maximum, inc=1, access_mode=_RW,
+             **attributes):
+    return _SimNode(name, InterfaceType.INTEGER, value, access_mode,
+                    minimum=minimum, maximum=maximum, inc=inc, **attributes)
+
+
+def _float(name, value, minimum, maximum, access_mode=_RW, **attributes):
+    return _SimNode(name, InterfaceType.FLOAT, value, access_mode,
+                    minimum=minimum, maximum=maximum, **attributes)
+
+
+def _boolean(name, value, access_mode=_RW, **attributes):
+    return _SimNode(name, InterfaceType.BOOLEAN, value, access_mode,
+                    **attributes)
+
+
+def _string(name, value, access_mode=_RO, **attributes):
+    return _SimNode(name, InterfaceType.STRING, value, access_mode,
+                    **attributes)
+
+
+def _command(name, on_execute=None, **attributes):
+    return _SimNode(name, InterfaceType.COMMAND, None, _WO,
+                    on_set=on_execute, **attributes)
+
+
+def _enumeration(name, value, symbolics, access_mode=_RW, int_values=None,
+                 **attributes):
+    node = _SimNode(name, InterfaceType.ENUMERATION, value, access_mode,
+                    **attributes)
+    for index, symbolic in enumerate(symbolics):
+        int_value = int_values[index] if int_values else index
+        node.entries.append(_SimNode(symbolic, InterfaceType.ENUMENTRY,
+                                     None, _RO, is_feature=False,
+                                     int_value=int_value))
+    return node
+
+
+def _category(name, features):
+    node = _SimNode(name, InterfaceType.CATEGORY, None, _RO)
+    node.features = features
+    return node
+
+
+class _SimNodemap:
+    handle = None
+
+    def __init__(self, device_name, categories):
+        self.device_name = device_name
+        self.lock = threading.RLock()
+        self.nodes = [_category('Root', categories)]
+        for category in categories:
+            self.nodes.append(category)
+            self.nodes.extend(category.features)
+        for node in list(self.nodes):
+            self.nodes.extend(node.entries)
+        self.nodes_by_name = {node.name: node for node in self.nodes
+                              if node.interface_type !=
+                              InterfaceType.ENUMENTRY}
+        # entries are also reachable by their GenICam name
+        for node in self.nodes:
+            for entry in node.entries:
+                self.nodes_by_name[f'EnumEntry_{node.name}_{entry.name}'] = \
+                    entry
+
+    def get_node(self, name):
+        try:
+            return self.nodes_by_name[name]
+        except KeyError:
+            raise _SimError(_ArenaCErr.INVALID_PARAMETER,
+                            f'\'{name}\' node does not exist') from None
+
+
+# buffers and devices ---------------------------------------------------------
+
+
+class _SimBuffer:
+    handle = None
+
+    def __init__(self, size):
+        self.data = (uint8_t * size)()
+        self.size = size
+        self.width = 0
+        self.height = 0
+        self.offset_x = 0
+        self.offset_y = 0
+        self.pixel_format = 0
+        self.frame_id = 0
+        self.timestamp_ns = 0
+        self.is_incomplete = False
+
+
+class _SimDevice:
+    handle = None
+
+    def __init__(self, index, settings, rng):
+        self.index = index
+        self.settings = settings
+        self.rng = rng
+        self.model = settings['model']
+        self.serial = str(220600000 + index)
+        self.ip = (169 << 24) | (254 << 16) | (3 << 8) | (10 + index)
+        self.subnet_mask = 0xFFFF0000
+        self.default_gateway = 0
+        self.mac = 0x1C0FAF000000 + index + 1
+        self.version = '1.0.0.0'
+        self.user_id = ''
+        self.is_connected = True
+        self.is_streaming = False
+        # called by DeviceReset
+        self.on_reset = None
+
+        self.__created_at = time.monotonic()
+        self.__latched_timestamp = 0
+        self.__buffers = []
+        self.__free_buffers = deque()
+        self.__pattern = None
+        self.__stream_start = 0.0
+        self.__next_frame = 0
+        self.__pending_triggers = 0
+        self.__missed = 0
+
+        self.nodemap = None
+        self.tl_device_nodemap = None
+        self.tl_stream_nodemap = None
+        self.tl_interface_nodemap = None
+
+    def create_nodemaps(self, interface):
+        settings = self.settings
+        sensor_width = settings['sensor_width']
+        sensor_height = settings['sensor_height']
+        pixel_formats = [name for name in SIMULATED_PIXEL_FORMATS
+                         if name in PixelFormat.__members__]
+
+        width = _integer('Width', settings['width'], 16,
+                         lambda: sensor_width - offset_x.value, 8,
+                         locked_while_streaming=True)
+        height = _integer('Height', settings['height'], 2,
+                          lambda: sensor_height - offset_y.value, 2,
+                          locked_while_streaming=True)
+        offset_x = _integer('OffsetX', 0, 0,
+                            lambda: sensor_width - width.value, 8)
+        offset_y = _integer('OffsetY', 0, 0,
+                            lambda: sensor_height - height.value, 2)
+        pixel_format = _enumeration(
+            'PixelFormat', settings['pixel_format'], pixel_formats,
+            int_values=[PixelFormat[name].value for name in pixel_formats],
+            locked_while_streaming=True)
+        frame_rate_enable = _boolean('AcquisitionFrameRateEnable', False)
+        exposure_time = _float('ExposureTime', settings['exposure_time'],
+                               20.0, 10000000.0, unit='us')
+        frame_rate = _float(
+            'AcquisitionFrameRate', settings['frame_rate'], 1.0,
+            lambda: min(1000.0, 1000000.0 / exposure_time.value),
+            access_mode=lambda: _RW if frame_rate_enable.value else _RO,
+            unit='Hz')
+        trigger_mode = _enumeration('TriggerMode', 'Off', ('Off', 'On'))
+        trigger_source = _enumeration('TriggerSource', 'Software',
+                                      ('Software', 'Line0'))
+        ptp_enable = _boolean('PtpEnable', False)
+        timestamp_latch_value = _integer(
+            'TimestampLatchValue', 0, 0, 2 ** 63 - 1, access_mode=_RO,
+            getter=lambda: self.__latched_timestamp, unit='ns')
+
+        def latch_timestamp(_):
+            self.__latched_timestamp = self.timestamp_ns()
+
+        def software_trigger(_):
+            if self.is_streaming and trigger_mode.value == 'On':
+                self.__pending_triggers += 1
+
+        def reset(_):
+            if self.on_reset is not None:
+                self.on_reset()
+
+        self.nodemap = _SimNodemap(self.model, [
+            _category('DeviceControl', [
+                _string('DeviceVendorName', 'Lucid Vision Labs'),
+                _string('DeviceModelName', self.model),
+                _string('DeviceSerialNumber', self.serial),
+                _string('DeviceUserID', self.user_id, _RW, max_length=16,
+                        on_set=self.__set_user_id),
+                _string('DeviceFirmwareVersion', self.version),
+                _float('DeviceTemperature', 40.0, -40.0, 150.0,
+                       access_mode=_RO, unit='C', polling_time=1000,
+                       getter=self.__temperature),
+                _command('TimestampLatch', latch_timestamp),
+                timestamp_latch_value,
+                _command('DeviceReset', reset)
+            ]),
+            _category('ImageFormatControl', [
+                _integer('SensorWidth', sensor_width, sensor_width,
+                         sensor_width, access_mode=_RO),
+                _integer('SensorHeight', sensor_height, sensor_height,
+                         sensor_height, access_mode=_RO),
+                width, height, offset_x, offset_y, pixel_format,
+                _boolean('ReverseX', False),
+                _boolean('ReverseY', False)
+            ]),
+            _category('AcquisitionControl', [
+                _enumeration('AcquisitionMode', 'Continuous',
+                             ('Continuous', 'SingleFrame', 'MultiFrame'),
+                             locked_while_streaming=True),
+                frame_rate_enable, frame_rate,
+                _enumeration('ExposureAuto', 'Off', ('Off', 'Continuous')),
+                exposure_time,
+                _enumeration('TriggerSelector', 'FrameStart',
+                             ('FrameStart',),
+                             selected=(trigger_mode, trigger_source)),
+                trigger_mode,
+                trigger_source,
+                _command('TriggerSoftware', software_trigger)
+            ]),
+            _category('AnalogControl', [
+                _enumeration('GainAuto', 'Off', ('Off', 'Continuous')),
+                _float('Gain', 0.0, 0.0, 48.0, unit='dB')
+            ]),
+            _category('TransportLayerControl', [
+                _integer('PayloadSize', 0, 0, 2 ** 63 - 1, access_mode=_RO,
+                         getter=self.payload_size, unit='B'),
+                _integer('GevSCPSPacketSize', 1500, 576, 9000, 4,
+                         locked_while_streaming=True, unit='B'),
+                ptp_enable,
+                _enumeration('PtpStatus', 'Disabled',
+                             ('Disabled', 'Listening', 'Master', 'Slave'),
+                             access_mode=_RO,
+                             getter=lambda: 'Slave' if ptp_enable.value
+                             else 'Disabled')
+            ])
+        ])
+
+        self.tl_device_nodemap = _SimNodemap(self.model, [
+            _category('DeviceInformation', [
+                _string('DeviceID', self.serial),
+                _string('DeviceSerialNumber', self.serial),
+                _string('DeviceVendorName', 'Lucid Vision Labs'),
+                _string('DeviceModelName', self.model),
+                _string('DeviceUserID', self.user_id,
+                        getter=lambda: self.user_id),
+                _integer('GevDeviceIPAddress', self.ip, 0, 0xFFFFFFFF,
+                         access_mode=_RO, getter=lambda: self.ip,
+                         representation=Representation.IPV4_ADDRESS.value),
+                _integer('GevDeviceSubnetMask', self.subnet_mask, 0,
+                         0xFFFFFFFF, access_mode=_RO,
+                         representation=Representation.IPV4_ADDRESS.value),
+                _integer('GevDeviceMACAddress', self.mac, 0,
+                         0xFFFFFFFFFFFF, access_mode=_RO,
+                         representation=Representation.MAC_ADDRESS.value)
+            ])
+        ])
+
+        self.tl_stream_nodemap = _SimNodemap(self.model, [
+            _category('StreamInformation', [
+                _enumeration('StreamBufferHandlingMode', 'OldestFirst',
+                             ('OldestFirst', 'OldestFirstOverwrite',
+                              'NewestOnly')),
+                _boolean('StreamAutoNegotiatePacketSize', True),
+                _boolean('StreamPacketResendEnable', True),
+                _boolean('StreamIsGrabbing', False, _RO,
+                         getter=lambda: self.is_streaming),
+                _integer('StreamAnnouncedBufferCount', 0, 0, 2 ** 31,
+                         access_mode=_RO,
+                         getter=lambda: len(self.__buffers)),
+                _integer('StreamMissedImageCount', 0, 0, 2 ** 63 - 1,
+                         access_mode=_RO, getter=lambda: self.__missed),
+                _integer('StreamIncompleteImageCount', 0, 0, 2 ** 63 - 1,
+                         access_mode=_RO)
+            ])
+        ])
+
+        self.tl_interface_nodemap = interface.create_nodemap(self.model)
+
+        for nodemap in (self.nodemap, self.tl_device_nodemap,
+                        self.tl_stream_nodemap):
+            for node in nodemap.nodes:
+                node.device = self
+
+    def __set_user_id(self, value):
+        self.user_id = value
+
+    def __temperature(self):
+        # slowly drifting, so node monitors see changes
+        return 40.0 + 2.0 * math.sin(
+            (time.monotonic() - self.__created_at) / 60.0)
+
+    def timestamp_ns(self):
+        return int((time.monotonic() - self.__created_at) * 1e9)
+
+    def __node_value(self, name):
+        return self.nodemap.nodes_by_name[name].value
+
+    def payload_size(self):
+        pixel_format = PixelFormat[self.__node_value('PixelFormat')].value
+        return (self.__node_value('Width') * self.__node_value('Height') *
+                _bits_per_pixel(pixel_format) + 7) // 8
+
+    def __frame_rate(self):
+        if self.__node_value('AcquisitionFrameRateEnable'):
+            return self.__node_value('AcquisitionFrameRate')
+        return min(self.settings['frame_rate'],
+                   1000000.0 / self.__node_value('ExposureTime'))
+
+    # stream --------------------------------------------------------------
+
+    def start_stream(self, number_of_buffers, register):
+        if self.is_streaming:
+            raise _SimError(_ArenaCErr.RESOURCE_IN_USE,
+                            'stream is already started')
+        if number_of_buffers < 1:
+            raise _SimError(_ArenaCErr.INVALID_PARAMETER,
+                            'number of buffers must be > 0')
+
+        size = self.payload_size()
+        self.__buffers = [_SimBuffer(size) for _ in range(number_of_buffers)]
+        for buffer in self.__buffers:
+            register(buffer)
+        self.__free_buffers = deque(self.__buffers)
+
+        period = _PATTERN_PERIOD
+        pattern = bytes(range(period)) * (size // period + 2)
+        self.__pattern = (uint8_t * len(pattern)).from_buffer_copy(pattern)
+
+        self.__stream_start = time.monotonic()
+        self.__next_frame = 0
+        self.__pending_triggers = 0
+        self.is_streaming = True
+
+    def stop_stream(self, unregister):
+        if not self.is_streaming:
+            return
+        self.is_streaming = False
+        for buffer in self.__buffers:
+            unregister(buffer)
+        self.__buffers = []
+        self.__free_buffers = deque()
+        self.__pattern = None
+
+    def __skip_overflowed_frames(self, now, frame_rate):
+        # frames that arrived while no buffer was free are lost, like with
+        # the OldestFirst mode of the binary. NewestOnly keeps the last one
+        newest_frame = int((now - self.__stream_start) * frame_rate)
+        newest_only = self.tl_stream_nodemap.nodes_by_name[
+            'StreamBufferHandlingMode'].value == 'NewestOnly'
+        kept = 1 if newest_only else len(self.__free_buffers)
+        if newest_frame - self.__next_frame >= kept:
+            skipped = newest_frame - self.__next_frame - kept + 1
+            self.__missed += skipped
+            self.__next_frame += skipped
+
+    def __wait_for_frame(self, timeout_sec):
+        # returns the frame id, after sleeping until it is due
+        if self.__node_value('TriggerMode') == 'On':
+            deadline = time.monotonic() + timeout_sec
+            while not self.__pending_triggers:
+                if time.monotonic() >= deadline:
+                    raise _SimError(_ArenaCErr.TIMEOUT,
+                                    'no software trigger before timeout')
+                time.sleep(0.0005)
+            self.__pending_triggers -= 1
+            frame_id = self.__next_frame
+            self.__next_frame += 1
+            return frame_id
+
+        frame_rate = self.__frame_rate()
+        self.__skip_overflowed_frames(time.monotonic(), frame_rate)
+        while True:
+            frame_id = self.__next_frame
+            due = self.__stream_start + frame_id / frame_rate
+            if self.settings['jitter_sec']:
+                due += self.rng.uniform(0.0, self.settings['jitter_sec'])
+            wait = due - time.monotonic()
+            if wait > timeout_sec:
+                time.sleep(timeout_sec)
+                raise _SimError(_ArenaCErr.TIMEOUT,
+                                'no buffer before timeout')
+            self.__next_frame += 1
+            if self.rng.random() < self.settings['drop_rate']:
+                self.__missed += 1
+                continue
+            if wait > 0:
+                time.sleep(wait)
+            return frame_id
+
+    def get_buffer(self, timeout_millisec):
+        if not self.is_connected:
+            raise _SimError(_ArenaCErr.ERROR, 'device is disconnected')
+        if not self.is_streaming:
+            raise _SimError(_ArenaCErr.ERROR, 'stream is not started')
+        timeout_sec = math.inf if timeout_millisec >= AC_INFINITE \
+            else timeout_millisec / 1000
+
+        if not self.__free_buffers:
+            if timeout_sec == math.inf:
+                raise _SimError(_ArenaCErr.RESOURCE_EXHAUSTED,
+                                'all buffers are held, requeue a buffer '
+                                'before getting another one')
+            time.sleep(timeout_sec)
+            raise _SimError(_ArenaCErr.TIMEOUT, 'no buffer before timeout')
+
+        frame_id = self.__wait_for_frame(timeout_sec)
+
+        buffer = self.__free_buffers.popleft()
+        buffer.frame_id = frame_id
+        buffer.timestamp_ns = self.timestamp_ns()
+        buffer.width = self.__node_value('Width')
+        buffer.height = self.__node_value('Height')
+        buffer.offset_x = self.__node_value('OffsetX')
+        buffer.offset_y = self.__node_value('OffsetY')
+        buffer.pixel_format = PixelFormat[
+            self.__node_value('PixelFormat')].value
+        # a moving gradient, copied from the pattern at C speed
+        offset = frame_id % _PATTERN_PERIOD
+        ctypes.memmove(buffer.data,
+                       ctypes.addressof(self.__pattern) + offset,
+                       buffer.size)
+        return buffer
+
+    def requeue_buffer(self, buffer):
+        if buffer not in self.__buffers or buffer in self.__free_buffers:
+            raise _SimError(_ArenaCErr.INVALID_HANDLE,
+                            'buffer does not belong to the stream or is '
+                            'already queued')
+        self.__free_buffers.append(buffer)
+
+
+class _SimInterface:
+
+    def __init__(self, index):
+        self.index = index
+        self.ip = (169 << 24) | (254 << 16) | ((3 + index) << 8) | 1
+        self.subnet_mask = 0xFFFF0000
+        self.mac = 0x00E04C000000 + index + 1
+        self.devices_updated = False
+
+    def create_nodemap(self, device_name):
+        return _SimNodemap(device_name, [
+            _category('InterfaceInformation', [
+                _string('InterfaceID', f'sim{self.index}'),
+                _integer('GevInterfaceSubnetIPAddress', self.ip, 0,
+                         0xFFFFFFFF, access_mode=_RO),
+                _integer('GevInterfaceSubnetMask', self.subnet_mask, 0,
+                         0xFFFFFFFF, access_mode=_RO),
+                _integer('GevInterfaceMACAddress', self.mac, 0,
+                         0xFFFFFFFFFFFF, access_mode=_RO)
+            ])
+        ])
+
+
+class _SimDisconnectCallback:
+    handle = None
+
+    def __init__(self, device, function):
+        self.device = device
+        self.function = function
+
+
+class _SimSystem:
+    handle = None
+
+    def __init__(self, settings, rng):
+        self.settings = settings
+        self.interfaces = [_SimInterface(index)
+                           for index in range(settings['interfaces'])]
+        self.devices = [_SimDevice(index, settings, rng)
+                        for index in range(settings['devices'])]
+        self.nodemap = _SimNodemap('System', [
+            _category('SystemInformation', [
+                _string('TLVendorName', 'Lucid Vision Labs'),
+                _string('TLModelName', 'Simulated ArenaC'),
+                _string('TLVersion', SimulatedArenaC.VERSION)
+            ])
+        ])
+
+    def discover(self, interface, timeout_arg):
+        # returns True the first time devices are discovered on interface
+        time.sleep(min(self.settings['discovery_sec'],
+                       _value(timeout_arg) / 1000))
+        has_changed = not interface.devices_updated
+        interface.devices_updated = True
+        return has_changed
+
+
+# ArenaC ----------------------------------------------------------------------
+
+
+class SimulatedArenaC:
+    #
+    # the ArenaC functions are methods named after them. __getattr__ wraps
+    # them, once, into functions that raise like the errcheck of the binary
+    #
+
+    VERSION = '0.1.999'
+
+    # set by CallProfiler to wrap functions as they are cached
+    _function_hook = None
+
+    def __init__(self, settings=None):
+        self._settings = dict(SIMULATION_DEFAULTS)
+        self._settings.update(settings or {})
+        unknown = set(self._settings) - set(SIMULATION_DEFAULTS)
+        if unknown:
+            raise ValueError(f'unknown ARENAC_SIMULATION keys '
+                             f'{sorted(unknown)}')
+        if self._settings['pixel_format'] not in SIMULATED_PIXEL_FORMATS:
+            raise ValueError(f'pixel_format must be one of '
+                             f'{SIMULATED_PIXEL_FORMATS}')
+        if self._settings['interfaces'] < 1:
+            raise ValueError('interfaces must be >= 1')
+        for size_name in ('width', 'height'):
+            sensor_size = self._settings[f'sensor_{size_name}']
+            if self._settings[size_name] is None:
+                self._settings[size_name] = sensor_size
+            elif self._settings[size_name] > sensor_size:
+                raise ValueError(f'{size_name} must be <= sensor_{size_name}'
+                                 f' {sensor_size}')
+
+        self._rng = random.Random(self._settings['seed'])
+        self._lock = threading.Lock()
+        self._objects = {}
+        self._next_handle = 0x10000
+        self._last_error_message = ''
+        self._system = None
+
+    # handles -------------------------------------------------------------
+
+    def _register(self, obj):
+        # handles are fake, stable addresses. an object keeps its handle
+        if obj.handle is None:
+            with self._lock:
+                self._next_handle += 0x10
+                obj.handle = self._next_handle
+                self._objects[obj.handle] = obj
+        return obj.handle
+
+    def _unregister(self, obj):
+        with self._lock:
+            self._objects.pop(obj.handle, None)
+        obj.handle = None
+
+    def _get(self, handle_arg, cls):
+        obj = self._objects.get(_value(handle_arg))
+        if not isinstance(obj, cls):
+            raise _SimError(_ArenaCErr.INVALID_HANDLE,
+                            f'invalid {cls.__name__[4:].lower()} handle')
+        return obj
+
+    def _node(self, handle_arg):
+        return self._get(handle_arg, _SimNode)
+
+    def _nodemap(self, handle_arg):
+        return self._get(handle_arg, _SimNodemap)
+
+    def _device(self, handle_arg):
+        return self._get(handle_arg, _SimDevice)
+
+    def _buffer(self, handle_arg):
+        return self._get(handle_arg, _SimBuffer)
+
+    def _system_device(self, system_arg, index_arg):
+        devices = self._get(system_arg, _SimSystem).devices
+        index = _value(index_arg)
+        if index >= len(devices):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'device index {index} out of range')
+        return devices[index]
+
+    def _system_interface(self, system_arg, index_arg):
+        interfaces = self._get(system_arg, _SimSystem).interfaces
+        index = _value(index_arg)
+        if index >= len(interfaces):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'interface index {index} out of range')
+        return interfaces[index]
+
+    def __getattr__(self, name):
+        if not name.startswith('ac'):
+            raise AttributeError(name)
+
+        implementation = getattr(self, '_' + name, None)
+
+        def function(*args):
+            try:
+                if implementation is None:
+                    raise _SimError(_ArenaCErr.NOT_IMPLEMENTED,
+                                    f'{name} is not simulated')
+                return implementation(*args)
+            except _SimError as error:
+                self._last_error_message = error.message
+                raise _error_to_exception_dict[error.error.value](
+                    _get_msg_func(error.error.value)) from None
+
+        function.__name__ = name
+        if self._function_hook is not None:
+            function = self._function_hook(name, function)
+        setattr(self, name, function)
+        return function
+
+    # disconnects ---------------------------------------------------------
+
+    def simulate_disconnect(self, serial, downtime_sec):
+        """
+        Takes the device with this serial number off the network. Its
+        disconnect callbacks are called on their own thread and after
+        downtime_sec it is enumerated again as a new device with its power
+        on settings.
+        """
+        system = self._system
+        with self._lock:
+            device = next((device for device in system.devices
+                           if device.serial == serial), None)
+            if device is None:
+                raise ValueError(f'no connected device has serial {serial}')
+            system.devices.remove(device)
+            device.is_connected = False
+            for interface in system.interfaces:
+                interface.devices_updated = False
+            callbacks = [obj for obj in self._objects.values()
+                         if isinstance(obj, _SimDisconnectCallback) and
+                         obj.device is device]
+
+        for callback in callbacks:
+            threading.Thread(target=callback.function, args=(device.handle,),
+                             daemon=True).start()
+
+        def reconnect():
+            new_device = _SimDevice(device.index, self._settings, self._rng)
+            self._plug(new_device)
+            with self._lock:
+                system.devices.append(new_device)
+                for interface in system.interfaces:
+                    interface.devices_updated = False
+
+        timer = threading.Timer(downtime_sec, reconnect)
+        timer.daemon = True
+        timer.start()
+
+    def _plug(self, device):
+        # a device is on the interface given by its index, DeviceReset
+        # takes it off the network for reset_sec
+        interfaces = self._system.interfaces
+        device.create_nodemaps(interfaces[device.index % len(interfaces)])
+        device.on_reset = lambda: self.simulate_disconnect(
+            device.serial, self._settings['reset_sec'])
+
+    # global --------------------------------------------------------------
+
+    def _acOpenSystem(self, system_ref):
+        if self._system is None:
+            self._system = _SimSystem(self._settings, self._rng)
+            for device in self._system.devices:
+                self._plug(device)
+        _set(system_ref, self._register(self._system))
+
+    def _acCloseSystem(self, system_arg):
+        system = self._get(system_arg, _SimSystem)
+        for device in system.devices:
+            device.stop_stream(self._unregister)
+
+    def _acGetLastErrorMessage(self, buf, len_ref):
+        _set_text(buf, len_ref, self._last_error_message)
+
+    def _acGetVersion(self, buf, len_ref):
+        _set_text(buf, len_ref, self.VERSION)
+
+    def _acIsReadable(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).is_readable())
+
+    def _acIsWritable(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).is_writable())
+
+    # system --------------------------------------------------------------
+
+    def _acSystemGetNumInterfaces(self, system_arg, out_ref):
+        _set(out_ref, len(self._get(system_arg, _SimSystem).interfaces))
+
+    def _acSystemGetInterfaceIpAddress(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_interface(system_arg, index).ip)
+
+    def _acSystemGetInterfaceIpAddressStr(self, system_arg, index, buf,
+                                          len_ref):
+        _set_text(buf, len_ref, _ip_to_str(
+            self._system_interface(system_arg, index).ip))
+
+    def _acSystemGetInterfaceSubnetMask(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_interface(system_arg, index).subnet_mask)
+
+    def _acSystemGetInterfaceSubnetMaskStr(self, system_arg, index, buf,
+                                           len_ref):
+        _set_text(buf, len_ref, _ip_to_str(
+            self._system_interface(system_arg, index).subnet_mask))
+
+    def _acSystemGetInterfaceMacAddress(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_interface(system_arg, index).mac)
+
+    def _acSystemGetInterfaceMacAddressStr(self, system_arg, index, buf,
+                                           len_ref):
+        _set_text(buf, len_ref, _mac_to_str(
+            self._system_interface(system_arg, index).mac))
+
+    def _acSystemUpdateDevices(self, system_arg, timeout):
+        system = self._get(system_arg, _SimSystem)
+        for interface in system.interfaces:
+            system.discover(interface, timeout)
+
+    def _acSystemUpdateDevicesHasChanged(self, system_arg, timeout,
+                                         out_ref):
+        system = self._get(system_arg, _SimSystem)
+        has_changed = [system.discover(interface, timeout)
+                       for interface in system.interfaces]
+        _set(out_ref, any(has_changed))
+
+    def _acSystemUpdateDevicesOnInterface(self, system_arg, index, timeout,
+                                          out_ref):
+        system = self._get(system_arg, _SimSystem)
+        _set(out_ref, system.discover(
+            self._system_interface(system_arg, index), timeout))
+
+    def _acSystemGetNumDevices(self, system_arg, out_ref):
+        _set(out_ref, len(self._get(system_arg, _SimSystem).devices))
+
+    def _acSystemCreateDevice(self, system_arg, index, device_ref):
+        device = self._system_device(system_arg, index)
+        if device.handle is not None:
+            raise _SimError(_ArenaCErr.RESOURCE_IN_USE,
+                            'device is already created')
+        time.sleep(self._settings['open_sec'])
+        _set(device_ref, self._register(device))
+
+    def _acSystemDestroyDevice(self, system_arg, device_arg):
+        device = self._device(device_arg)
+        device.stop_stream(self._unregister)
+        self._unregister(device)
+
+    def _acSystemGetDeviceModel(self, system_arg, index, buf, len_ref):
+        _set_text(buf, len_ref, self._system_device(system_arg, index).model)
+
+    def _acSystemGetDeviceVendor(self, system_arg, index, buf, len_ref):
+        self._system_device(system_arg, index)
+        _set_text(buf, len_ref, 'Lucid Vision Labs')
+
+    def _acSystemGetDeviceSerial(self, system_arg, index, buf, len_ref):
+        _set_text(buf, len_ref,
+                  self._system_device(system_arg, index).serial)
+
+    def _acSystemGetDeviceIpAddress(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_device(system_arg, index).ip)
+
+    def _acSystemGetDeviceIpAddressStr(self, system_arg, index, buf,
+                                       len_ref):
+        _set_text(buf, len_ref, _ip_to_str(
+            self._system_device(system_arg, index).ip))
+
+    def _acSystemGetDeviceSubnetMask(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_device(system_arg, index).subnet_mask)
+
+    def _acSystemGetDeviceSubnetMaskStr(self, system_arg, index, buf,
+                                        len_ref):
+        _set_text(buf, len_ref, _ip_to_str(
+            self._system_device(system_arg, index).subnet_mask))
+
+    def _acSystemGetDeviceDefaultGateway(self, system_arg, index, out_ref):
+        _set(out_ref,
+             self._system_device(system_arg, index).default_gateway)
+
+    def _acSystemGetDeviceDefaultGatewayStr(self, system_arg, index, buf,
+                                            len_ref):
+        _set_text(buf, len_ref, _ip_to_str(
+            self._system_device(system_arg, index).default_gateway))
+
+    def _acSystemGetDeviceMacAddress(self, system_arg, index, out_ref):
+        _set(out_ref, self._system_device(system_arg, index).mac)
+
+    def _acSystemGetDeviceMacAddressStr(self, system_arg, index, buf,
+                                        len_ref):
+        _set_text(buf, len_ref, _mac_to_str(
+            self._system_device(system_arg, index).mac))
+
+    def _acSystemGetDeviceUserDefinedName(self, system_arg, index, buf,
+                                          len_ref):
+        _set_text(buf, len_ref,
+                  self._system_device(system_arg, index).user_id)
+
+    def _acSystemGetDeviceVersion(self, system_arg, index, buf, len_ref):
+        _set_text(buf, len_ref,
+                  self._system_device(system_arg, index).version)
+
+    def _acSystemIsDeviceDHCPConfigurationEnabled(self, system_arg, index,
+                                                  out_ref):
+        self._system_device(system_arg, index)
+        _set(out_ref, False)
+
+    def _acSystemIsDevicePersistentIpConfigurationEnabled(self, system_arg,
+                                                          index, out_ref):
+        self._system_device(system_arg, index)
+        _set(out_ref, False)
+
+    def _acSystemIsDeviceLLAConfigurationEnabled(self, system_arg, index,
+                                                 out_ref):
+        self._system_device(system_arg, index)
+        _set(out_ref, True)
+
+    def _acSystemForceIpAddress(self, system_arg, mac, ip, subnet_mask,
+                                default_gateway):
+        for device in self._get(system_arg, _SimSystem).devices:
+            if device.mac == _value(mac):
+                device.ip = _value(ip)
+                device.subnet_mask = _value(subnet_mask)
+                device.default_gateway = _value(default_gateway)
+                return
+        raise _SimError(_ArenaCErr.INVALID_PARAMETER,
+                        'no device has this MAC address')
+
+    def _acSystemGetTLSystemNodeMap(self, system_arg, nodemap_ref):
+        system = self._get(system_arg, _SimSystem)
+        _set(nodemap_ref, self._register(system.nodemap))
+
+    def _acSystemRegisterDeviceDisconnectCallback(self, system_arg,
+                                                  device_arg, callback_ref,
+                                                  function):
+        self._get(system_arg, _SimSystem)
+        callback = _SimDisconnectCallback(self._device(device_arg), function)
+        _set(callback_ref, self._register(callback))
+
+    def _acSystemDeregisterDeviceDisconnectCallback(self, system_arg,
+                                                    callback_arg):
+        self._get(system_arg, _SimSystem)
+        self._unregister(self._get(callback_arg, _SimDisconnectCallback))
+
+    # device --------------------------------------------------------------
+
+    def _acDeviceStartStream(self, device_arg):
+        self._acDeviceStartStreamNumBuffersAndFlags(device_arg,
+                                                    NUM_OF_BUFFERS_DEFAULT)
+
+    def _acDeviceStartStreamNumBuffersAndFlags(self, device_arg,
+                                               number_of_buffers):
+        self._device(device_arg).start_stream(_value(number_of_buffers),
+                                              self._register)
+
+    def _acDeviceStopStream(self, device_arg):
+        self._device(device_arg).stop_stream(self._unregister)
+
+    def _acDeviceGetBuffer(self, device_arg, timeout, buffer_ref):
+        buffer = self._device(device_arg).get_buffer(_value(timeout))
+        _set(buffer_ref, buffer.handle)
+
+    def _acDeviceRequeueBuffer(self, device_arg, buffer_arg):
+        self._device(device_arg).requeue_buffer(self._buffer(buffer_arg))
+
+    def _acDeviceGetNodeMap(self, device_arg, nodemap_ref):
+        _set(nodemap_ref, self._register(self._device(device_arg).nodemap))
+
+    def _acDeviceGetTLDeviceNodeMap(self, device_arg, nodemap_ref):
+        _set(nodemap_ref,
+             self._register(self._device(device_arg).tl_device_nodemap))
+
+    def _acDeviceGetTLStreamNodeMap(self, device_arg, nodemap_ref):
+        _set(nodemap_ref,
+             self._register(self._device(device_arg).tl_stream_nodemap))
+
+    def _acDeviceGetTLInterfaceNodeMap(self, device_arg, nodemap_ref):
+        _set(nodemap_ref,
+             self._register(self._device(device_arg).tl_interface_nodemap))
+
+    def _acDeviceIsConnected(self, device_arg, out_ref):
+        _set(out_ref, self._device(device_arg).is_connected)
+
+    def _acDeviceInitializeEvents(self, device_arg):
+        self._device(device_arg)
+
+    def _acDeviceDeinitializeEvents(self, device_arg):
+        self._device(device_arg)
+
+    def _acDeviceWaitOnEvent(self, device_arg, timeout):
+        # the simulated devices send no events
+        self._device(device_arg)
+        timeout = _value(timeout)
+        if timeout < AC_INFINITE:
+            time.sleep(timeout / 1000)
+        raise _SimError(_ArenaCErr.TIMEOUT, 'no event before timeout')
+
+    # buffer --------------------------------------------------------------
+
+    def _acBufferGetSizeFilled(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).size)
+
+    def _acBufferGetPayloadSize(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).size)
+
+    def _acBufferGetSizeOfBuffer(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).size)
+
+    def _acBufferGetFrameId(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).frame_id)
+
+    def _acBufferGetPayloadType(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, PayloadType.IMAGE.value)
+
+    def _acBufferHasChunkData(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, False)
+
+    def _acBufferHasImageData(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, True)
+
+    def _acBufferIsIncomplete(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).is_incomplete)
+
+    def _acBufferDataLargerThanBuffer(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, False)
+
+    def _acBufferVerifyCRC(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, True)
+
+    def _acImageGetWidth(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).width)
+
+    def _acImageGetHeight(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).height)
+
+    def _acImageGetOffsetX(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).offset_x)
+
+    def _acImageGetOffsetY(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).offset_y)
+
+    def _acImageGetPaddingX(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, 0)
+
+    def _acImageGetPaddingY(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, 0)
+
+    def _acImageGetPixelFormat(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).pixel_format)
+
+    def _acImageGetBitsPerPixel(self, buffer_arg, out_ref):
+        _set(out_ref,
+             _bits_per_pixel(self._buffer(buffer_arg).pixel_format))
+
+    def _acImageGetPixelEndianness(self, buffer_arg, out_ref):
+        self._buffer(buffer_arg)
+        _set(out_ref, PixelEndianness.LITTLE.value)
+
+    def _acImageGetTimestamp(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).timestamp_ns)
+
+    def _acImageGetTimestampNs(self, buffer_arg, out_ref):
+        _set(out_ref, self._buffer(buffer_arg).timestamp_ns)
+
+    def _acImageGetData(self, buffer_arg, data_ref):
+        buffer = self._buffer(buffer_arg)
+        data_ref._obj.contents = uint8_t.from_buffer(buffer.data)
+
+    # nodemap -------------------------------------------------------------
+
+    def _nodemap_node(self, nodemap_arg, name_arg):
+        return self._nodemap(nodemap_arg).get_node(_text(name_arg))
+
+    def _acNodeMapInvalidateNodes(self, nodemap_arg):
+        self._nodemap(nodemap_arg)
+
+    def _acNodeMapGetDeviceName(self, nodemap_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._nodemap(nodemap_arg).device_name)
+
+    def _acNodeMapPoll(self, nodemap_arg, elapsed_time):
+        # values with a getter are computed when read
+        self._nodemap(nodemap_arg)
+
+    def _acNodeMapLock(self, nodemap_arg):
+        self._nodemap(nodemap_arg).lock.acquire()
+
+    def _acNodeMapUnlock(self, nodemap_arg):
+        try:
+            self._nodemap(nodemap_arg).lock.release()
+        except RuntimeError:
+            raise _SimError(_ArenaCErr.ERROR,
+                            'nodemap is not locked') from None
+
+    def _acNodeMapTryLock(self, nodemap_arg, out_ref):
+        _set(out_ref,
+             self._nodemap(nodemap_arg).lock.acquire(blocking=False))
+
+    def _acNodeMapGetNumNodes(self, nodemap_arg, out_ref):
+        _set(out_ref, len(self._nodemap(nodemap_arg).nodes))
+
+    def _acNodeMapGetNode(self, nodemap_arg, name_arg, node_ref):
+        # like the binary, a name that is not found gives a NULL node
+        node = self._nodemap(nodemap_arg).nodes_by_name.get(
+            _text(name_arg))
+        _set(node_ref, self._register(node) if node else None)
+
+    def _acNodeMapGetNodeAndAccessMode(self, nodemap_arg, name_arg,
+                                       node_ref, access_mode_ref):
+        node = self._nodemap(nodemap_arg).nodes_by_name.get(
+            _text(name_arg))
+        _set(node_ref, self._register(node) if node else None)
+        _set(access_mode_ref, node.access_mode if node else _NI)
+
+    def _nodemap_node_by_index(self, nodemap_arg, index_arg):
+        nodes = self._nodemap(nodemap_arg).nodes
+        index = _value(index_arg)
+        if index >= len(nodes):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'node index {index} out of range')
+        return nodes[index]
+
+    def _acNodeMapGetNodeByIndex(self, nodemap_arg, index, node_ref):
+        node = self._nodemap_node_by_index(nodemap_arg, index)
+        _set(node_ref, self._register(node))
+
+    def _acNodeMapGetNodeByIndexAndAccessMode(self, nodemap_arg, index,
+                                              node_ref, access_mode_ref):
+        node = self._nodemap_node_by_index(nodemap_arg, index)
+        _set(node_ref, self._register(node))
+        _set(access_mode_ref, node.access_mode)
+
+    def _acNodeMapGetStringValue(self, nodemap_arg, name_arg, buf,
+                                 len_ref):
+        _set_text(buf, len_ref,
+                  self._nodemap_node(nodemap_arg, name_arg).get())
+
+    def _acNodeMapGetIntegerValue(self, nodemap_arg, name_arg, out_ref):
+        _set(out_ref, self._nodemap_node(nodemap_arg, name_arg).get())
+
+    def _acNodeMapGetFloatValue(self, nodemap_arg, name_arg, out_ref):
+        _set(out_ref, self._nodemap_node(nodemap_arg, name_arg).get())
+
+    def _acNodeMapGetBooleanValue(self, nodemap_arg, name_arg, out_ref):
+        _set(out_ref, self._nodemap_node(nodemap_arg, name_arg).get())
+
+    def _acNodeMapGetEnumerationValue(self, nodemap_arg, name_arg, buf,
+                                      len_ref):
+        _set_text(buf, len_ref,
+                  self._nodemap_node(nodemap_arg, name_arg).get())
+
+    def _acNodeMapSetStringValue(self, nodemap_arg, name_arg, value):
+        self._nodemap_node(nodemap_arg, name_arg).set(_text(value))
+
+    def _acNodeMapSetIntegerValue(self, nodemap_arg, name_arg, value):
+        self._nodemap_node(nodemap_arg, name_arg).set(_value(value))
+
+    def _acNodeMapSetFloatValue(self, nodemap_arg, name_arg, value):
+        self._nodemap_node(nodemap_arg, name_arg).set(_value(value))
+
+    def _acNodeMapSetBooleanValue(self, nodemap_arg, name_arg, value):
+        self._nodemap_node(nodemap_arg, name_arg).set(bool(_value(value)))
+
+    def _acNodeMapSetEnumerationValue(self, nodemap_arg, name_arg, value):
+        self._nodemap_node(nodemap_arg, name_arg).set(_text(value))
+
+    def _acNodeMapExecute(self, nodemap_arg, name_arg):
+        self._nodemap_node(nodemap_arg, name_arg).set(True)
+
+    # node ----------------------------------------------------------------
+
+    def _acNodeGetAccessMode(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).access_mode)
+
+    def _acNodeGetCachingMode(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).caching_mode)
+
+    def _acNodeGetAlias(self, node_arg, node_ref):
+        self._node(node_arg)
+        _set(node_ref, None)
+
+    def _acNodeGetCastAlias(self, node_arg, node_ref):
+        self._node(node_arg)
+        _set(node_ref, None)
+
+    def _acNodeGetDescription(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).description)
+
+    def _acNodeGetDeviceName(self, node_arg, buf, len_ref):
+        node = self._node(node_arg)
+        _set_text(buf, len_ref, node.device.model if node.device else '')
+
+    def _acNodeGetDisplayName(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).name)
+
+    def _acNodeGetDocuURL(self, node_arg, buf, len_ref):
+        self._node(node_arg)
+        _set_text(buf, len_ref, '')
+
+    def _acNodeGetEventID(self, node_arg, buf, len_ref):
+        self._node(node_arg)
+        _set_text(buf, len_ref, '')
+
+    def _acNodeGetName(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).name)
+
+    def _acNodeGetFullyQualifiedName(self, node_arg, buf, len_ref):
+        node = self._node(node_arg)
+        prefix = 'EnumEntry' if node.interface_type == \
+            InterfaceType.ENUMENTRY else 'Std'
+        _set_text(buf, len_ref, f'{prefix}::{node.name}')
+
+    def _acNodeGetNamespace(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, Namespace.STANDARD.value)
+
+    def _acNodeGetPollingTime(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).polling_time)
+
+    def _acNodeGetPrincipalInterfaceType(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).interface_type.value)
+
+    def _acNodeGetToolTip(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).tooltip)
+
+    def _acNodeGetVisibility(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).visibility)
+
+    def _acNodeGetNumChildren(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, 0)
+
+    def _acNodeGetNumParents(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, 0)
+
+    def _acNodeGetNumPropertyNames(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, 0)
+
+    def _acNodeImposeVisibility(self, node_arg, visibility):
+        self._node(node_arg).visibility = _value(visibility)
+
+    def _acNodeImposeAccessMode(self, node_arg, access_mode):
+        node = self._node(node_arg)
+        # like GenICam, the access mode can only be restricted
+        imposed = _value(access_mode)
+        if imposed < node.access_mode:
+            node._access_mode = imposed
+
+    def _acNodeIsCachable(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).getter is None)
+
+    def _acNodeIsDeprecated(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, False)
+
+    def _acNodeIsFeature(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).is_feature)
+
+    def _acNodeInvalidateNode(self, node_arg):
+        self._node(node_arg)
+
+    def _acSelectorIsSelector(self, node_arg, out_ref):
+        _set(out_ref, bool(self._node(node_arg).selected))
+
+    def _acSelectorGetNumSelectingFeatures(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, 0)
+
+    def _acSelectorGetNumSelectedFeatures(self, node_arg, out_ref):
+        _set(out_ref, len(self._node(node_arg).selected))
+
+    def _acSelectorGetSelectedFeature(self, node_arg, index_arg,
+                                      feature_ref):
+        selected = self._node(node_arg).selected
+        index = _value(index_arg)
+        if index >= len(selected):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'selected feature index {index} out of range')
+        _set(feature_ref, self._register(selected[index]))
+
+    def _acValueToString(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, str(self._node(node_arg).get()))
+
+    def _acValueIsValueCacheValid(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).getter is None)
+
+    # string
+
+    def _acStringGetValue(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).get())
+
+    def _acStringSetValue(self, node_arg, value):
+        self._node(node_arg).set(_text(value))
+
+    def _acStringGetMaxLength(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).max_length)
+
+    # integer and float
+
+    def _acIntegerGetValue(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).get())
+
+    def _acIntegerSetValue(self, node_arg, value):
+        self._node(node_arg).set(_value(value))
+
+    def _acIntegerGetMin(self, node_arg, out_ref):
+        _set(out_ref, _resolve(self._node(node_arg).minimum))
+
+    def _acIntegerGetMax(self, node_arg, out_ref):
+        _set(out_ref, _resolve(self._node(node_arg).maximum))
+
+    def _acIntegerGetInc(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).inc)
+
+    def _acIntegerGetIncMode(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, IncMode.FIXED.value)
+
+    def _acIntegerGetRepresentation(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).representation)
+
+    def _acIntegerGetUnit(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).unit)
+
+    def _acIntegerImposeMin(self, node_arg, value):
+        self._node(node_arg).minimum = _value(value)
+
+    def _acIntegerImposeMax(self, node_arg, value):
+        self._node(node_arg).maximum = _value(value)
+
+    _acFloatGetValue = _acIntegerGetValue
+    _acFloatSetValue = _acIntegerSetValue
+    _acFloatGetMin = _acIntegerGetMin
+    _acFloatGetMax = _acIntegerGetMax
+    _acFloatGetRepresentation = _acIntegerGetRepresentation
+    _acFloatGetUnit = _acIntegerGetUnit
+    _acFloatImposeMin = _acIntegerImposeMin
+    _acFloatImposeMax = _acIntegerImposeMax
+
+    def _acFloatHasInc(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, False)
+
+    def _acFloatGetIncMode(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, IncMode.NONE.value)
+
+    def _acFloatGetDisplayNotation(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, DisplayNotation.AUTOMATIC.value)
+
+    def _acFloatGetDisplayPrecision(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, 6)
+
+    # boolean and command
+
+    def _acBooleanGetValue(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).get())
+
+    def _acBooleanSetValue(self, node_arg, value):
+        self._node(node_arg).set(bool(_value(value)))
+
+    def _acCommandExecute(self, node_arg):
+        self._node(node_arg).set(True)
+
+    def _acCommandIsDone(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, True)
+
+    # enumeration
+
+    def _enumeration_entry(self, node_arg, index_arg):
+        entries = self._node(node_arg).entries
+        index = _value(index_arg)
+        if index >= len(entries):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'entry index {index} out of range')
+        return entries[index]
+
+    def _current_entry(self, node_arg):
+        node = self._node(node_arg)
+        return node.get_entry(node.get())
+
+    def _acEnumerationGetNumEntries(self, node_arg, out_ref):
+        _set(out_ref, len(self._node(node_arg).entries))
+
+    def _acEnumerationGetEntryByIndex(self, node_arg, index, entry_ref):
+        _set(entry_ref,
+             self._register(self._enumeration_entry(node_arg, index)))
+
+    def _acEnumerationGetEntryAndAccessModeByIndex(self, node_arg, index,
+                                                   entry_ref,
+                                                   access_mode_ref):
+        entry = self._enumeration_entry(node_arg, index)
+        _set(entry_ref, self._register(entry))
+        _set(access_mode_ref, entry.access_mode)
+
+    def _acEnumerationGetEntryByName(self, node_arg, name_arg, entry_ref):
+        entry = self._node(node_arg).get_entry(_text(name_arg))
+        _set(entry_ref, self._register(entry) if entry else None)
+
+    def _acEnumerationGetEntryAndAccessModeByName(self, node_arg, name_arg,
+                                                  entry_ref,
+                                                  access_mode_ref):
+        entry = self._node(node_arg).get_entry(_text(name_arg))
+        _set(entry_ref, self._register(entry) if entry else None)
+        _set(access_mode_ref, entry.access_mode if entry else _NI)
+
+    def _acEnumerationGetNumSymbolics(self, node_arg, out_ref):
+        _set(out_ref, sum(1 for entry in self._node(node_arg).entries
+                          if entry.is_readable()))
+
+    def _acEnumerationGetSymbolicByIndex(self, node_arg, index, buf,
+                                         len_ref):
+        symbolics = [entry.name for entry in self._node(node_arg).entries
+                     if entry.is_readable()]
+        index = _value(index)
+        if index >= len(symbolics):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'symbolic index {index} out of range')
+        _set_text(buf, len_ref, symbolics[index])
+
+    def _acEnumerationGetCurrentEntry(self, node_arg, entry_ref):
+        _set(entry_ref, self._register(self._current_entry(node_arg)))
+
+    def _acEnumerationGetCurrentEntryAndAccessMode(self, node_arg,
+                                                   entry_ref,
+                                                   access_mode_ref):
+        entry = self._current_entry(node_arg)
+        _set(entry_ref, self._register(entry))
+        _set(access_mode_ref, entry.access_mode)
+
+    def _acEnumerationGetCurrentSymbolic(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).get())
+
+    def _acEnumerationSetBySymbolic(self, node_arg, value):
+        self._node(node_arg).set(_text(value))
+
+    def _acEnumerationSetByIntValue(self, node_arg, value):
+        node = self._node(node_arg)
+        value = _value(value)
+        for entry in node.entries:
+            if entry.int_value == value:
+                node.set(entry.name)
+                return
+        raise _SimError(_ArenaCErr.INVALID_VALUE,
+                        f'{node.name} has no entry with value {value}')
+
+    def _acEnumEntryGetIntValue(self, node_arg, out_ref):
+        _set(out_ref, self._node(node_arg).int_value)
+
+    def _acEnumEntryGetNumericValue(self, node_arg, out_ref):
+        _set(out_ref, float(self._node(node_arg).int_value))
+
+    def _acEnumEntryGetSymbolic(self, node_arg, buf, len_ref):
+        _set_text(buf, len_ref, self._node(node_arg).name)
+
+    def _acEnumEntryIsSelfClearing(self, node_arg, out_ref):
+        self._node(node_arg)
+        _set(out_ref, False)
+
+    # category
+
+    def _acCategoryGetNumFeatures(self, node_arg, out_ref):
+        _set(out_ref, len(self._node(node_arg).features))
+
+    def _category_feature(self, node_arg, index_arg):
+        features = self._node(node_arg).features
+        index = _value(index_arg)
+        if index >= len(features):
+            raise _SimError(_ArenaCErr.INVALID_INDEX,
+                            f'feature index {index} out of range')
+        return features[index]
+
+    def _acCategoryGetFeature(self, node_arg, index, feature_ref):
+        _set(feature_ref,
+             self._register(self._category_feature(node_arg, index)))
+
+    def _acCategoryGetFeatureAndAccessMode(self, node_arg, index,
+                                           feature_ref, access_mode_ref):
+        feature = self._category_feature(node_arg, index)
+        _set(feature_ref, self._register(feature))
+        _set(access_mode_ref, feature.access_mode)
@@ -11,6 +11,8 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+import threading
+
 from arena_api._xlayer.xsave.savec_configurator import SaveCConfigurator
 from arena_api._xlayer.binary.binary import Binary
 from arena_api._xlayer.binary.binary_loader import BinaryLoader
@@ -86,8 +88,52 @@ _config['user_max_version_arm'] = supported_dll_versions['arm'][_config['name']]
 _config['dependencies_sos_arm64'] = _config['dependencies_sos_lin']
 _config['dependencies_sos_armhf'] = _config['dependencies_sos_lin']
 
-_savec_binary = Binary(_config)
-_configurator = SaveCConfigurator(_savec_binary.hbinary)
-_configurator.configure()
 
-hsavec = _savec_binary.hbinary
+
+class _LazySaveC:
+    #
+    # stands for the SaveC binary handle so importing the save modules
+    # costs nothing. SaveC and its dependencies are resolved, validated and
+    # loaded on the first function used, usually by the first xWriter or
+    # xRecorder created. a function gets its argtypes and errcheck, with
+    # the rest of its group, the first time it is used
+    #
+
+    # set by CallProfiler to wrap functions as they are cached
+    _function_hook = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hbinary = None
+        self._configurator = None
+
+    def _load(self):
+        with self._lock:
+            if self._hbinary is None:
+                savec_binary = Binary(_config)
+                self._configurator = SaveCConfigurator(savec_binary.hbinary)
+                self._hbinary = savec_binary.hbinary
+        return self._hbinary
+
+    def __getattr__(self, name):
+        # only called for names not in the instance dict yet
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        hbinary = self._hbinary
+        if hbinary is None:
+            hbinary = self._load()
+        with self._lock:
+            function = getattr(hbinary, name)
+            self._configurator.configure_function(name)
+            if self._function_hook is not None:
+                function = self._function_hook(name, function)
+        # the next uses skip __getattr__
+        setattr(self, name, function)
+        return function
+
+    def is_loaded(self):
+        return self._hbinary is not None
+
+
+hsavec = _LazySaveC()
@@ -111,6 +111,7 @@ class SaveCConfigurator:
             _get_msg_func)
 
         self.raise_if_error = ret_value_checker.raise_if_error
+        self._configured_groups = set()
 
     def configure(self):
         # - assign system c function returns types dynamically since they all
@@ -121,8 +122,26 @@ class SaveCConfigurator:
         self._configure_reader()
         self._configure_writer()
         self._configure_recorder()
+        self._configured_groups.update(('global', 'reader', 'writer',
+                                        'recorder'))
         # self._raiseifnotconfigured()
 
+    def configure_function(self, name):
+        # configures only the group of the function, the first time one of
+        # its functions is used, instead of every SaveC function at load
+        if name.startswith('saveReader'):
+            group, configure_group = 'reader', self._configure_reader
+        elif name.startswith('saveWriter'):
+            group, configure_group = 'writer', self._configure_writer
+        elif name.startswith('saveRecorder'):
+            group, configure_group = 'recorder', self._configure_recorder
+        else:
+            group, configure_group = 'global', self._configure_global
+
+        if group not in self._configured_groups:
+            configure_group()
+            self._configured_groups.add(group)
+
     #
     # global
     #
@@ -0,0 +1,404 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from arena_api._device import Device as _Device
+from arena_api.system import system as _system
+
+# device nodes changed by setup(), restored by restore() in this order.
+# ActionDeviceKey is write only and can not be restored. nodes that the
+# device does not have, or that are not readable when setup() is called,
+# are not restored
+_DEVICE_NODES_TO_RESTORE = (
+    'TriggerSelector',
+    'TriggerMode',
+    'TriggerSource',
+    'ActionUnconditionalMode',
+    'ActionSelector',
+    'ActionGroupKey',
+    'ActionGroupMask'
+)
+
+# device nodes changed by setup() with transfer_control, restored after
+# _DEVICE_NODES_TO_RESTORE
+_TRANSFER_NODES_TO_RESTORE = (
+    'TransferOperationMode',
+    'TransferControlMode'
+)
+
+# restored last
+_PTP_NODES_TO_RESTORE = (
+    'PtpEnable',
+)
+
+# stream nodes changed by setup(), restored by restore()
+_STREAM_NODES_TO_RESTORE = (
+    'StreamAutoNegotiatePacketSize',
+    'StreamPacketResendEnable'
+)
+
+# system nodes changed by setup(), restored by restore()
+_SYSTEM_NODES_TO_RESTORE = (
+    'ActionCommandDeviceKey',
+    'ActionCommandGroupKey',
+    'ActionCommandGroupMask',
+    'ActionCommandTargetIP'
+)
+
+
+class ScheduledActionOrchestrator():
+    """
+    Captures synchronized frames from several devices with scheduled
+    action commands. It automates ``py_scheduled_action_commands.py``:\n
+    - ``setup()`` configures trigger, action keys, transfer control and \
+    PTP on every device in parallel, and the action command nodes of \
+    ``system.tl_system_nodemap``.
+    - ``wait_for_ptp_lock()`` waits until there is one PTP master and \
+    all other devices are slaves.
+    - ``run()`` fires a train of action commands, each one scheduled in \
+    the future, from a background thread and yields the frame of every \
+    device for each of them.
+    - ``report()`` gives per device latency of the frame timestamp \
+    relative to the scheduled action time.
+    - ``restore()`` writes back the node values read by ``setup()``.
+
+    **Args**:
+        devices :
+            - a ``list`` of ``Device`` instances.
+        device_key, group_key, group_mask :
+            - action command keys written to the devices and the system.
+        target_ip :
+            - ``ActionCommandTargetIP``, ``0xFFFFFFFF`` broadcasts.
+        transfer_control :
+            - use ``UserControlled`` transfer control so the devices \
+            transmit one at a time after a synchronized exposure.
+
+    >>> orchestrator = ScheduledActionOrchestrator(devices)
+    >>> orchestrator.setup()
+    >>> orchestrator.wait_for_ptp_lock()
+    >>> for device in devices:
+    >>>     device.start_stream()
+    >>> for action_time_ns, frames in orchestrator.run(100, 50_000_000):
+    >>>     for device, buffer in frames.items():
+    >>>         process(device, buffer)
+    >>> print(orchestrator.report())
+    >>> orchestrator.restore()
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, devices, device_key=1, group_key=1, group_mask=1,
+                 target_ip=0xFFFFFFFF, transfer_control=True):
+
+        if not isinstance(devices, (list, tuple)) or not devices:
+            raise ValueError('expected a non empty list of devices')
+        for device in devices:
+            if not isinstance(device, _Device):
+                raise TypeError(f'Device expected instead of '
+                                f'{type(device).__name__}')
+
+        self.__devices = list(devices)
+        self.__device_key = device_key
+        self.__group_key = group_key
+        self.__group_mask = group_mask
+        self.__target_ip = target_ip
+        self.__transfer_control = transfer_control
+
+        # nodemap instances are reused across the whole run so nodes are
+        # not looked up through a new nodemap every frame
+        self.__nodemaps = [device.nodemap for device in self.__devices]
+        self.__stream_nodemaps = [device.tl_stream_nodemap
+                                  for device in self.__devices]
+        self.__system_nodemap = _system.tl_system_nodemap
+
+        self.__initial_device_values = []
+        self.__initial_system_values = {}
+        self.__latencies_ns = [[] for _ in self.__devices]
+
+    # setup ---------------------------------------------------------------
+
+    def __in_parallel(self, func, *iterables):
+        with ThreadPoolExecutor(max_workers=len(self.__devices)) as executor:
+            return list(executor.map(func, *iterables))
+
+    def __get_device_nodes_to_restore(self):
+        if self.__transfer_control:
+            return _DEVICE_NODES_TO_RESTORE + _TRANSFER_NODES_TO_RESTORE + \
+                _PTP_NODES_TO_RESTORE
+        return _DEVICE_NODES_TO_RESTORE + _PTP_NODES_TO_RESTORE
+
+    @staticmethod
+    def __read_readable_values(nodemap, names):
+        feature_index = nodemap.feature_index
+        names = [name for name in names if name in feature_index]
+        return {name: node.value for name, node in
+                nodemap.get_node(names).items() if node.is_readable}
+
+    def __read_initial_values(self, nodemap, stream_nodemap):
+        return (self.__read_readable_values(
+                    nodemap, self.__get_device_nodes_to_restore()),
+                self.__read_readable_values(stream_nodemap,
+                                            _STREAM_NODES_TO_RESTORE))
+
+    def __setup_device(self, device, nodemap):
+        device.tl_stream_nodemap['StreamAutoNegotiatePacketSize'].value = True
+        device.tl_stream_nodemap['StreamPacketResendEnable'].value = True
+
+        nodemap['TriggerSelector'].value = 'FrameStart'
+        nodemap['TriggerMode'].value = 'On'
+        nodemap['TriggerSource'].value = 'Action0'
+
+        nodemap['ActionUnconditionalMode'].value = 'On'
+        nodemap['ActionSelector'].value = 0
+        nodemap['ActionDeviceKey'].value = self.__device_key
+        nodemap['ActionGroupKey'].value = self.__group_key
+        nodemap['ActionGroupMask'].value = self.__group_mask
+
+        if self.__transfer_control:
+            nodemap['TransferControlMode'].value = 'UserControlled'
+            nodemap['TransferOperationMode'].value = 'Continuous'
+            nodemap['TransferStop'].execute()
+
+        nodemap['PtpEnable'].value = True
+
+    def setup(self):
+        """
+        Stores the initial node values then configures all devices, in
+        parallel, and the system for action commands.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        self.__initial_device_values = self.__in_parallel(
+            self.__read_initial_values, self.__nodemaps,
+            self.__stream_nodemaps)
+        self.__initial_system_values = {
+            name: self.__system_nodemap[name].value
+            for name in _SYSTEM_NODES_TO_RESTORE}
+
+        self.__in_parallel(self.__setup_device,
+                           self.__devices, self.__nodemaps)
+
+        system_nodemap = self.__system_nodemap
+        system_nodemap['ActionCommandDeviceKey'].value = self.__device_key
+        system_nodemap['ActionCommandGroupKey'].value = self.__group_key
+        system_nodemap['ActionCommandGroupMask'].value = self.__group_mask
+        system_nodemap['ActionCommandTargetIP'].value = self.__target_ip
+
+    def restore(self):
+        """
+        Writes back the node values stored by ``setup()``. Nodes that
+        the device does not have or that were not readable then, and
+        ``ActionDeviceKey`` which is write only, are left as they are.
+        The transfer nodes are only restored with ``transfer_control``.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        def restore_nodes(nodemap, values, names):
+            for name in names:
+                if name in values:
+                    nodemap[name].value = values[name]
+
+        def restore_device(nodemap, stream_nodemap, initial_values):
+            # PtpEnable last, trigger mode before its source, transfer
+            # operation mode while transfer control is still user
+            # controlled
+            device_values, stream_values = initial_values
+            restore_nodes(nodemap, device_values,
+                          self.__get_device_nodes_to_restore())
+            restore_nodes(stream_nodemap, stream_values,
+                          _STREAM_NODES_TO_RESTORE)
+
+        if self.__initial_device_values:
+            self.__in_parallel(restore_device, self.__nodemaps,
+                               self.__stream_nodemaps,
+                               self.__initial_device_values)
+        for name, value in self.__initial_system_values.items():
+            self.__system_nodemap[name].value = value
+
+    # ptp -----------------------------------------------------------------
+
+    def wait_for_ptp_lock(self, timeout_sec=60, poll_interval_sec=1):
+        """
+        Waits for the devices to negotiate their PTP relationship: exactly
+        one ``'Master'`` and every other device ``'Slave'``. It can take
+        about 40 seconds depending on the initial PTP state of each device.
+
+        **Raises**:
+            - ``TimeoutError`` :
+                - the devices did not lock within ``timeout_sec``.
+
+        **Returns**:
+            - ``list`` of the ``PtpStatus`` of each device.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        status_nodes = [nodemap['PtpStatus'] for nodemap in self.__nodemaps]
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            statuses = [node.value for node in status_nodes]
+            if (statuses.count('Master') == 1 and
+                    statuses.count('Slave') == len(statuses) - 1):
+                return statuses
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'PTP did not lock within {timeout_sec} '
+                                   f'sec, status: {statuses}')
+            time.sleep(poll_interval_sec)
+
+    # run -----------------------------------------------------------------
+
+    def __latch_ptp_time_ns(self):
+        nodemap = self.__nodemaps[0]
+        nodemap['PtpDataSetLatch'].execute()
+        return nodemap['PtpDataSetLatchValue'].value
+
+    def run(self, number_of_actions, interval_ns, lead_time_ns=100_000_000,
+            timeout_millisec=2000):
+        """
+        Schedules ``number_of_actions`` action commands ``interval_ns``
+        apart, the first one ``lead_time_ns`` after the current PTP time of
+        the first device. Each action command is fired ``lead_time_ns``
+        before its execution time by a background thread, on schedule
+        whether or not the frames of the previous actions were collected,
+        so ``interval_ns`` can be shorter than the exposure plus the
+        transfer time. Frames wait in the stream buffers until they are
+        collected; use enough buffers to cover the actions fired ahead.
+        Devices must be streaming.
+
+        **Args**:
+            number_of_actions :
+                - number of action commands to schedule.
+            interval_ns :
+                - time between scheduled action commands.
+            lead_time_ns :
+                - how long before its execution time each action command \
+                is fired. It must cover the command delivery time.
+            timeout_millisec :
+                - ``get_buffer()`` timeout for each frame.
+
+        **Returns**:
+            - a generator of ``(action_time_ns, frames)`` tuples where \
+            ``frames`` is a ``dict`` of ``Device`` to ``Buffer``. Buffers \
+            are requeued when the next tuple is requested.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        if interval_ns <= 0 or lead_time_ns <= 0:
+            raise ValueError('interval_ns and lead_time_ns must be > 0')
+
+        system_nodemap = self.__system_nodemap
+        execute_time_node = system_nodemap['ActionCommandExecuteTime']
+        fire_node = system_nodemap['ActionCommandFireCommand']
+        transfer_nodes = [
+            (nodemap['TransferStart'], nodemap['TransferStop'])
+            if self.__transfer_control else None
+            for nodemap in self.__nodemaps]
+        self.__latencies_ns = [[] for _ in self.__devices]
+
+        # the host clock paces the firing, the PTP clock sets the action
+        # times; both are taken at the same latch
+        first_action_ptp_ns = self.__latch_ptp_time_ns() + lead_time_ns
+        latch_host_time = time.perf_counter()
+
+        # action times as they are fired, or the error that stopped firing
+        fired = queue.Queue()
+        stop_firing = threading.Event()
+
+        def fire_actions():
+            try:
+                for action_index in range(number_of_actions):
+                    fire_host_time = \
+                        latch_host_time + action_index * interval_ns / 1e9
+                    remaining = fire_host_time - time.perf_counter()
+                    if stop_firing.wait(max(remaining, 0)):
+                        return
+                    action_time_ns = \
+                        first_action_ptp_ns + action_index * interval_ns
+                    execute_time_node.value = action_time_ns
+                    fire_node.execute()
+                    fired.put(action_time_ns)
+            except Exception as error:
+                fired.put(error)
+
+        firing_thread = threading.Thread(
+            target=fire_actions, name='ScheduledActionOrchestrator',
+            daemon=True)
+        firing_thread.start()
+
+        try:
+            for _ in range(number_of_actions):
+                action_time_ns = fired.get()
+                if isinstance(action_time_ns, Exception):
+                    raise action_time_ns
+
+                frames = {}
+                try:
+                    for device_index, device in enumerate(self.__devices):
+                        if transfer_nodes[device_index] is not None:
+                            transfer_nodes[device_index][0].execute()
+                        buffer = device.get_buffer(timeout=timeout_millisec)
+                        if transfer_nodes[device_index] is not None:
+                            transfer_nodes[device_index][1].execute()
+                        frames[device] = buffer
+                        self.__latencies_ns[device_index].append(
+                            buffer.timestamp_ns - action_time_ns)
+
+                    yield action_time_ns, frames
+                finally:
+                    for device, buffer in frames.items():
+                        device.requeue_buffer(buffer)
+        finally:
+            stop_firing.set()
+            firing_thread.join()
+
+    # report --------------------------------------------------------------
+
+    def report(self):
+        """
+        Latency, in nanoseconds, of each device frame timestamp relative to
+        its scheduled action time during the last ``run()``.
+
+        **Returns**:
+            - a ``list``, in the order of the devices, of ``dict`` with \
+            ``frames``, ``mean_ns``, ``min_ns``, ``max_ns`` and \
+            ``stdev_ns`` keys.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        report = []
+        for latencies in self.__latencies_ns:
+            report.append({
+                'frames': len(latencies),
+                'mean_ns': statistics.mean(latencies) if latencies else None,
+                'min_ns': min(latencies) if latencies else None,
+                'max_ns': max(latencies) if latencies else None,
+                'stdev_ns': (statistics.pstdev(latencies)
+                             if len(latencies) > 1 else 0.0)
+            })
+        return report
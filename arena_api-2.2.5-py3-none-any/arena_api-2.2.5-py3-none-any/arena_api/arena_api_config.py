@@ -65,3 +65,64 @@ SAVEC_CUSTOM_PATHS = {
     'python32_lin': '',
     'python64_lin': ''
 }
+
+"""
+- ``ARENAC_FAST_BINDINGS`` set to ``True`` before ``arena_api.system`` is
+  imported makes the most called ArenaC functions (node values, node
+  lookup, get/requeue buffer, image size and timestamp) go through
+  lighter bindings. They reuse per thread ctypes out parameters, call
+  cached function pointers and check the returned error code directly.
+  Behaviour and exceptions are the same as the default bindings.
+
+  >>> from arena_api import arena_api_config
+  >>> arena_api_config.ARENAC_FAST_BINDINGS = True
+  >>> from arena_api.system import system
+"""
+
+ARENAC_FAST_BINDINGS = False
+
+"""
+- ``BINARY_VALIDATION_CACHE`` set to ``False`` validates the ArenaC and
+  SaveC binaries every time ``arena_api.system`` is imported. When
+  ``True`` a binary that passed the path, platform and version checks is
+  recorded in ``arena_api/binary_validation.json`` under the user cache
+  directory (``%LOCALAPPDATA%`` on Windows, ``$XDG_CACHE_HOME`` or
+  ``~/.cache`` on Linux) and is not checked again until its resolved path,
+  size or modification time changes.
+"""
+
+BINARY_VALIDATION_CACHE = True
+
+"""
+- ``ARENAC_SIMULATED`` set to ``True`` before ``arena_api.system`` is
+  imported replaces ArenaC with a simulator, so code using arena_api can
+  run without ArenaSDK or a device. No binary is loaded. The simulated
+  devices have the common image format, acquisition, gain and transport
+  layer nodes and stream a moving gradient at the configured frame rate.
+  Callbacks, chunk data, events, image factory and saving images are not
+  simulated and raise ``NotImplementedError``.
+
+  ``ARENAC_SIMULATION`` configures the simulation, a missing key takes
+  its default:
+
+   'devices' : number of devices, default 1
+   'model' : device model name
+   'sensor_width', 'sensor_height' : sensor size, default 2448 x 2048
+   'width', 'height' : image size at start up, default the sensor size,
+   at most the sensor size
+   'pixel_format' : pixel format at start up, default 'Mono8'
+   'frame_rate' : frames per second, default 30.0
+   'exposure_time' : exposure time at start up in us, default 5000.0
+   'drop_rate' : probability of a frame to be missed, default 0.0
+   'jitter_sec' : maximum random delay of a frame in seconds, default 0.0
+   'seed' : seed of the random drops and jitter, default None
+
+  >>> from arena_api import arena_api_config
+  >>> arena_api_config.ARENAC_SIMULATED = True
+  >>> arena_api_config.ARENAC_SIMULATION = {'devices': 2, 'frame_rate': 60}
+  >>> from arena_api.system import system
+"""
+
+ARENAC_SIMULATED = False
+
+ARENAC_SIMULATION = {}
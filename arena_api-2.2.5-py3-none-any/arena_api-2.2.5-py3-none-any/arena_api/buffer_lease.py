@@ -0,0 +1,259 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import ctypes
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+
+from arena_api._device import Device as _Device
+
+
+class _LeaseStats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.leases = 0
+        self.outstanding = 0
+        self.max_outstanding = 0
+        # recent hold times only, so long streams do not grow it forever
+        self.hold_times_sec = deque(maxlen=4096)
+        # id(lease) -> (acquired time, creation stack) when tracking leaks
+        self.tracked = {}
+
+    def acquired(self, lease_id, stack):
+        with self.lock:
+            self.leases += 1
+            self.outstanding += 1
+            self.max_outstanding = max(self.max_outstanding,
+                                       self.outstanding)
+            if stack is not None:
+                self.tracked[lease_id] = (time.perf_counter(), stack)
+
+    def released(self, lease_id, hold_time_sec):
+        with self.lock:
+            self.outstanding -= 1
+            self.hold_times_sec.append(hold_time_sec)
+            self.tracked.pop(lease_id, None)
+
+
+def _requeue(device, buffer, stream_id, acquired_time, stats, lease_id):
+    # runs once, from release() or when the last reference is dropped; it
+    # must not reference the lease itself. the buffer is freed, not
+    # requeued, once the stream is stopped or the device destroyed
+    try:
+        if device._stream_id == stream_id:
+            device.requeue_buffer(buffer)
+    finally:
+        stats.released(lease_id, time.perf_counter() - acquired_time)
+
+
+class BufferLease():
+    """
+    Holds a buffer retrieved from a device and requeues it when the lease
+    and every view handed out by it are no longer referenced, or when
+    ``release()`` is called. Created by ``BufferLeaser.get()``.
+
+    Views are zero copy: ``memoryview()`` needs nothing else, ``ndarray()``
+    needs numpy. Each view keeps the lease alive, so a view can be passed to
+    another thread and the buffer is requeued only after that thread drops
+    it.
+
+    Leases still held when the stream is stopped or the device destroyed
+    are not requeued when released, their buffers are freed with the
+    stream, and a lease is not released at interpreter exit.
+
+    :warning:\n
+    - views must not be used after ``release()``, nor after the stream \
+    is stopped.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, device, buffer, stats, track_leaks):
+        self.__buffer = buffer
+        stack = traceback.format_stack()[:-2] if track_leaks else None
+        stats.acquired(id(self), stack)
+        self.__finalizer = weakref.finalize(self, _requeue, device, buffer,
+                                            device._stream_id,
+                                            time.perf_counter(), stats,
+                                            id(self))
+        # the device may be gone by then
+        self.__finalizer.atexit = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __get_buffer(self):
+        if not self.__finalizer.alive:
+            raise ValueError('the buffer lease was released')
+        return self.__buffer
+
+    buffer = property(__get_buffer)
+    """
+    The leased ``Buffer``. Do not requeue it directly.
+    """
+
+    def __get_is_released(self):
+        return not self.__finalizer.alive
+
+    is_released = property(__get_is_released)
+
+    def release(self):
+        """
+        Requeues the buffer now instead of waiting for the last reference
+        to be dropped. Calling it more than once does nothing.
+        """
+        self.__finalizer()
+
+    def __ctypes_array(self):
+        buffer = self.buffer
+        size = buffer.xbuffer.xBufferGetPayloadSize()
+        address = ctypes.addressof(buffer.pdata.contents)
+        array = (ctypes.c_uint8 * size).from_address(address)
+        # the view keeps the lease, and so the buffer, alive
+        array._lease = self
+        return array
+
+    def memoryview(self):
+        """
+        Zero copy ``memoryview`` of the payload bytes.
+        """
+        return memoryview(self.__ctypes_array())
+
+    def ndarray(self):
+        """
+        Zero copy ``(height, width)`` ``numpy.ndarray`` of the image data.
+        Only single channel unpacked pixel formats are supported.
+        """
+        from arena_api._buffer_helpers import dtype_from_bits_per_pixel
+
+        import numpy as np  # pip install numpy
+
+        buffer = self.buffer
+        dtype = dtype_from_bits_per_pixel(buffer.bits_per_pixel)
+        height = buffer.height
+        width = buffer.width
+        array = np.frombuffer(self.__ctypes_array(), dtype=dtype,
+                              count=height * width)
+        return array.reshape(height, width)
+
+
+class BufferLeaser():
+    """
+    Gets buffers from a streaming device as ``BufferLease`` instances and
+    keeps metrics on how long they are held.
+
+    **Args**:
+        device :
+            - a ``Device`` instance.
+        number_of_buffers :
+            - number of buffers the stream was started with. It is only \
+            used to report how close the leases get to starving the stream.
+        track_leaks :
+            - record the stack where every lease was created so \
+            ``outstanding()`` can show where unreleased leases come from.
+
+    >>> leaser = BufferLeaser(device, number_of_buffers=10)
+    >>> with device.start_stream(10):
+    >>>     lease = leaser.get()
+    >>>     frame = lease.ndarray()
+    >>>     work_queue.put(frame)  # requeued when the worker drops frame
+    >>>     del lease
+    >>> print(leaser.stats())
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, device, number_of_buffers=None, track_leaks=False):
+
+        if not isinstance(device, _Device):
+            raise TypeError(f'Device expected instead of '
+                            f'{type(device).__name__}')
+
+        self.__device = device
+        self.__number_of_buffers = number_of_buffers
+        self.__track_leaks = track_leaks
+        self.__stats = _LeaseStats()
+
+    def get(self, timeout=None):
+        """
+        Gets the next buffer from the device as a ``BufferLease``.
+        """
+        buffer = self.__device.get_buffer(timeout=timeout)
+        return BufferLease(self.__device, buffer, self.__stats,
+                           self.__track_leaks)
+
+    def outstanding(self):
+        """
+        Leases not released yet, when ``track_leaks`` is on.
+
+        **Returns**:
+            - ``list`` of ``(held_sec, creation_stack)`` tuples, the \
+            longest held first.
+        """
+        now = time.perf_counter()
+        with self.__stats.lock:
+            tracked = list(self.__stats.tracked.values())
+        return sorted(((now - acquired_time, ''.join(stack))
+                       for acquired_time, stack in tracked),
+                      key=lambda entry: entry[0], reverse=True)
+
+    def stats(self):
+        """
+        Lease metrics.
+
+        **Returns**:
+            - ``dict`` with ``leases``, ``outstanding``, \
+            ``max_outstanding``, ``number_of_buffers``, \
+            ``max_outstanding_ratio`` (``max_outstanding`` over \
+            ``number_of_buffers``; the stream starves at ``1.0``) and \
+            ``hold_time_ms`` with ``mean``, ``p50``, ``p99`` and ``max``.
+        """
+        stats = self.__stats
+        with stats.lock:
+            hold_times_ms = sorted(t * 1000 for t in stats.hold_times_sec)
+            leases = stats.leases
+            outstanding = stats.outstanding
+            max_outstanding = stats.max_outstanding
+
+        def percentile(percent):
+            if not hold_times_ms:
+                return None
+            index = min(int(percent / 100 * len(hold_times_ms)),
+                        len(hold_times_ms) - 1)
+            return hold_times_ms[index]
+
+        number_of_buffers = self.__number_of_buffers
+        return {
+            'leases': leases,
+            'outstanding': outstanding,
+            'max_outstanding': max_outstanding,
+            'number_of_buffers': number_of_buffers,
+            'max_outstanding_ratio': (max_outstanding / number_of_buffers
+                                      if number_of_buffers else None),
+            'hold_time_ms': {
+                'mean': (sum(hold_times_ms) / len(hold_times_ms)
+                         if hold_times_ms else None),
+                'p50': percentile(50),
+                'p99': percentile(99),
+                'max': hold_times_ms[-1] if hold_times_ms else None
+            }
+        }
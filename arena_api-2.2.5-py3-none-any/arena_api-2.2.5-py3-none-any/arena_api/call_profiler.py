@@ -0,0 +1,373 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from arena_api._xlayer.xarena.arenac import harenac as _harenac
+from arena_api._xlayer.xsave.savec import hsavec as _hsavec
+
+# calls from these files are attributed to their first caller outside them
+_XLAYER_DIR = str(Path(__file__).parent / '_xlayer')
+
+_SORT_KEYS = ('total', 'count', 'mean', 'p50', 'p90', 'p99', 'max')
+
+# the started profiler, only one at a time
+_active = None
+_active_lock = threading.Lock()
+
+
+class _FunctionStats:
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+        self.durations_sec = array('d')
+        self.total_sec = 0.0
+        self.errors = 0
+        # (file name, line, function) -> number of calls
+        self.callers = {}
+
+
+def _caller(frame):
+    while frame is not None and \
+            frame.f_code.co_filename.startswith(_XLAYER_DIR):
+        frame = frame.f_back
+    if frame is None:
+        return None
+    code = frame.f_code
+    return (code.co_filename, frame.f_lineno, code.co_name)
+
+
+def _percentile(sorted_values, percent):
+    index = min(int(percent / 100 * len(sorted_values)),
+                len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class CallProfiler():
+    """
+    Times every call to the ArenaC and SaveC functions while it is
+    started, to find which of them a pipeline spends its time in.
+
+    ``start()`` replaces the configured function pointers on the ArenaC
+    and SaveC handles with timing wrappers, ``stop()`` puts the original
+    pointers back, so nothing is paid while the profiler is stopped. SaveC
+    functions are wrapped as they are loaded. Only one profiler can be
+    started at a time.
+
+    For each function the profiler records the number of calls, the total
+    and the percentile latencies, the calls that raised, and the Python
+    line that made the call: the first frame outside of the ctypes wrapper
+    layer, for example the ``Buffer.width`` property or ``Node.value``.
+    With ``trace`` every call is also kept as a Chrome trace event.
+
+    :warning:\n
+    - with ``arena_api_config.ARENAC_FAST_BINDINGS`` the fast wrappers \
+    hold their own function pointers and their calls are not recorded.
+
+    **Args**:
+        callers :
+            - record the calling Python line of every call.
+        trace :
+            - keep a trace event per call for ``write_chrome_trace()``.
+        max_trace_events :
+            - trace events kept, the calls after it are only counted.
+
+    >>> profiler = CallProfiler()
+    >>> with profiler:
+    >>>     for _ in range(100):
+    >>>         buffer = device.get_buffer()
+    >>>         process(buffer.width, buffer.height, buffer.data)
+    >>>         device.requeue_buffer(buffer)
+    >>> print(profiler.report(limit=10))
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, callers=True, trace=False,
+                 max_trace_events=1000000):
+
+        if max_trace_events < 0:
+            raise ValueError('max_trace_events must be >= 0')
+
+        self.__record_callers = callers
+        self.__trace = trace
+        self.__max_trace_events = max_trace_events
+
+        self.__lock = threading.Lock()
+        self.__stats = {}
+        # (name, category, start sec, duration sec, thread id)
+        self.__trace_events = []
+        self.__dropped_trace_events = 0
+        self.__start_time = None
+        self.__started_at = None
+        self.__elapsed_sec = 0.0
+
+        # (handle, name) -> original function
+        self.__originals = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # wrapping ------------------------------------------------------------
+
+    def __record(self, stats, start, duration, raised, frame):
+        caller = _caller(frame) if self.__record_callers else None
+        with self.__lock:
+            stats.durations_sec.append(duration)
+            stats.total_sec += duration
+            if raised:
+                stats.errors += 1
+            if caller is not None:
+                stats.callers[caller] = stats.callers.get(caller, 0) + 1
+            if self.__trace:
+                if len(self.__trace_events) < self.__max_trace_events:
+                    self.__trace_events.append(
+                        (stats.name, stats.category,
+                         start - self.__start_time, duration,
+                         threading.get_ident()))
+                else:
+                    self.__dropped_trace_events += 1
+
+    def __wrap(self, handle, category, name, function):
+        stats = self.__stats.get((category, name))
+        if stats is None:
+            stats = self.__stats[(category, name)] = \
+                _FunctionStats(name, category)
+        self.__originals[(handle, name)] = function
+
+        perf_counter = time.perf_counter
+        record = self.__record
+        getframe = sys._getframe
+
+        def wrapper(*args):
+            raised = True
+            start = perf_counter()
+            try:
+                result = function(*args)
+                raised = False
+                return result
+            finally:
+                record(stats, start, perf_counter() - start, raised,
+                       getframe(1))
+
+        wrapper.__name__ = name
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    def __wrap_handle(self, handle, category):
+        # the configured functions are the ones cached on the handle
+        for name, function in list(vars(handle).items()):
+            if name.startswith('_') or not callable(function):
+                continue
+            setattr(handle, name,
+                    self.__wrap(handle, category, name, function))
+
+        # functions resolved later by a lazy handle are wrapped as they
+        # are cached
+        def hook(name, function):
+            return self.__wrap(handle, category, name, function)
+
+        handle._function_hook = hook
+
+    def start(self):
+        """
+        Wraps the ArenaC and SaveC functions and starts recording.
+        Recorded calls are kept across ``stop()`` and ``start()``, use
+        ``reset()`` to clear them.
+        """
+        global _active
+        with _active_lock:
+            if _active is self:
+                return
+            if _active is not None:
+                raise RuntimeError('another CallProfiler is started')
+            _active = self
+
+        if self.__start_time is None:
+            self.__start_time = time.perf_counter()
+        self.__started_at = time.perf_counter()
+        self.__wrap_handle(_harenac, 'ArenaC')
+        self.__wrap_handle(_hsavec, 'SaveC')
+
+    def stop(self):
+        """
+        Puts the original functions back.
+        """
+        global _active
+        with _active_lock:
+            if _active is not self:
+                return
+            _active = None
+
+        for handle in (_harenac, _hsavec):
+            handle._function_hook = None
+        for (handle, name), function in self.__originals.items():
+            setattr(handle, name, function)
+        self.__originals = {}
+        self.__elapsed_sec += time.perf_counter() - self.__started_at
+
+    def is_started(self):
+        return _active is self
+
+    def reset(self):
+        """
+        Clears the recorded calls.
+        """
+        with self.__lock:
+            for stats in self.__stats.values():
+                stats.durations_sec = array('d')
+                stats.total_sec = 0.0
+                stats.errors = 0
+                stats.callers = {}
+            self.__trace_events = []
+            self.__dropped_trace_events = 0
+            self.__elapsed_sec = 0.0
+            if self.is_started():
+                self.__started_at = time.perf_counter()
+
+    # results -------------------------------------------------------------
+
+    def stats(self):
+        """
+        Recorded calls per function.
+
+        **Returns**:
+            - ``dict`` of function name to a ``dict`` with ``category`` \
+            (``'ArenaC'`` or ``'SaveC'``), ``count``, ``errors``, \
+            ``total_ms``, ``mean_us``, ``p50_us``, ``p90_us``, ``p99_us``, \
+            ``max_us`` and ``callers``, a ``list`` of \
+            ``(file name, line, function, calls)`` the most calls first. \
+            Functions never called are left out.
+        """
+        with self.__lock:
+            recorded = [(stats, sorted(stats.durations_sec),
+                         stats.total_sec, stats.errors,
+                         dict(stats.callers))
+                        for stats in self.__stats.values()
+                        if stats.durations_sec]
+
+        result = {}
+        for stats, durations_sec, total_sec, errors, callers in recorded:
+            result[stats.name] = {
+                'category': stats.category,
+                'count': len(durations_sec),
+                'errors': errors,
+                'total_ms': total_sec * 1e3,
+                'mean_us': total_sec / len(durations_sec) * 1e6,
+                'p50_us': _percentile(durations_sec, 50) * 1e6,
+                'p90_us': _percentile(durations_sec, 90) * 1e6,
+                'p99_us': _percentile(durations_sec, 99) * 1e6,
+                'max_us': durations_sec[-1] * 1e6,
+                'callers': sorted(
+                    (caller + (count,) for caller, count in callers.items()),
+                    key=lambda caller: caller[3], reverse=True)
+            }
+        return result
+
+    def report(self, sort_by='total', limit=None, callers=3):
+        """
+        The recorded calls as a text table, the most expensive first.
+
+        **Args**:
+            sort_by :
+                - one of ``'total'``, ``'count'``, ``'mean'``, ``'p50'``, \
+                ``'p90'``, ``'p99'`` or ``'max'``.
+            limit :
+                - number of functions to show, ``None`` shows all of them.
+            callers :
+                - number of calling lines to show under each function.
+
+        **Returns**:
+            - ``str``.
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f'sort_by must be one of {_SORT_KEYS}')
+        key = 'total_ms' if sort_by == 'total' else \
+            'count' if sort_by == 'count' else f'{sort_by}_us'
+
+        stats = sorted(self.stats().items(),
+                       key=lambda item: item[1][key], reverse=True)
+        if limit is not None:
+            stats = stats[:limit]
+
+        total_ms = sum(function_stats['total_ms']
+                       for _, function_stats in stats)
+        elapsed_sec = self.__elapsed_sec
+        if self.is_started():
+            elapsed_sec += time.perf_counter() - self.__started_at
+
+        lines = [f'{total_ms:.1f} ms in ArenaC/SaveC calls over '
+                 f'{elapsed_sec * 1e3:.1f} ms profiled',
+                 f'{"function":>42} {"calls":>9} {"total ms":>10} '
+                 f'{"mean us":>9} {"p50 us":>9} {"p90 us":>9} '
+                 f'{"p99 us":>9} {"max us":>9}']
+        for name, s in stats:
+            errors = f' ({s["errors"]} raised)' if s['errors'] else ''
+            lines.append(f'{name:>42} {s["count"]:9d} {s["total_ms"]:10.2f} '
+                         f'{s["mean_us"]:9.2f} {s["p50_us"]:9.2f} '
+                         f'{s["p90_us"]:9.2f} {s["p99_us"]:9.2f} '
+                         f'{s["max_us"]:9.2f}{errors}')
+            for file_name, line, function, count in s['callers'][:callers]:
+                lines.append(f'{"":>44}{count:9d} calls from {function} '
+                             f'{os.path.basename(file_name)}:{line}')
+        return '\n'.join(lines)
+
+    def write_chrome_trace(self, file_name):
+        """
+        Writes the calls recorded with ``trace`` as a Chrome trace JSON
+        file, to open in ``chrome://tracing`` or Perfetto. Each thread is
+        a track and each call a slice named after the function.
+
+        **Args**:
+            file_name :
+                - path of the file to write.
+
+        **Returns**:
+            - number of events written.
+        """
+        if not self.__trace:
+            raise ValueError('the profiler was created without trace')
+
+        with self.__lock:
+            trace_events = list(self.__trace_events)
+            dropped = self.__dropped_trace_events
+
+        pid = os.getpid()
+        events = [{
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start_sec * 1e6,
+            'dur': duration_sec * 1e6,
+            'pid': pid,
+            'tid': thread_id
+        } for name, category, start_sec, duration_sec, thread_id
+            in trace_events]
+
+        with open(file_name, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events,
+                       'displayTimeUnit': 'ms',
+                       'otherData': {'dropped_events': dropped}}, f)
+        return len(events)
@@ -11,6 +11,10 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+import queue
+import threading
+import time
+import weakref
 from ctypes import cast, py_object
 from functools import wraps
 
@@ -172,9 +176,10 @@ class _Callback:
 
         # check function decorators
         # TODO dont have to check this change to try and catch
-        decorated = hasattr(callback_function, '_decorator')
+        decorator = _DeviceCallbackFunctionDecorator.decorator_of(
+            callback_function)
 
-        if not decorated or callback_function._decorator not in self._supported_decorators:
+        if decorator not in self._supported_decorators:
             decorators_list_with_at = [
                 f'@{deco}' for deco in self._supported_decorators]
             raise ValueError(f'\'{callback_function}\' must be decorated to be '
@@ -292,6 +297,57 @@ class _Callback:
         else:
             return None
 
+    def latency_histogram(self, handle):
+        """
+        Latency statistics of a callback function decorated with \
+        ``@callback_function.device.on_buffer_dispatch``. The returned \
+        ``dict`` has the following keys:\n
+        - ``callback`` time spent in the user callback function.
+        - ``queue`` time a buffer waited for a free worker. It is always \
+        zero when the callback was registered with ``concurrency=0``.
+        - ``total`` time from arenac delivering the buffer to the user \
+        callback function returning, including the buffer copy. With \
+        ``concurrency=0`` only the callback function is timed so it \
+        matches ``callback``.
+        - ``stalls`` number of times arenac thread had to wait because \
+        all workers were busy and the queue was full.
+        - ``errors`` and ``last_error`` exceptions raised by the callback \
+        function. With ``concurrency=0`` they are also raised to arenac \
+        thread, like an ``on_buffer`` callback function.
+
+        Each latency entry is a ``dict`` with ``count``, ``min_us``, \
+        ``max_us``, ``mean_us``, ``p50_us``, ``p99_us`` and ``buckets``; \
+        ``buckets`` maps the upper bound of each power of two \
+        microseconds bucket to the number of samples in it.
+
+        **Args**:
+            handle:
+                the value returned from ``callback.register()``.\n
+
+        **Raises**:
+            - ``TypeError``:
+                - handle is not of type int.\n
+            - ``ValueError``:
+                - handle is not registered or it was not registered \
+                with a ``on_buffer_dispatch`` callback function.\n
+        **Returns**:
+            - ``dict``
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        handle_info = self.handle_info(handle)
+        if handle_info is None:
+            raise ValueError('the callback_handle is not registered')
+
+        dispatcher = handle_info.get('dispatcher')
+        if dispatcher is None:
+            raise ValueError('latency is only recorded for callback functions '
+                             'decorated with '
+                             '@callback_function.device.on_buffer_dispatch')
+
+        return dispatcher.latency_histogram()
+
     def _deregister_handle(self, callback_handle):
 
         # deregister ----------------------------------------------------------
@@ -305,6 +361,12 @@ class _Callback:
         else:
             raise ValueError(f'internal error : {obj} is not a supported type')
 
+        # stop the workers of a dispatched on_buffer callback after arenac
+        # stops calling it, so frames already queued are still delivered
+        dispatcher = self.registry[callback_handle].get('dispatcher')
+        if dispatcher is not None:
+            dispatcher.shutdown()
+
         # remove from registry
         try:
             del self.registry[callback_handle]
@@ -323,6 +385,18 @@ class _DeviceCallback:
 
     @staticmethod
     def register(device, callback_function, *args, **kwargs):
+        dispatcher = None
+        if _DeviceCallbackFunctionDecorator.is_dispatch(callback_function):
+            # dispatch options are consumed here and never reach the user
+            # callback function
+            concurrency = kwargs.pop('concurrency', 0)
+            copy_buffer = kwargs.pop('copy_buffer', concurrency > 0)
+            dispatcher = _BufferDispatcher(callback_function,
+                                           args,
+                                           kwargs,
+                                           concurrency,
+                                           copy_buffer)
+
         args_and_kwargs = [args, kwargs]
         registry_entry = {
             'obj': device,
@@ -331,9 +405,11 @@ class _DeviceCallback:
         }
         # xlayer call
         callback_handle, to_add_to_registry_entry = device._xdev.xDeviceRegisterImageCallback(
-            callback_function,
+            dispatcher if dispatcher is not None else callback_function,
             args_and_kwargs)
         registry_entry.update(to_add_to_registry_entry)
+        if dispatcher is not None:
+            registry_entry['dispatcher'] = dispatcher
         return {callback_handle: registry_entry}
 
     @staticmethod
@@ -419,6 +495,185 @@ class _NodeCallback:
                 raise os_error
 
 
+class _LatencyHistogram:
+    """
+    power of two microseconds buckets; cheap enough to be updated from the
+    arenac thread for every buffer.
+    """
+    NUM_OF_BUCKETS = 32
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__buckets = [0] * self.NUM_OF_BUCKETS
+        self.__count = 0
+        self.__sum_us = 0.0
+        self.__min_us = None
+        self.__max_us = 0.0
+
+    def record(self, elapsed_sec):
+        elapsed_us = elapsed_sec * 1e6
+        index = min(int(elapsed_us).bit_length(), self.NUM_OF_BUCKETS - 1)
+        with self.__lock:
+            self.__buckets[index] += 1
+            self.__count += 1
+            self.__sum_us += elapsed_us
+            if self.__min_us is None or elapsed_us < self.__min_us:
+                self.__min_us = elapsed_us
+            if elapsed_us > self.__max_us:
+                self.__max_us = elapsed_us
+
+    def __percentile_us(self, buckets, count, percent):
+        # upper bound of the bucket the percentile falls in
+        rank = percent / 100 * count
+        seen = 0
+        for index, bucket_count in enumerate(buckets):
+            seen += bucket_count
+            if bucket_count and seen >= rank:
+                return 1 << index
+        return 0
+
+    def as_dict(self):
+        with self.__lock:
+            buckets = list(self.__buckets)
+            count = self.__count
+            sum_us = self.__sum_us
+            min_us = self.__min_us or 0.0
+            max_us = self.__max_us
+
+        return {
+            'count': count,
+            'min_us': min_us,
+            'max_us': max_us,
+            'mean_us': (sum_us / count) if count else 0.0,
+            'p50_us': self.__percentile_us(buckets, count, 50),
+            'p99_us': self.__percentile_us(buckets, count, 99),
+            'buckets': {1 << index: bucket_count
+                        for index, bucket_count in enumerate(buckets)
+                        if bucket_count}
+        }
+
+
+class _BufferDispatcher:
+    """
+    The python callable handed to arenac for an ``on_buffer_dispatch``
+    callback function. Args and kwargs are bound once at registration so
+    the per buffer path does not cast ``user_data`` back to a py_object.
+    With ``concurrency > 0`` the user callback function runs on a bounded
+    pool of worker threads instead of the arenac thread.
+    """
+
+    def __init__(self, callback_function, args, kwargs, concurrency,
+                 copy_buffer):
+
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool):
+            raise TypeError(f'expected int for concurrency instead of '
+                            f'{type(concurrency).__name__}')
+        if concurrency < 0:
+            raise ValueError('concurrency must be >= 0')
+        if concurrency and not copy_buffer:
+            # arenac reuses the buffer as soon as its thread returns
+            raise ValueError('copy_buffer must be True when concurrency > 0')
+
+        self.__callback_function = callback_function
+        self.__args = args
+        self.__kwargs = kwargs
+        self.__copy_buffer = copy_buffer
+        self.__stalls = 0
+        # updated by every worker
+        self.__errors_lock = threading.Lock()
+        self.__errors = 0
+        self.__last_error = None
+
+        self.__callback_latency = _LatencyHistogram()
+        self.__queue_latency = _LatencyHistogram()
+        self.__total_latency = _LatencyHistogram()
+
+        self.__queue = None
+        self.__workers = []
+        if concurrency:
+            # two waiting buffers per worker keeps the workers busy without
+            # holding too many copies alive
+            self.__queue = queue.Queue(maxsize=2 * concurrency)
+            for worker_index in range(concurrency):
+                worker = threading.Thread(
+                    target=self.__work,
+                    name=f'arena_api_on_buffer_dispatch_{worker_index}',
+                    daemon=True)
+                worker.start()
+                self.__workers.append(worker)
+
+    def __call__(self, hxbuffer, user_data):
+        arrival_time = time.perf_counter()
+        buf = _buffer._Buffer(hxbuffer)
+        if self.__copy_buffer:
+            buf = _buffer.BufferFactory.copy(buf)
+
+        if self.__queue is None:
+            # only the user callback function is timed on arenac thread
+            start_time = time.perf_counter()
+            self.__run(buf, start_time, start_time)
+            return
+
+        item = (buf, arrival_time)
+        try:
+            self.__queue.put_nowait(item)
+        except queue.Full:
+            self.__stalls += 1
+            self.__queue.put(item)
+
+    def __run(self, buf, arrival_time, start_time):
+        try:
+            self.__callback_function(buf, *self.__args, **self.__kwargs)
+        except Exception as exception:
+            with self.__errors_lock:
+                self.__errors += 1
+                self.__last_error = exception
+            raise
+        finally:
+            if self.__copy_buffer:
+                _buffer.BufferFactory.destroy(buf)
+            end_time = time.perf_counter()
+            self.__queue_latency.record(start_time - arrival_time)
+            self.__callback_latency.record(end_time - start_time)
+            self.__total_latency.record(end_time - arrival_time)
+
+    def __work(self):
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    return
+                buf, arrival_time = item
+                self.__run(buf, arrival_time, time.perf_counter())
+            except Exception:
+                # counted by __run(), a worker must survive a failing user
+                # callback function
+                pass
+            finally:
+                self.__queue.task_done()
+
+    def shutdown(self):
+        # buffers already queued are processed before the workers exit
+        for _ in self.__workers:
+            self.__queue.put(None)
+        for worker in self.__workers:
+            worker.join()
+        self.__workers = []
+
+    def latency_histogram(self):
+        with self.__errors_lock:
+            errors = self.__errors
+            last_error = self.__last_error
+        return {
+            'callback': self.__callback_latency.as_dict(),
+            'queue': self.__queue_latency.as_dict(),
+            'total': self.__total_latency.as_dict(),
+            'stalls': self.__stalls,
+            'errors': errors,
+            'last_error': last_error
+        }
+
+
 ###############################################################################
 #
 # Callback Decorators
@@ -437,6 +692,9 @@ class _CallbackFunction:
             arrives to the device. A function decorated with this must have
             the following signature ``my_callback(buffer , *args, **kwargs)``
             where buffer is mandatory parameter.
+        - ``@callback_function.device.on_buffer_dispatch`` :
+            same as ``on_buffer`` but args are bound at registration and
+            the callback function can run on worker threads.
     - ``Node`` callbacks:
         - ``@callback_function.node.on_update`` :
             decorates a function to be used for a callback when the node
@@ -478,7 +736,24 @@ class _CallbackFunction:
 
 
 class _DeviceCallbackFunctionDecorator:
-    supported_decorators = ('callback_function.device.on_buffer',)
+    supported_decorators = ('callback_function.device.on_buffer',
+                            'callback_function.device.on_buffer_dispatch')
+
+    # on_buffer_dispatch returns the user function itself, so it is kept
+    # here instead of being marked with a _decorator attribute
+    _dispatch_functions = weakref.WeakSet()
+
+    @classmethod
+    def is_dispatch(cls, callback_function):
+        # bound methods are created on every access, look at the function
+        function = getattr(callback_function, '__func__', callback_function)
+        return function in cls._dispatch_functions
+
+    @classmethod
+    def decorator_of(cls, callback_function):
+        if cls.is_dispatch(callback_function):
+            return 'callback_function.device.on_buffer_dispatch'
+        return getattr(callback_function, '_decorator', None)
 
     def __getattr__(self, item):
         raise AttributeError(f'\'{item}\' is not supported. Try :'
@@ -500,6 +775,37 @@ class _DeviceCallbackFunctionDecorator:
 
         return wrapper_func
 
+    @staticmethod
+    def on_buffer_dispatch(callback_function):
+        """
+        Same signature as ``@callback_function.device.on_buffer``, \
+        ``callback_func(buffer, *args, **kwargs)``, with a lower \
+        per buffer overhead and optional worker threads. These keyword \
+        arguments are reserved for ``callback.register()`` and are not \
+        passed to the callback function:\n
+        - ``concurrency`` number of worker threads running the callback \
+        function. ``0``, the default, runs it on arenac thread like \
+        ``on_buffer``.
+        - ``copy_buffer`` hands a ``BufferFactory.copy()`` of the buffer \
+        to the callback function and destroys it when the function \
+        returns. It defaults to ``True`` when ``concurrency > 0`` and \
+        can not be turned off in that case.
+
+        >>> @callback_function.device.on_buffer_dispatch
+        >>> def save_frame(buffer, writer):
+        >>>     writer.save(buffer)
+        >>>
+        >>> handle = callback.register(device, save_frame, writer,
+        >>>                            concurrency=4)
+        >>> # ...
+        >>> print(callback.latency_histogram(handle)['total'])
+        >>> callback.deregister(handle)
+        """
+        # the dispatcher is built per registration by callback.register()
+        _DeviceCallbackFunctionDecorator._dispatch_functions.add(
+            callback_function)
+        return callback_function
+
 
 class _SystemCallbackFunctionDecorator:
     supported_decorators = ('callback_function.system.on_device_disconnected',)
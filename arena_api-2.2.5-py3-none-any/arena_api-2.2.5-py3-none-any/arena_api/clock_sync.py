@@ -0,0 +1,247 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+
+import numpy as np  # pip install numpy
+
+from arena_api._device import Device as _Device
+
+# time.monotonic_ns is python 3.7+
+if hasattr(time, 'monotonic_ns'):
+    _monotonic_ns = time.monotonic_ns
+else:
+    def _monotonic_ns():
+        return int(time.monotonic() * 1e9)
+
+
+class ClockSync():
+    """
+    Maps device timestamps, ``buffer.timestamp_ns``, to host
+    ``time.monotonic_ns()`` time.
+
+    Every ``sample()`` latches the device clock with ``TimestampLatch`` and
+    reads ``TimestampLatchValue`` between two host clock reads. The host
+    time of the sample is the midpoint of the two reads. Samples whose
+    host round trip is much slower than usual are dropped from the fit,
+    and a line ``host = slope * device + offset`` is fitted over the last
+    ``window`` samples so the device clock drift is corrected.
+
+    **Args**:
+        device :
+            - a ``Device`` instance.
+        window :
+            - number of recent samples the model is fitted on.
+
+    >>> clock_sync = ClockSync(device)
+    >>> clock_sync.start(interval_sec=1.0)
+    >>> # ...
+    >>> host_ns = clock_sync.device_to_host(timestamps_ns)
+    >>> clock_sync.stop()
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, device, window=64):
+
+        if not isinstance(device, _Device):
+            raise TypeError(f'Device expected instead of '
+                            f'{type(device).__name__}')
+        if window < 2:
+            raise ValueError('window must be >= 2')
+
+        nodes = device.nodemap.get_node(['TimestampLatch',
+                                         'TimestampLatchValue'])
+        self.__latch_node = nodes['TimestampLatch']
+        self.__latch_value_node = nodes['TimestampLatchValue']
+
+        self.__lock = threading.Lock()
+        # (device_ns, host_ns, round_trip_ns)
+        self.__samples = deque(maxlen=window)
+        self.__model = None
+        # errors of the background sampling
+        self.__errors = 0
+        self.__last_error = None
+
+        self.__thread = None
+        self.__stop_event = threading.Event()
+
+    # sampling ------------------------------------------------------------
+
+    def sample(self):
+        """
+        Takes one device/host clock sample and refits the model.
+
+        **Returns**:
+            - ``(device_ns, host_ns)`` of the sample.
+        """
+        before_ns = _monotonic_ns()
+        self.__latch_node.execute()
+        after_ns = _monotonic_ns()
+        device_ns = self.__latch_value_node.value
+
+        host_ns = before_ns + (after_ns - before_ns) // 2
+        with self.__lock:
+            self.__samples.append((device_ns, host_ns, after_ns - before_ns))
+            self.__model = self.__fit()
+
+        return device_ns, host_ns
+
+    def __fit(self):
+        samples = self.__samples
+        if len(samples) < 2:
+            return None
+
+        round_trips = np.array([s[2] for s in samples], dtype=np.float64)
+        keep = round_trips <= 2 * np.median(round_trips)
+        if keep.sum() < 2:
+            keep[:] = True
+
+        # relative to the first sample, in int64, so the float64 fit does
+        # not lose nanoseconds to the magnitude of the timestamps
+        device_ns = np.array([s[0] for s in samples], dtype=np.int64)[keep]
+        host_ns = np.array([s[1] for s in samples], dtype=np.int64)[keep]
+        device_origin = int(device_ns[0])
+        host_origin = int(host_ns[0])
+        x = (device_ns - device_origin).astype(np.float64)
+        y = (host_ns - host_origin).astype(np.float64)
+
+        if np.ptp(x) == 0:
+            slope, offset = 1.0, float(np.mean(y - x))
+        else:
+            slope, offset = np.polyfit(x, y, 1)
+
+        residuals = y - (slope * x + offset)
+        return {
+            'device_origin_ns': device_origin,
+            'host_origin_ns': host_origin,
+            'slope': float(slope),
+            'offset_ns': float(offset),
+            'residual_rms_ns': float(np.sqrt(np.mean(residuals ** 2))),
+            'samples': int(keep.sum())
+        }
+
+    def __run(self, interval_sec):
+        while not self.__stop_event.wait(interval_sec):
+            try:
+                self.sample()
+            except Exception as error:
+                # the model keeps the previous samples, tried again at the
+                # next interval
+                with self.__lock:
+                    self.__errors += 1
+                    self.__last_error = error
+
+    def start(self, interval_sec=1.0):
+        """
+        Samples immediately then every ``interval_sec`` on a background
+        thread until ``stop()``. A failed background sample does not stop
+        the thread, it is counted in ``errors`` and kept as
+        ``last_error``.
+        """
+        if self.__thread is not None:
+            raise RuntimeError('clock sync is already running')
+
+        self.sample()
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         args=(interval_sec,),
+                                         name='arena_api_clock_sync',
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops the background sampling started by ``start()``.
+        """
+        if self.__thread is None:
+            return
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def __get_errors(self):
+        with self.__lock:
+            return self.__errors
+
+    errors = property(__get_errors)
+    """
+    The number of background samples that raised since the ``ClockSync``
+    was created.
+    """
+
+    def __get_last_error(self):
+        with self.__lock:
+            return self.__last_error
+
+    last_error = property(__get_last_error)
+    """
+    The exception of the last background sample that raised, or ``None``.
+    """
+
+    # conversion ----------------------------------------------------------
+
+    def __get_model(self):
+        with self.__lock:
+            return self.__model
+
+    model = property(__get_model)
+    """
+    The fitted model, or ``None`` before two samples are taken. A ``dict``
+    with ``slope`` (host ns per device ns), ``offset_ns``,
+    ``residual_rms_ns``, ``samples`` and the origins the fit is relative to.
+    """
+
+    def __require_model(self):
+        model = self.model
+        if model is None:
+            raise ValueError('at least two samples are needed, call '
+                             'sample() or start() first')
+        return model
+
+    def device_to_host(self, device_timestamps_ns):
+        """
+        Converts device timestamps to host ``time.monotonic_ns()`` time.
+
+        **Args**:
+            device_timestamps_ns :
+                - an ``int`` or an array like of ``int``.
+
+        **Returns**:
+            - ``int`` for an ``int`` input, otherwise ``numpy.ndarray`` \
+            of ``int64``.
+        """
+        model = self.__require_model()
+        device_ns = np.asarray(device_timestamps_ns, dtype=np.int64)
+        x = (device_ns - model['device_origin_ns']).astype(np.float64)
+        host_ns = (np.rint(model['slope'] * x + model['offset_ns'])
+                   .astype(np.int64) + model['host_origin_ns'])
+        return int(host_ns) if host_ns.ndim == 0 else host_ns
+
+    def host_to_device(self, host_timestamps_ns):
+        """
+        Converts host ``time.monotonic_ns()`` times to device timestamps.
+
+        **Returns**:
+            - ``int`` for an ``int`` input, otherwise ``numpy.ndarray`` \
+            of ``int64``.
+        """
+        model = self.__require_model()
+        host_ns = np.asarray(host_timestamps_ns, dtype=np.int64)
+        y = (host_ns - model['host_origin_ns']).astype(np.float64)
+        device_ns = (np.rint((y - model['offset_ns']) / model['slope'])
+                     .astype(np.int64) + model['device_origin_ns'])
+        return int(device_ns) if device_ns.ndim == 0 else device_ns
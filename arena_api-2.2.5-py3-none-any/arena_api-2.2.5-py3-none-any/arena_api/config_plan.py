@@ -0,0 +1,183 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import time
+
+from arena_api._nodemap import Nodemap as _Nodemap
+
+
+def _timed(setter, seconds):
+    # setter that adds the time of its calls that succeed to seconds[name]
+    def timed_setter(name, value):
+        start = time.perf_counter()
+        setter(name, value)
+        seconds[name] = seconds.get(name, 0.0) + time.perf_counter() - start
+    return timed_setter
+
+
+class ConfigPlan():
+    """
+    A configuration compiled once against a nodemap and replayed many
+    times, for example at the start of every scan.
+
+    Compiling resolves every node and checks the value types. Each
+    ``run()`` then reads the current values and writes the nodes that do
+    not already hold their value through the same path as
+    ``Nodemap.apply()``: the writes are ordered, ``Width``/``OffsetX`` and
+    ``Height``/``OffsetY`` are swapped when their current max needs it,
+    writes that fail on a range constraint are retried after the others
+    and the nodes already written are rolled back if one keeps failing.
+    Command nodes are executed after the other nodes. The write order is
+    computed on the first run and reused until ``Nodemap.refresh()``;
+    only the size and offset swap is checked on every run.
+
+    The plan is bound to the nodemap it is compiled against. It can not
+    be run once the device is destroyed, compile a new plan for the
+    device created again.
+
+    **Args**:
+        nodemap :
+            - a ``Nodemap``.
+        config :
+            - a ``dict`` that has node name as a key and the value to \
+            set as the value. Command nodes are executed on every run \
+            when their value is ``True``.
+
+    **Raises**:
+        - ``ValueError`` :
+            - a name does not match any node in ``nodemap``.
+        - ``TypeError`` :
+            - a value type does not match its node type.
+
+    >>> plan = ConfigPlan(device.nodemap, {'PixelFormat': 'Mono12',
+    >>>                                    'Width': 1280,
+    >>>                                    'ExposureTime': 2000.0})
+    >>> for scan in scans:
+    >>>     plan.run()
+    >>>     print(plan.report()['seconds'])
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, nodemap, config):
+
+        if not isinstance(nodemap, _Nodemap):
+            raise TypeError(f'Nodemap expected instead of '
+                            f'{type(nodemap).__name__}')
+
+        writes, getters = nodemap._compile_writes(config)
+        self.__nodemap = nodemap
+        self.__getters = getters
+        # name -> seconds spent in the setter during the last run()
+        self.__write_seconds = {}
+        self.__writes = [(name, value, _timed(setter, self.__write_seconds))
+                         for name, value, setter in writes
+                         if setter is not None]
+        self.__commands = [(name, value) for name, value, setter in writes
+                           if setter is None]
+        # self.__writes in write order, for the nodemap cache generation
+        self.__sorted_writes = None
+        self.__sorted_generation = None
+        self.__last_steps = []
+
+    def __get_sorted_writes(self):
+        generation = self.__nodemap._get_cache_generation()
+        if self.__sorted_writes is None or \
+                generation != self.__sorted_generation:
+            self.__sorted_writes = self.__nodemap._sort_writes(self.__writes)
+            self.__sorted_generation = generation
+        return self.__sorted_writes
+
+    def __get_steps(self):
+        return [(name, value) for name, value, _ in
+                self.__get_sorted_writes()] + self.__commands
+
+    steps = property(__get_steps)
+    """
+    A ``list`` of ``(name, value)`` in the order they are written, before
+    the changes ``Nodemap.apply()`` makes from the current values, such as
+    the ``Width``/``OffsetX`` swap.
+    """
+
+    def run(self):
+        """
+        Writes the plan with the nodemap locked, skipping the nodes that
+        already hold their value.
+
+        **Raises**:
+            - ``RuntimeError`` :
+                - the device of the nodemap was destroyed.
+            - the error of a write that still fails once no other step \
+            can be written, after the rollback.
+
+        **Returns**:
+            - the number of nodes written.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        nodemap = self.__nodemap
+        if not nodemap._is_valid():
+            raise RuntimeError('the device of this plan was destroyed, '
+                               'compile a new plan for its new nodemap')
+
+        read_seconds = {}
+        write_seconds = self.__write_seconds
+        write_seconds.clear()
+        executed = []
+
+        nodemap.lock()
+        try:
+            previous_values = {}
+            for name, getter in self.__getters:
+                start = time.perf_counter()
+                previous_values[name] = getter(name)
+                read_seconds[name] = time.perf_counter() - start
+
+            nodemap._replay_writes(self.__get_sorted_writes(),
+                                   previous_values)
+
+            for name, value in self.__commands:
+                start = time.perf_counter()
+                if value:
+                    nodemap.set_values({name: True})
+                executed.append((name, value, time.perf_counter() - start))
+        finally:
+            nodemap.unlock()
+            self.__last_steps = [
+                (name, name in write_seconds,
+                 read_seconds.get(name, 0.0) + write_seconds.get(name, 0.0))
+                for name, _ in self.__getters] + executed
+
+        return sum(1 for _, written, _ in self.__last_steps if written)
+
+    def report(self):
+        """
+        Timing of the last ``run()``.
+
+        **Returns**:
+            - a ``dict`` with ``steps``, a ``list`` of ``dict`` with \
+            ``name``, ``written`` and ``seconds``, the time of its read \
+            and write, and the ``written``, ``skipped`` and ``seconds`` \
+            totals.
+        """
+        steps = [{'name': name, 'written': written, 'seconds': seconds}
+                 for name, written, seconds in self.__last_steps]
+        written = sum(1 for step in steps if step['written'])
+        return {
+            'steps': steps,
+            'written': written,
+            'skipped': len(steps) - written,
+            'seconds': sum(step['seconds'] for step in steps)
+        }
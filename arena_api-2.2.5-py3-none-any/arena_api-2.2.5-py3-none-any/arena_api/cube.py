@@ -0,0 +1,265 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import numpy as np  # pip install numpy
+
+from arena_api._buffer_helpers import buffer_as_ndarray as _buffer_as_ndarray
+from arena_api._buffer_helpers import \
+    dtype_from_bits_per_pixel as _dtype_from_bits_per_pixel
+
+
+class CubeBuilder():
+    """
+    Assembles a pushbroom datacube from image buffers. Each buffer is one
+    spatial line: image columns are the spatial axis and image rows are
+    the spectral axis. The cube has the shape
+    ``(number_of_lines, width, bands)``.
+
+    Every buffer is cropped to ``spectral_rows``, binned by
+    ``spectral_binning`` and written straight into its line of the cube,
+    without intermediate arrays. The cube is a preallocated array or, when
+    ``filename`` is given, a ``.npy`` file memory mapped with
+    ``numpy.lib.format.open_memmap`` that can be read back with
+    ``numpy.load``.
+
+    **Args**:
+        number_of_lines :
+            - number of buffers in a scan.
+        width, height :
+            - image size of the buffers.
+        bits_per_pixel :
+            - ``8`` or ``16`` (``32``), the buffers pixel size.
+        spectral_rows :
+            - ``(start, stop)`` rows kept from every image. ``None`` \
+            keeps all rows.
+        spectral_binning :
+            - number of adjacent rows combined into one band. The number \
+            of cropped rows must be a multiple of it.
+        binning_mode :
+            - ``'sum'`` or ``'mean'``.
+        dtype :
+            - cube dtype. ``None`` uses the pixel dtype without binning, \
+            ``uint32`` for ``'sum'`` binning and ``float32`` for \
+            ``'mean'`` binning. It must hold every pixel value.
+        filename :
+            - ``None`` for an in memory cube, or a ``.npy`` path.
+
+    >>> builder = CubeBuilder(4000, width=1920, height=1200,
+    >>>                       bits_per_pixel=8, spectral_rows=(100, 1100),
+    >>>                       spectral_binning=4, filename='scan.npy')
+    >>> with device.start_stream(20):
+    >>>     builder.consume(device)
+    >>> builder.flush()
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, number_of_lines, width, height, bits_per_pixel=8,
+                 spectral_rows=None, spectral_binning=1, binning_mode='sum',
+                 dtype=None, filename=None):
+
+        if number_of_lines < 1:
+            raise ValueError('number_of_lines must be >= 1')
+
+        if spectral_rows is None:
+            spectral_rows = (0, height)
+        start, stop = spectral_rows
+        if not 0 <= start < stop <= height:
+            raise ValueError(f'spectral_rows must be within (0, {height})')
+
+        if spectral_binning < 1 or (stop - start) % spectral_binning:
+            raise ValueError(f'{stop - start} spectral rows are not a '
+                             f'multiple of spectral_binning '
+                             f'{spectral_binning}')
+
+        if binning_mode not in ('sum', 'mean'):
+            raise ValueError('binning_mode must be \'sum\' or \'mean\'')
+
+        pixel_dtype = _dtype_from_bits_per_pixel(bits_per_pixel)
+        if dtype is None:
+            if spectral_binning == 1:
+                dtype = pixel_dtype
+            elif binning_mode == 'sum':
+                dtype = np.uint32
+            else:
+                dtype = np.float32
+        if not np.can_cast(pixel_dtype, dtype):
+            raise ValueError(f'{np.dtype(dtype).name} can not hold '
+                             f'{bits_per_pixel} bits pixels')
+
+        self.__bits_per_pixel = bits_per_pixel
+        self.__pixel_dtype = pixel_dtype
+
+        self.__width = width
+        self.__height = height
+        self.__rows = slice(start, stop)
+        self.__binning = spectral_binning
+        self.__binning_mode = binning_mode
+        self.__bands = (stop - start) // spectral_binning
+
+        shape = (number_of_lines, width, self.__bands)
+        if filename is None:
+            self.__cube = np.zeros(shape, dtype=dtype)
+        else:
+            self.__cube = np.lib.format.open_memmap(
+                filename, mode='w+', dtype=dtype, shape=shape)
+
+        self.__lines_filled = 0
+
+    # ---------------------------------------------------------------------
+
+    def add_array(self, frame):
+        """
+        Writes a ``(height, width)`` array as the next line of the cube.
+
+        **Raises**:
+            - ``ValueError`` :
+                - ``frame`` shape is not ``(height, width)``.
+                - ``frame`` dtype is not the one of ``bits_per_pixel``.
+            - ``IndexError`` :
+                - the cube is full.
+
+        **Returns**:
+            - the index of the line that was written.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        if frame.shape != (self.__height, self.__width):
+            raise ValueError(f'expected a frame of shape '
+                             f'{(self.__height, self.__width)} instead of '
+                             f'{frame.shape}')
+        if frame.dtype != self.__pixel_dtype:
+            raise ValueError(f'expected a frame of dtype '
+                             f'{self.__pixel_dtype.name} instead of '
+                             f'{frame.dtype.name}')
+
+        line = self.__lines_filled
+        if line >= self.__cube.shape[0]:
+            raise IndexError('the cube is full')
+
+        # (bands, width) view of the line so the frame is never transposed
+        destination = self.__cube[line].T
+        cropped = frame[self.__rows]
+
+        if self.__binning == 1:
+            np.copyto(destination, cropped)
+        else:
+            binned = cropped.reshape(self.__bands, self.__binning,
+                                     self.__width)
+            if self.__binning_mode == 'sum':
+                np.sum(binned, axis=1, dtype=destination.dtype,
+                       out=destination)
+            else:
+                np.mean(binned, axis=1, dtype=destination.dtype,
+                        out=destination)
+
+        self.__lines_filled = line + 1
+        return line
+
+    def add(self, buffer):
+        """
+        Writes the image data of a buffer as the next line of the cube.
+        The buffer can be requeued as soon as this returns.
+
+        **Raises**:
+            - ``ValueError`` :
+                - the buffer ``bits_per_pixel`` is not the one given to \
+                the builder.
+
+        **Returns**:
+            - the index of the line that was written.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        if buffer.bits_per_pixel != self.__bits_per_pixel:
+            raise ValueError(f'expected a buffer of {self.__bits_per_pixel} '
+                             f'bits per pixel instead of '
+                             f'{buffer.bits_per_pixel}, check PixelFormat')
+        return self.add_array(_buffer_as_ndarray(buffer))
+
+    def consume(self, device, timeout=None):
+        """
+        Gets buffers from a streaming device, adds them to the cube and
+        requeues them until the cube is full.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        while not self.is_full:
+            buffer = device.get_buffer(timeout=timeout)
+            try:
+                self.add(buffer)
+            finally:
+                device.requeue_buffer(buffer)
+
+    def reset(self):
+        """
+        Starts a new scan over the same cube storage.
+        """
+        self.__lines_filled = 0
+
+    def flush(self):
+        """
+        Writes a memory mapped cube to disk. Does nothing for an in memory
+        cube.
+        """
+        if isinstance(self.__cube, np.memmap):
+            self.__cube.flush()
+
+    # ---------------------------------------------------------------------
+
+    def __get_cube(self):
+        return self.__cube
+
+    cube = property(__get_cube)
+    """
+    The whole cube, ``(number_of_lines, width, bands)``.
+
+    :getter: Returns the cube array.
+    :type: ``numpy.ndarray`` or ``numpy.memmap``
+    """
+
+    def __get_preview(self):
+        return self.__cube[:self.__lines_filled]
+
+    preview = property(__get_preview)
+    """
+    View, not a copy, of the lines written so far. Safe to read from another
+    thread while the cube is being built; a line is counted once it is
+    completely written, so every line of the view is whole. The view is
+    overwritten by the next scan after ``reset()``.
+
+    :getter: Returns the filled part of the cube.
+    :type: ``numpy.ndarray``
+    """
+
+    def __get_lines_filled(self):
+        return self.__lines_filled
+
+    lines_filled = property(__get_lines_filled)
+
+    def __get_is_full(self):
+        return self.__lines_filled >= self.__cube.shape[0]
+
+    is_full = property(__get_is_full)
+
+    def __get_bands(self):
+        return self.__bands
+
+    bands = property(__get_bands)
@@ -0,0 +1,316 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+from arena_api._device import Device as _Device
+from arena_api._nodemap import Nodemap as _Nodemap
+
+
+class NodeMonitor():
+    """
+    Polls a set of nodes, each at its own interval, from one background
+    thread and notifies subscribers of the values that changed.
+
+    Every wake up calls ``Nodemap.poll()``, so cached nodes with a polling
+    time are invalidated, then reads all the nodes that are due with one
+    ``Nodemap.get_values()`` call, so the node map is locked once and no
+    node instance is created per read. Subscribers get a ``dict`` of the
+    changed nodes and their new values. Changes that happen within
+    ``coalesce_sec`` of the last notification of a subscriber are merged,
+    the latest value wins, and delivered together.
+
+    Use one monitor per device nodemap. Subscriber functions run on the
+    monitor thread and should return quickly.
+
+    A failed poll or read, and an exception raised by a subscriber, does
+    not stop the monitor. It is counted in ``stats()``, kept as
+    ``last_error`` and given to ``on_error``. The nodes that failed are
+    read again at their next interval.
+
+    A read that is late, because the previous one was slow, does not make
+    the next reads burst to catch up. The node is read again one interval
+    after the late read and the periods skipped are counted as
+    ``missed_reads`` in ``stats()``.
+
+    **Args**:
+        nodemap :
+            - a ``Nodemap`` or a ``Device``, in which case \
+            ``device.nodemap`` is monitored.
+        nodes :
+            - a ``dict`` of node name to its poll interval in seconds.
+        coalesce_sec :
+            - minimum time between two notifications of a subscriber.
+        on_error :
+            - ``None`` or a callable taking the exception, called on the \
+            monitor thread for every error.
+
+    >>> monitor = NodeMonitor(device, {'DeviceTemperature': 1.0,
+    >>>                                'PtpStatus': 0.25})
+    >>> def on_change(changes):
+    >>>     print(changes)
+    >>> monitor.subscribe(on_change)
+    >>> monitor.start()
+    >>> # ...
+    >>> monitor.stop()
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, nodemap, nodes, coalesce_sec=0.0, on_error=None):
+
+        if isinstance(nodemap, _Device):
+            nodemap = nodemap.nodemap
+        if not isinstance(nodemap, _Nodemap):
+            raise TypeError(f'Nodemap or Device expected instead of '
+                            f'{type(nodemap).__name__}')
+        if not isinstance(nodes, dict) or not nodes:
+            raise ValueError('expected a non empty dict of node name to '
+                             'poll interval')
+        for name, interval_sec in nodes.items():
+            if interval_sec <= 0:
+                raise ValueError(f'poll interval of \'{name}\' must be > 0')
+        if coalesce_sec < 0:
+            raise ValueError('coalesce_sec must be >= 0')
+        if on_error is not None and not callable(on_error):
+            raise TypeError(f'expected a callable instead of '
+                            f'{type(on_error).__name__}')
+
+        # fails early on names that are not in the nodemap or have no value
+        nodemap.get_values(list(nodes))
+
+        self.__nodemap = nodemap
+        self.__intervals = dict(nodes)
+        self.__coalesce_sec = coalesce_sec
+        self.__on_error = on_error
+
+        self.__lock = threading.Lock()
+        self.__values = {}
+        # token -> [function, names or None, pending changes, last notify]
+        self.__subscribers = {}
+        self.__next_token = 0
+
+        self.__reads = 0
+        self.__read_errors = 0
+        self.__missed_reads = 0
+        self.__callback_errors = 0
+        self.__last_error = None
+
+        self.__thread = None
+        self.__stop_event = threading.Event()
+
+    # subscribers ---------------------------------------------------------
+
+    def subscribe(self, function, names=None):
+        """
+        Registers ``function(changes)`` to be called with a ``dict`` of
+        node name to new value. The first notification holds the first
+        value read of every node.
+
+        **Args**:
+            function :
+                - a callable taking one ``dict``.
+            names :
+                - only notify changes of these nodes. ``None`` notifies \
+                all of them.
+
+        **Returns**:
+            - an ``int`` token for ``unsubscribe()``.
+        """
+        if not callable(function):
+            raise TypeError(f'expected a callable instead of '
+                            f'{type(function).__name__}')
+        if names is not None:
+            names = frozenset(names)
+            unknown = names - set(self.__intervals)
+            if unknown:
+                raise ValueError(f'{sorted(unknown)} are not monitored')
+
+        with self.__lock:
+            token = self.__next_token
+            self.__next_token += 1
+            self.__subscribers[token] = [function, names, {}, None]
+        return token
+
+    def unsubscribe(self, token):
+        """
+        Removes a subscriber, pending changes are dropped.
+        """
+        with self.__lock:
+            self.__subscribers.pop(token, None)
+
+    # polling -------------------------------------------------------------
+
+    def __report_error(self, error):
+        self.__last_error = error
+        if self.__on_error is not None:
+            try:
+                self.__on_error(error)
+            except Exception:
+                pass
+
+    def __read(self, names):
+        try:
+            return self.__nodemap.get_values(names)
+        except Exception:
+            pass
+
+        # find the node that failed so the others are still read
+        values = {}
+        for name in names:
+            try:
+                values.update(self.__nodemap.get_values([name]))
+            except Exception as error:
+                self.__read_errors += 1
+                self.__report_error(error)
+        return values
+
+    def __notify(self, changes, now):
+        notifications = []
+        with self.__lock:
+            for subscriber in self.__subscribers.values():
+                function, names, pending, last_notify = subscriber
+                if names is None:
+                    pending.update(changes)
+                else:
+                    pending.update((name, value)
+                                   for name, value in changes.items()
+                                   if name in names)
+                if pending and (last_notify is None or
+                                now - last_notify >= self.__coalesce_sec):
+                    notifications.append((function, dict(pending)))
+                    pending.clear()
+                    subscriber[3] = now
+
+        for function, subscriber_changes in notifications:
+            try:
+                function(subscriber_changes)
+            except Exception as error:
+                self.__callback_errors += 1
+                self.__report_error(error)
+
+    def __next_flush_time(self):
+        # earliest time a subscriber with pending changes can be notified
+        with self.__lock:
+            flush_times = [subscriber[3] + self.__coalesce_sec
+                           for subscriber in self.__subscribers.values()
+                           if subscriber[2] and subscriber[3] is not None]
+        return min(flush_times) if flush_times else None
+
+    def __run(self):
+        next_read_times = dict.fromkeys(self.__intervals, time.monotonic())
+        last_poll_time = time.monotonic()
+
+        while not self.__stop_event.is_set():
+            now = time.monotonic()
+            due = [name for name, next_read_time in next_read_times.items()
+                   if next_read_time <= now]
+
+            changes = {}
+            if due:
+                elapsed_millisec = int((now - last_poll_time) * 1000)
+                if elapsed_millisec > 0:
+                    try:
+                        self.__nodemap.poll(elapsed_millisec)
+                    except Exception as error:
+                        # the nodes are still read, maybe from the cache
+                        self.__read_errors += 1
+                        self.__report_error(error)
+                    last_poll_time = now
+                try:
+                    values = self.__read(due)
+                    self.__reads += 1
+                    with self.__lock:
+                        for name, value in values.items():
+                            if name not in self.__values or \
+                                    self.__values[name] != value:
+                                changes[name] = value
+                        self.__values.update(values)
+                except Exception as error:
+                    self.__read_errors += 1
+                    self.__report_error(error)
+
+                # a slow read makes the next ones late too
+                now = time.monotonic()
+                for name in due:
+                    interval_sec = self.__intervals[name]
+                    next_read_time = next_read_times[name] + interval_sec
+                    if next_read_time <= now:
+                        # skip the missed reads instead of bursting to
+                        # catch up, and restart the period from this read
+                        self.__missed_reads += int(
+                            (now - next_read_time) // interval_sec) + 1
+                        next_read_time = now + interval_sec
+                    next_read_times[name] = next_read_time
+
+            self.__notify(changes, now)
+
+            wake_time = min(next_read_times.values())
+            flush_time = self.__next_flush_time()
+            if flush_time is not None:
+                wake_time = min(wake_time, flush_time)
+            self.__stop_event.wait(max(wake_time - time.monotonic(), 0))
+
+    def start(self):
+        """
+        Starts the monitor thread. Every node is read right away.
+        """
+        if self.__thread is not None:
+            raise RuntimeError('node monitor is already running')
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run,
+                                         name='arena_api_node_monitor',
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops the monitor thread started by ``start()``.
+        """
+        if self.__thread is None:
+            return
+        self.__stop_event.set()
+        self.__thread.join()
+        self.__thread = None
+
+    # ---------------------------------------------------------------------
+
+    def __get_values(self):
+        with self.__lock:
+            return dict(self.__values)
+
+    values = property(__get_values)
+    """
+    A ``dict`` of the last value read of every node that was read at
+    least once.
+    """
+
+    def stats(self):
+        """
+        **Returns**:
+            - a ``dict`` with ``reads``, the number of batched reads, \
+            ``read_errors`` for the failed polls and reads, \
+            ``missed_reads`` for the node periods skipped because a read \
+            was late, ``callback_errors`` for the subscribers that raised and \
+            ``last_error``.
+        """
+        return {
+            'reads': self.__reads,
+            'read_errors': self.__read_errors,
+            'missed_reads': self.__missed_reads,
+            'callback_errors': self.__callback_errors,
+            'last_error': self.__last_error
+        }
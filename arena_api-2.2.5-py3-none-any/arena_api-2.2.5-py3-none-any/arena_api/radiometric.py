@@ -0,0 +1,224 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+from collections import OrderedDict
+
+import numpy as np  # pip install numpy
+
+from arena_api._buffer_helpers import buffer_as_ndarray as _buffer_as_ndarray
+
+
+def average_frames(device, number_of_frames, timeout=None):
+    """
+    Averages image buffers from a streaming device into a ``float32``
+    ``(height, width)`` array. Used to capture the dark and flat references
+    of ``RadiometricCorrection``.
+
+    **Args**:
+        device :
+            - a streaming ``Device``.
+        number_of_frames :
+            - number of buffers to average.
+        timeout :
+            - ``get_buffer()`` timeout.
+
+    **Returns**:
+        - ``numpy.ndarray`` of ``float32``.
+
+    >>> # cover the lens
+    >>> with device.start_stream():
+    >>>     dark = average_frames(device, 64)
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+    if number_of_frames < 1:
+        raise ValueError('number_of_frames must be >= 1')
+
+    accumulator = None
+    for _ in range(number_of_frames):
+        buffer = device.get_buffer(timeout=timeout)
+        try:
+            frame = _buffer_as_ndarray(buffer)
+            if accumulator is None:
+                # float64 so long averages of 16 bit frames stay exact
+                accumulator = np.zeros(frame.shape, dtype=np.float64)
+            np.add(accumulator, frame, out=accumulator)
+        finally:
+            device.requeue_buffer(buffer)
+
+    return (accumulator / number_of_frames).astype(np.float32)
+
+
+class RadiometricCorrection():
+    """
+    Dark subtraction and flat field normalization:\n
+    ``corrected = (raw - dark) * mean(flat - dark) / (flat - dark)``
+
+    The gain is computed once from the references, so each frame costs a
+    subtraction and a multiplication done in place with numpy ufuncs. The
+    result keeps the count range of the raw frames, which lets it be stored
+    as ``uint16``. Pixels where ``flat <= dark`` are set to zero.
+
+    **Args**:
+        dark :
+            - ``(height, width)`` dark reference, see ``average_frames()``.
+        flat :
+            - ``(height, width)`` flat reference, see ``average_frames()``.
+        output_dtype :
+            - ``numpy.float32`` or ``numpy.uint16``. Integer outputs are \
+            rounded and clipped to the dtype range.
+
+    >>> correction = RadiometricCorrection(dark, flat)
+    >>> out = correction.empty_output()
+    >>> buffer = device.get_buffer()
+    >>> correction.apply_buffer(buffer, out)
+    >>> device.requeue_buffer(buffer)
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+    # one frame and one batch shape
+    _MAX_SCRATCH_ARRAYS = 2
+
+    def __init__(self, dark, flat, output_dtype=np.float32):
+
+        dark = np.asarray(dark, dtype=np.float32)
+        flat = np.asarray(flat, dtype=np.float32)
+        if dark.shape != flat.shape or dark.ndim != 2:
+            raise ValueError(f'dark and flat must be 2D arrays of the same '
+                             f'shape instead of {dark.shape} and '
+                             f'{flat.shape}')
+
+        output_dtype = np.dtype(output_dtype)
+        if output_dtype not in (np.dtype(np.float32), np.dtype(np.uint16)):
+            raise ValueError(f'output_dtype must be float32 or uint16 '
+                             f'instead of {output_dtype}')
+
+        response = flat - dark
+        valid = response > 0
+        gain = np.zeros_like(response)
+        np.divide(response[valid].mean() if valid.any() else 1.0,
+                  response, out=gain, where=valid)
+
+        self.__dark = dark
+        self.__gain = gain
+        self.__output_dtype = output_dtype
+        # float32 work arrays for integer outputs, keyed by shape so frames
+        # and stacks of frames each get their own. The least recently used
+        # is dropped so varying batch sizes do not keep every array alive
+        self.__scratch = OrderedDict()
+
+    # ---------------------------------------------------------------------
+
+    def __get_shape(self):
+        return self.__dark.shape
+
+    shape = property(__get_shape)
+
+    def __get_output_dtype(self):
+        return self.__output_dtype
+
+    output_dtype = property(__get_output_dtype)
+
+    def empty_output(self, number_of_frames=None):
+        """
+        Allocates an output array for ``apply()`` or, with
+        ``number_of_frames``, for ``apply_batch()``.
+        """
+        if number_of_frames is None:
+            shape = self.shape
+        else:
+            shape = (number_of_frames,) + self.shape
+        return np.empty(shape, dtype=self.__output_dtype)
+
+    def __get_scratch(self, shape):
+        scratch = self.__scratch.get(shape)
+        if scratch is None:
+            scratch = np.empty(shape, dtype=np.float32)
+            self.__scratch[shape] = scratch
+            if len(self.__scratch) > self._MAX_SCRATCH_ARRAYS:
+                self.__scratch.popitem(last=False)
+        else:
+            self.__scratch.move_to_end(shape)
+        return scratch
+
+    def __correct(self, frames, out):
+        if out is None:
+            out = np.empty(frames.shape, dtype=self.__output_dtype)
+        elif out.shape != frames.shape or out.dtype != self.__output_dtype:
+            raise ValueError(f'expected out of shape {frames.shape} and '
+                             f'dtype {self.__output_dtype}')
+
+        if self.__output_dtype == np.float32:
+            work = out
+        else:
+            work = self.__get_scratch(frames.shape)
+
+        # dark and gain broadcast over the frames axis of a stack
+        np.subtract(frames, self.__dark, out=work)
+        np.multiply(work, self.__gain, out=work)
+
+        if work is not out:
+            info = np.iinfo(self.__output_dtype)
+            np.rint(work, out=work)
+            np.clip(work, info.min, info.max, out=work)
+            np.copyto(out, work, casting='unsafe')
+
+        return out
+
+    def apply(self, frame, out=None):
+        """
+        Corrects a ``(height, width)`` frame.
+
+        **Args**:
+            frame :
+                - a ``numpy.ndarray``.
+            out :
+                - preallocated output from ``empty_output()``. ``None`` \
+                allocates a new one.
+
+        **Returns**:
+            - ``out``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        if frame.shape != self.shape:
+            raise ValueError(f'expected a frame of shape {self.shape} '
+                             f'instead of {frame.shape}')
+        return self.__correct(frame, out)
+
+    def apply_buffer(self, buffer, out=None):
+        """
+        Corrects the image data of a buffer without copying it first. The
+        buffer can be requeued as soon as this returns.
+
+        **Returns**:
+            - ``out``.
+        """
+        return self.apply(_buffer_as_ndarray(buffer), out)
+
+    def apply_batch(self, frames, out=None):
+        """
+        Corrects a ``(number_of_frames, height, width)`` stack in one pass
+        per ufunc.
+
+        **Returns**:
+            - ``out``.
+        """
+        if frames.ndim != 3 or frames.shape[1:] != self.shape:
+            raise ValueError(f'expected frames of shape '
+                             f'(n, {self.shape[0]}, {self.shape[1]}) '
+                             f'instead of {frames.shape}')
+        return self.__correct(frames, out)
@@ -0,0 +1,388 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+
+import threading
+import time
+
+from arena_api._device import Device as _Device
+from arena_api.callback import callback as _callback
+from arena_api.callback import callback_function as _callback_function
+from arena_api.system import system as _system
+
+# node maps whose configuration is restored on reconnect, in this order
+_RESTORED_NODEMAPS = ('nodemap', 'tl_stream_nodemap')
+
+
+class ResilientDevice():
+    """
+    Keeps a device working through disconnections. When the system
+    reports the device disconnected, a background thread destroys it,
+    enumerates until a device with the same serial number is back,
+    creates it, restores its configuration and restarts its stream with
+    the same number of buffers.
+
+    The configuration is a ``Nodemap.snapshot()`` of ``device.nodemap``
+    and ``device.tl_stream_nodemap``, taken when the wrapper is created,
+    on ``start_stream()`` and on ``save_configuration()``, and updated by
+    ``apply()``. It is given back to ``Nodemap.restore()``, so only the
+    nodes whose value differs on the reconnected device are written.
+
+    Every disconnection is recorded as an incident ``dict``:\n
+    - ``serial`` : serial number of the device.\n
+    - ``disconnected_at`` : ``time.time()`` of the disconnection.\n
+    - ``downtime_sec`` : from the disconnection to the device ready \
+    again, streaming if it was. ``None`` if it did not recover.\n
+    - ``rediscovery_sec`` : from the disconnection to the device \
+    enumerated again.\n
+    - ``restored_nodes`` : number of nodes written by the restore.\n
+    - ``restarted_stream`` : whether the stream was started again.\n
+    - ``error`` : ``None``, or the exception that stopped the recovery, \
+    the restore or the restart of the stream. A device whose stream \
+    does not start again is kept connected with its stream stopped.
+
+    The device attributes, such as ``nodemap`` or ``get_buffer()``, are
+    reached through the wrapper and always go to the current device.
+    Calls on the device raise while it is disconnected, use
+    ``wait_until_connected()`` before trying again. Buffers of the
+    previous device can not be requeued after a reconnection.
+
+    **Args**:
+        device :
+            - a ``Device`` from ``system.create_device()``.
+        reconnect_timeout_sec :
+            - time to wait for the device to come back before the \
+            incident is recorded as failed. ``None`` waits until \
+            ``close()``.
+        poll_interval_sec :
+            - time between two enumerations while the device is away, \
+            each one also waits ``system.DEVICE_INFOS_TIMEOUT_MILLISEC``.
+        on_incident :
+            - ``None`` or a callable taking the incident ``dict``, called \
+            on the recovery thread when an incident ends.
+
+    >>> device = system.create_device()[0]
+    >>> with ResilientDevice(device) as resilient:
+    >>>     resilient.apply({'PixelFormat': 'Mono8'})
+    >>>     with resilient.start_stream(10):
+    >>>         for _ in range(1000):
+    >>>             try:
+    >>>                 buffer = resilient.get_buffer()
+    >>>             except Exception:
+    >>>                 resilient.wait_until_connected()
+    >>>                 continue
+    >>>             process(buffer)
+    >>>             resilient.requeue_buffer(buffer)
+    >>> print(resilient.incidents)
+    >>> system.destroy_device()
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, device, reconnect_timeout_sec=None,
+                 poll_interval_sec=0.1, on_incident=None):
+
+        if not isinstance(device, _Device):
+            raise TypeError(f'Device expected instead of '
+                            f'{type(device).__name__}')
+        if reconnect_timeout_sec is not None and reconnect_timeout_sec <= 0:
+            raise ValueError('reconnect_timeout_sec must be > 0')
+        if poll_interval_sec <= 0:
+            raise ValueError('poll_interval_sec must be > 0')
+        if on_incident is not None and not callable(on_incident):
+            raise TypeError(f'expected a callable instead of '
+                            f'{type(on_incident).__name__}')
+
+        self.__reconnect_timeout_sec = reconnect_timeout_sec
+        self.__poll_interval_sec = poll_interval_sec
+        self.__on_incident = on_incident
+
+        self.__lock = threading.Lock()
+        self.__device = device
+        self.__serial = device.tl_device_nodemap.get_values(
+            ['DeviceSerialNumber'])['DeviceSerialNumber']
+        self.__configuration = {}
+        # None while the stream is stopped
+        self.__number_of_buffers = None
+        self.__incidents = []
+        self.__callback_handle = None
+
+        self.__is_recovering = False
+        self.__connected_event = threading.Event()
+        self.__connected_event.set()
+        # set while no recovery is running, whatever its outcome
+        self.__recovery_ended_event = threading.Event()
+        self.__recovery_ended_event.set()
+        self.__close_event = threading.Event()
+        self.__thread = None
+
+        self.save_configuration()
+        self.__register_disconnect_callback(device)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        # only called for names the wrapper does not have
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.__device, name)
+
+    # device --------------------------------------------------------------
+
+    @property
+    def device(self):
+        """
+        The current ``Device``, a new instance after each reconnection.
+        """
+        return self.__device
+
+    @property
+    def serial(self):
+        return self.__serial
+
+    def is_connected(self):
+        """
+        ``False`` from a disconnection until the device is recovered.
+        """
+        return self.__connected_event.is_set()
+
+    def wait_until_connected(self, timeout_sec=None):
+        """
+        Blocks until the recovery of the device ends.
+
+        **Returns**:
+            - ``True`` if the device is connected, ``False`` on timeout \
+            or when the recovery failed, its incident has the error.
+        """
+        self.__recovery_ended_event.wait(timeout_sec)
+        return self.is_connected()
+
+    # configuration -------------------------------------------------------
+
+    def save_configuration(self):
+        """
+        Takes the configuration restored on reconnect from the current
+        node values.
+        """
+        device = self.__device
+        configuration = {name: getattr(device, name).snapshot()
+                         for name in _RESTORED_NODEMAPS}
+        with self.__lock:
+            self.__configuration = configuration
+
+    def apply(self, config):
+        """
+        ``device.nodemap.apply()`` that also updates the configuration
+        restored on reconnect.
+
+        **Returns**:
+            - the previous values of the nodes that were written.
+        """
+        previous_values = self.__device.nodemap.apply(config)
+        with self.__lock:
+            self.__configuration['nodemap'].update(config)
+        return previous_values
+
+    # stream --------------------------------------------------------------
+
+    def start_stream(self, number_of_buffers=None):
+        """
+        Saves the configuration, then starts the stream like
+        ``device.start_stream()``. The stream is started again with the
+        same number of buffers after a reconnection. Can be used as a
+        context manager that stops the stream on exit.
+        """
+        device = self.__device
+        if number_of_buffers is None:
+            number_of_buffers = device.DEFAULT_NUM_BUFFERS
+
+        self.save_configuration()
+        device.start_stream(number_of_buffers)
+        with self.__lock:
+            self.__number_of_buffers = number_of_buffers
+
+        stop_stream = self.stop_stream
+
+        class start_stream_cntxmngr():
+
+            def __enter__(self):
+                pass
+
+            def __exit__(self, *exc):
+                stop_stream()
+
+        return start_stream_cntxmngr()
+
+    def stop_stream(self):
+        """
+        Stops the stream, it is no longer restarted on reconnect.
+        """
+        with self.__lock:
+            self.__number_of_buffers = None
+        if self.is_connected():
+            self.__device.stop_stream()
+
+    # incidents -----------------------------------------------------------
+
+    @property
+    def incidents(self):
+        """
+        A ``list`` of the incident ``dict`` of each disconnection, the
+        oldest first.
+        """
+        with self.__lock:
+            return [dict(incident) for incident in self.__incidents]
+
+    # recovery ------------------------------------------------------------
+
+    def __register_disconnect_callback(self, device):
+        # a function per registration, the callback registry refuses the
+        # same function twice on the system
+
+        @_callback_function.system.on_device_disconnected
+        def on_device_disconnected(disconnected_device):
+            self.__on_disconnected()
+
+        self.__callback_handle = _callback.register(
+            _system, on_device_disconnected, watched_device=device)
+
+    def __deregister_disconnect_callback(self):
+        handle, self.__callback_handle = self.__callback_handle, None
+        if handle is not None:
+            try:
+                _callback.deregister(handle)
+            except Exception:
+                pass
+
+    def __on_disconnected(self):
+        # runs on the ArenaC thread, the recovery gets its own
+        disconnected_at = time.monotonic()
+        with self.__lock:
+            if self.__is_recovering or self.__close_event.is_set():
+                return
+            self.__is_recovering = True
+            self.__connected_event.clear()
+            self.__recovery_ended_event.clear()
+        self.__thread = threading.Thread(
+            target=self.__recover, args=(disconnected_at,),
+            name=f'ResilientDevice-{self.__serial}', daemon=True)
+        self.__thread.start()
+
+    def __wait_for_device_info(self, disconnected_at):
+        while True:
+            _system.invalidate_device_infos()
+            device_info = _system.find_device_info(serial=self.__serial)
+            if device_info is not None:
+                return device_info
+
+            if self.__reconnect_timeout_sec is not None and \
+                    time.monotonic() - disconnected_at > \
+                    self.__reconnect_timeout_sec:
+                raise TimeoutError(
+                    f'device {self.__serial} did not come back within '
+                    f'{self.__reconnect_timeout_sec} sec')
+            if self.__close_event.wait(self.__poll_interval_sec):
+                raise RuntimeError('ResilientDevice was closed')
+
+    def __restore(self, device, configuration):
+        # returns the number of nodes written
+        restored_nodes = 0
+        for name in _RESTORED_NODEMAPS:
+            restored_nodes += len(
+                getattr(device, name).restore(configuration[name]))
+        return restored_nodes
+
+    def __recover(self, disconnected_at):
+        incident = {
+            'serial': self.__serial,
+            'disconnected_at': time.time() -
+            (time.monotonic() - disconnected_at),
+            'downtime_sec': None,
+            'rediscovery_sec': None,
+            'restored_nodes': 0,
+            'restarted_stream': False,
+            'error': None
+        }
+        try:
+            self.__deregister_disconnect_callback()
+            try:
+                _system.destroy_device(self.__device)
+            except Exception:
+                # already gone with the system
+                pass
+
+            device_info = self.__wait_for_device_info(disconnected_at)
+            incident['rediscovery_sec'] = time.monotonic() - disconnected_at
+
+            device = _system.create_device(device_info)[0]
+            # kept and watched before anything else can fail, so it is
+            # destroyed and recovered like the first one
+            with self.__lock:
+                self.__device = device
+                configuration = self.__configuration
+                number_of_buffers = self.__number_of_buffers
+            self.__register_disconnect_callback(device)
+
+            try:
+                incident['restored_nodes'] = self.__restore(device,
+                                                            configuration)
+            except Exception as error:
+                # the nodes written before the error are rolled back, the
+                # device is used with its power on settings
+                incident['error'] = error
+
+            if number_of_buffers is not None:
+                try:
+                    device.start_stream(number_of_buffers)
+                except Exception as error:
+                    # the device stays connected with its stream stopped
+                    if incident['error'] is None:
+                        incident['error'] = error
+                    with self.__lock:
+                        self.__number_of_buffers = None
+                else:
+                    incident['restarted_stream'] = True
+
+            incident['downtime_sec'] = time.monotonic() - disconnected_at
+            self.__connected_event.set()
+        except Exception as error:
+            incident['error'] = error
+            self.__connected_event.clear()
+        finally:
+            with self.__lock:
+                self.__is_recovering = False
+                self.__incidents.append(incident)
+            self.__recovery_ended_event.set()
+
+        if self.__on_incident is not None:
+            try:
+                self.__on_incident(dict(incident))
+            except Exception:
+                pass
+
+    def close(self):
+        """
+        Stops watching the device and waits for a running recovery to
+        end. The device stays created, ``system.destroy_device()``
+        destroys it.
+        """
+        self.__close_event.set()
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.__deregister_disconnect_callback()
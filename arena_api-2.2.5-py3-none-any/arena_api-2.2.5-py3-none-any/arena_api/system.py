@@ -11,17 +11,63 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-from copy import deepcopy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ipaddress import ip_address
 
+from arena_api import arena_api_config as _arena_api_config
 from arena_api._xlayer.xarena._xglobal import _xGlobal
 from arena_api._xlayer.xarena._xsystem import _xSystem
 from arena_api._xlayer.xarena.arenac_defaults import \
     UPDATE_DEVICES_TIMEOUT_MILLISEC_DEFAULT as \
     _UPDATE_DEVICES_TIMEOUT_MILLISEC_DEFAULT
 from arena_api._device import Device as _Device
+from arena_api._device_info_cache import DeviceInfoCache as _DeviceInfoCache
 from arena_api._nodemap import Nodemap as _Nodemap
 
+if _arena_api_config.ARENAC_FAST_BINDINGS:
+    # only loaded when used, it is not needed on import otherwise
+    from arena_api._xlayer.xarena import _xfast
+    _xfast.install()
+
+
+class CreateDeviceError(Exception):
+    """
+    Raised by ``system.create_device()`` when some of the devices of a
+    list could not be opened. The other devices are created and must be
+    destroyed as any created device.
+
+    **Args**:
+        errors :
+            - ``dict`` of MAC address to the exception raised opening the \
+            device.
+        devices :
+            - ``list`` of the ``arena_api._device.Device`` instances that \
+            were created, in the order of the device infos.
+        total_sec :
+            - time spent opening the devices.
+
+    >>> try:
+    >>>     devices = system.create_device(device_infos)
+    >>> except CreateDeviceError as error:
+    >>>     for mac, exception in error.errors.items():
+    >>>         print(f'{mac} : {exception}')
+    >>>     devices = error.devices
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, errors, devices, total_sec):
+        self.errors = errors
+        self.devices = devices
+        self.total_sec = total_sec
+        super().__init__(
+            f'{len(errors)} device(s) could not be opened in '
+            f'{total_sec:.3f} sec : ' +
+            ', '.join(f'{mac} ({" ".join(str(error).split())})'
+                      for mac, error in errors.items()))
+
 
 class _System():
     """
@@ -65,9 +111,13 @@ class _System():
             self.__run_init = False
 
         self._xsystem = None
-        self.__device_infos = []
+        self.__device_info_cache = None
         self.__created_devices = {}  # {mac value : device}
         self.__DEVICE_INFOS_TIMEOUT_MILLISEC = _UPDATE_DEVICES_TIMEOUT_MILLISEC_DEFAULT
+        self.__DEVICE_INFOS_MAX_AGE_SEC = 0.0
+        self.__DEVICE_INFOS_PER_INTERFACE = False
+        self.__CREATE_DEVICE_MAX_WORKERS = 8
+        self.__create_device_report = None
         self.__open()
 
     # ---------------------------------------------------------------------
@@ -81,6 +131,7 @@ class _System():
         if not self._xsystem:
             hxsystem = _xGlobal.xOpenSystem()
             self._xsystem = _xSystem(hxsystem)
+            self.__device_info_cache = _DeviceInfoCache(self._xsystem)
             # initialize the callback
             #from arena_api.callback import callback
         else:
@@ -97,8 +148,9 @@ class _System():
             _xGlobal.xCloseSystem(self._xsystem.hxsystem)
 
         self._xsystem = None
-        self.__device_infos.clear()
-        self.__device_infos = None
+        if self.__device_info_cache:
+            self.__device_info_cache.invalidate()
+        self.__device_info_cache = None
         if self.__created_devices != {}:
             raise BaseException(
                 'Internal: __connect_devices list is not updated')
@@ -149,6 +201,118 @@ class _System():
 
     # ---------------------------------------------------------------------
 
+    def __get_DEVICE_INFOS_MAX_AGE_SEC(self):
+        return self.__DEVICE_INFOS_MAX_AGE_SEC
+
+    def __set_DEVICE_INFOS_MAX_AGE_SEC(self, value):
+        if not isinstance(value, (int, float)):
+            raise TypeError('expected int or float values')
+        if value < 0:
+            raise ValueError('DEVICE_INFOS_MAX_AGE_SEC must be >= 0')
+        self.__DEVICE_INFOS_MAX_AGE_SEC = value
+    DEVICE_INFOS_MAX_AGE_SEC = property(
+        __get_DEVICE_INFOS_MAX_AGE_SEC,
+        __set_DEVICE_INFOS_MAX_AGE_SEC)
+    """
+    Time in seconds during which ``system.device_infos`` and
+    ``system.create_device()`` reuse the last enumeration without
+    broadcasting a discovery packet. The default value is ``0``, every
+    call broadcasts and waits for ``DEVICE_INFOS_TIMEOUT_MILLISEC``, so
+    connected and disconnected devices are always seen. Applications that
+    enumerate repeatedly can opt in with a few seconds and call
+    ``system.invalidate_device_infos()`` when the devices may have changed.
+
+    :getter: Returns the current maximum age.
+    :setter: Sets the maximum age. expects int or float.
+    :type: float
+
+    The device infos are read from the devices only when the enumerated
+    devices change. Otherwise the cached device infos are returned without
+    any other call to ArenaC, so repeated enumerations of an unchanged
+    network cost the discovery timeout only, and nothing at all within
+    ``DEVICE_INFOS_MAX_AGE_SEC``.
+
+    :warning: \n
+    - Devices connected or disconnected within the maximum age are not
+      seen until it expires. ``system.invalidate_device_infos()`` forces
+      the next call to enumerate again.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    # ---------------------------------------------------------------------
+
+    def __get_DEVICE_INFOS_PER_INTERFACE(self):
+        return self.__DEVICE_INFOS_PER_INTERFACE
+
+    def __set_DEVICE_INFOS_PER_INTERFACE(self, value):
+        if not isinstance(value, bool):
+            raise TypeError(f'expected bool value instead of '
+                            f'{type(value).__name__}')
+        self.__DEVICE_INFOS_PER_INTERFACE = value
+    DEVICE_INFOS_PER_INTERFACE = property(
+        __get_DEVICE_INFOS_PER_INTERFACE,
+        __set_DEVICE_INFOS_PER_INTERFACE)
+    """
+    Whether devices are enumerated on each interface of
+    ``system.interface_infos`` at the same time. The default value is
+    ``False``, the devices of all interfaces are updated by one call as
+    before; set it to ``True`` to opt in.
+
+    :getter: Returns whether the interfaces are enumerated in parallel.
+    :setter: Sets whether the interfaces are enumerated in parallel.
+    :type: bool
+
+    With more than one interface, ``system.device_infos`` updates the
+    devices of every interface on its own thread, so the discovery
+    timeouts of the interfaces overlap and an enumeration takes about
+    one ``DEVICE_INFOS_TIMEOUT_MILLISEC`` instead of one per interface.
+    With a single interface it makes no difference.
+
+    >>> system.DEVICE_INFOS_PER_INTERFACE = True
+    >>> device_infos = system.device_infos
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    # ---------------------------------------------------------------------
+
+    def __get_CREATE_DEVICE_MAX_WORKERS(self):
+        return self.__CREATE_DEVICE_MAX_WORKERS
+
+    def __set_CREATE_DEVICE_MAX_WORKERS(self, value):
+        if not isinstance(value, int):
+            raise TypeError(f'expected int value instead of '
+                            f'{type(value).__name__}')
+        if value < 1:
+            raise ValueError('CREATE_DEVICE_MAX_WORKERS must be set to a '
+                             'value > 0')
+        self.__CREATE_DEVICE_MAX_WORKERS = value
+    CREATE_DEVICE_MAX_WORKERS = property(
+        __get_CREATE_DEVICE_MAX_WORKERS,
+        __set_CREATE_DEVICE_MAX_WORKERS)
+    """
+    Maximum number of devices ``system.create_device()`` opens at the
+    same time. The default value is ``8``.
+
+    :getter: Returns the maximum number of devices opened at once.
+    :setter: Sets the maximum number of devices opened at once. expects\
+    an int > 0.
+    :type: int
+
+    Opening a device connects its control channel and reads its node
+    maps, which takes from a few hundred milliseconds to seconds per
+    device. The devices of a list are opened on a pool of threads so
+    their open times overlap. ``1`` opens the devices one at a time.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    # ---------------------------------------------------------------------
+
     def __get_interface_infos(self):
         num_of_interfaces = self._xsystem.xSystemGetNumInterfaces()
         all_interfaces_info = []
@@ -201,47 +365,17 @@ class _System():
 
     def __get_device_infos(self):
 
-        # update devices first otherwise it will be zero devices
-        device_info_has_changed = self._xsystem.xSystemUpdateDevicesHasChanged(
-            self.DEVICE_INFOS_TIMEOUT_MILLISEC)
+        # update devices first otherwise it will be zero devices. the
+        # devices are read again only if the enumeration has changed
+        self.__update_device_info_cache()
+        return self.__device_info_cache.device_infos()
 
-        num_of_devices = self._xsystem.xSystemGetNumDevices()
-        device_infos = []
-        for index in range(num_of_devices):
-            device_info = {}
+    def __update_device_info_cache(self):
+        self.__device_info_cache.update(self.DEVICE_INFOS_TIMEOUT_MILLISEC,
+                                        self.DEVICE_INFOS_MAX_AGE_SEC,
+                                        self.DEVICE_INFOS_PER_INTERFACE)
 
-            device_info['model'] = self._xsystem.xSystemGetDeviceModel(index)
-            device_info['vendor'] = self._xsystem.xSystemGetDeviceVendor(
-                index)
-            device_info['serial'] = self._xsystem.xSystemGetDeviceSerial(
-                index)
-            device_info['ip'] = self._xsystem.xSystemGetDeviceIpAddressStr(
-                index)
-            device_info['subnetmask'] = self._xsystem.xSystemGetDeviceSubnetMaskStr(
-                index)
-            device_info['defaultgateway'] = self._xsystem.xSystemGetDeviceDefaultGatewayStr(
-                index)
-            device_info['mac'] = self._xsystem.xSystemGetDeviceMacAddressStr(
-                index)
-            device_info['name'] = self._xsystem.xSystemGetDeviceUserDefinedName(
-                index)
-            device_info['version'] = self._xsystem.xSystemGetDeviceVersion(
-                index)
-            device_info['dhcp'] = self._xsystem.xSystemIsDeviceDHCPConfigurationEnabled(
-                index)
-            device_info['presistentip'] = self._xsystem.xSystemIsDevicePersistentIpConfigurationEnabled(
-                index)
-            device_info['lla'] = self._xsystem.xSystemIsDeviceLLAConfigurationEnabled(
-                index)
-            device_infos.append(device_info)
-
-        # update old list
-        # index is the device info position
-        del self.__device_infos[:]
-        self.__device_infos = deepcopy(device_infos)
-
-        return device_infos
-    # calling this will update the inner __device_infos list as well
+    # calling this will update the inner device info cache as well
     device_infos = property(__get_device_infos)
     """
     A list of dictionaries used to create devices. Each dictionary
@@ -407,6 +541,11 @@ class _System():
             - BaseException :
                 - device_info is a dict and ``system.device_infos``\
                 was not called.\n
+            - ``CreateDeviceError`` :
+                - some of the devices of a list could not be opened.\
+                Its ``errors`` has the exception of each of them by MAC\
+                address and its ``devices`` the devices that were\
+                created.\n
         **Returns**:
             - A list of ``arena_api._device.Device`` instances.\n
 
@@ -415,6 +554,11 @@ class _System():
         maps. The returned device(s) are ready to stream images,
         send events, and read or customize features.
 
+        The devices of a list are opened at the same time, up to
+        ``system.CREATE_DEVICE_MAX_WORKERS`` of them. The time each device
+        took to open and the total time are kept in
+        ``system.create_device_report``.
+
         A single process may only create a single device once, but a
         single device may be opened on multiple processes.
         The first process to create the device is given read-write
@@ -460,39 +604,88 @@ class _System():
 
         # create devices from device info ----------------------------------
 
-        devices = []
         for device_info in device_infos_as_list:
             self.__validate_device_info_before_create_device(device_info)
 
-            # new device
+        # new devices, each one once. existing devices are returned as they
+        # are
+        new_device_infos = {}
+        for device_info in device_infos_as_list:
             if device_info['mac'] not in self.__created_devices.keys():
-                new_device = self.__create_new_device(device_info)
-                devices.append(new_device)
-                self.__created_devices[device_info['mac']] = new_device
-            # existing device
-            else:
-                existing_device = self.__created_devices[device_info['mac']]
-                devices.append(existing_device)
+                new_device_infos.setdefault(device_info['mac'], device_info)
+
+        errors = {}
+        if new_device_infos:
+            errors = self.__create_new_devices(
+                list(new_device_infos.values()))
+
+        devices = [self.__created_devices[device_info['mac']]
+                   for device_info in device_infos_as_list
+                   if device_info['mac'] in self.__created_devices]
+        if errors:
+            # a single device raises its own exception, as it always did
+            if len(new_device_infos) == 1:
+                raise next(iter(errors.values()))
+            raise CreateDeviceError(errors, devices,
+                                    self.__create_device_report['total_sec'])
 
         return devices
 
+    def __create_new_devices(self, device_infos):
+        # opens the devices on a pool of threads, the ArenaC calls release
+        # the GIL. returns the exceptions by mac of the devices that failed
+        def open_device(device_info):
+            opened_at = time.perf_counter()
+            device = self.__create_new_device(device_info)
+            return device, time.perf_counter() - opened_at
+
+        started_at = time.perf_counter()
+        results = {}
+        errors = {}
+        max_workers = min(self.CREATE_DEVICE_MAX_WORKERS, len(device_infos))
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [(device_info['mac'],
+                            pool.submit(open_device, device_info))
+                           for device_info in device_infos]
+            for mac, future in futures:
+                try:
+                    results[mac] = future.result()
+                except Exception as error:
+                    errors[mac] = error
+        else:
+            for device_info in device_infos:
+                try:
+                    results[device_info['mac']] = open_device(device_info)
+                except Exception as error:
+                    errors[device_info['mac']] = error
+
+        for mac, (device, _) in results.items():
+            self.__created_devices[mac] = device
+
+        self.__create_device_report = {
+            'total_sec': time.perf_counter() - started_at,
+            'open_sec': {mac: open_sec
+                         for mac, (_, open_sec) in results.items()},
+            'errors': errors
+        }
+        return errors
+
     def __validate_device_info_before_create_device(self, device_info):
 
         # no device_info has been broadcasted
-        if self.__device_infos == []:
+        if self.__device_info_cache.is_empty():
             raise BaseException('Call system.device_infos first')
 
         # list has an element that is not dict
         elif not isinstance(device_info, dict):
             raise TypeError(f'Expected a list of dicts instead of a list '
-                            f'that has a {type(device_infos).__name__} '
+                            f'that has a {type(device_info).__name__} '
                             f'element')
 
         # unknown mac
-        for info in self.__device_infos:
-            if info['mac'] == device_info['mac']:
-                break
-        else:
+        if self.__device_info_cache.find('mac',
+                                         device_info.get('mac')) is None:
             raise ValueError(f'Invalid device_info : {device_info}')
 
     def __create_new_device(self, device_info):
@@ -504,15 +697,87 @@ class _System():
         return new_device
 
     def __get_device_index(self, device_info):
-        device_index = 0
         # incase user want to create device from a sliced device_info list
-        # self.__device_infos has the latest sort of device_info; so its
-        # indexing can be trusted
-        for index, __device_info in enumerate(self.__device_infos):
-            if device_info == __device_info:
-                device_index = index
-                break
-        return device_index
+        # the cache has the latest sort of device_info; so its indexing can
+        # be trusted
+        return self.__device_info_cache.find('mac', device_info['mac']).index
+
+    # create_device_report ------------------------------------------------
+
+    def __get_create_device_report(self):
+        if self.__create_device_report is None:
+            return None
+        report = dict(self.__create_device_report)
+        report['open_sec'] = dict(report['open_sec'])
+        report['errors'] = dict(report['errors'])
+        return report
+
+    create_device_report = property(__get_create_device_report)
+    """
+    Timings of the devices opened by the last ``system.create_device()``
+    call that opened any, ``None`` before. A dictionary with the keys:\n
+    - ``total_sec`` : time to open all the devices, as they are opened\
+    at the same time it is less than the sum of their open times.\n
+    - ``open_sec`` : a dict of MAC address to the time the device took\
+    to open.\n
+    - ``errors`` : a dict of MAC address to the exception raised by a\
+    device that could not be opened.\n
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    # find_device_info ----------------------------------------------------
+
+    def find_device_info(self, mac=None, serial=None, ip=None):
+        """
+        Finds a device info by MAC address, serial number or IP address
+        without reading the infos of the other devices.
+
+        **Args**:
+            one of :\n
+                - mac : a string value, as in ``device_info['mac']``.
+                - serial : a string value, as in ``device_info['serial']``.
+                - ip : a string value, as in ``device_info['ip']``.
+        **Raises**:
+            - ``ValueError`` :
+                - not exactly one of the arguments is given.
+        **Returns**:
+            - a device info ``dict``, the same as in \
+            ``system.device_infos``, that can be passed to \
+            ``system.create_device()``.
+            - ``None`` if no enumerated device matches.
+
+        The last enumeration is used, devices are enumerated first if
+        ``system.device_infos`` was never called or its enumeration is
+        older than ``DEVICE_INFOS_MAX_AGE_SEC``.
+
+        >>> device_info = system.find_device_info(serial='220600123')
+        >>> device = system.create_device(device_info)[0]
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        keys_values = [(key, value)
+                       for key, value in (('mac', mac), ('serial', serial),
+                                          ('ip', ip))
+                       if value is not None]
+        if len(keys_values) != 1:
+            raise ValueError('expected exactly one of mac, serial or ip')
+        key, value = keys_values[0]
+
+        self.__update_device_info_cache()
+        entry = self.__device_info_cache.find(key, value)
+        return entry.as_dict() if entry is not None else None
+
+    def invalidate_device_infos(self):
+        """
+        Drops the cached device infos. The next ``system.device_infos``,
+        ``system.create_device()`` or ``system.find_device_info()`` call
+        enumerates the devices and reads their infos again, for example
+        after a device user defined name was changed.
+        """
+        self.__device_info_cache.invalidate()
 
     # destroy_device ------------------------------------------------------
 
@@ -609,6 +874,8 @@ class _System():
                 raise ValueError('Internal error : device is not found in '
                                  'connected devices')
 
+            device._invalidate_nodemaps()
+            device._invalidate_stream()
             self._xsystem.xSystemDestroyDevice(device._xdev.hxdevice.value)
             del updated_connected_devices[mac_to_remove]
 
@@ -690,6 +957,8 @@ class _System():
 
         self._xsystem.xSystemForceIpAddress(
             mac_int, ip_int, subnetmask_int, defaultgateway_int)
+        # the cached ip of the device is no longer valid
+        self.__device_info_cache.invalidate()
 
     # ---------------------------------------------------------------------
 
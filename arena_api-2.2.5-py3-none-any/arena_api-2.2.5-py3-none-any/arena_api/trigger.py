@@ -0,0 +1,280 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import math
+import statistics
+import time
+
+from arena_api._device import Device as _Device
+
+# sleeping is only accurate to a couple of millisec; the rest of the wait
+# for a trigger time is spent spinning
+_SPIN_WINDOW_SEC = 0.002
+
+
+class TriggerScheduler():
+    """
+    Fires software triggers on a device at a fixed rate or on a schedule
+    and keeps up to ``triggers_in_flight`` triggers pending before it
+    retrieves their buffers.
+
+    The device must already be configured for software triggering
+    (``TriggerMode`` ``'On'``, ``TriggerSource`` ``'Software'``) and
+    streaming with at least ``triggers_in_flight`` buffers.
+
+    ``TriggerArmed`` and ``TriggerSoftware`` nodes are resolved once when
+    the scheduler is created, so the trigger loop does not look nodes up
+    by name.
+
+    **Args**:
+        device :
+            - a ``Device`` instance.
+        triggers_in_flight :
+            - number of triggers that may be fired before the oldest \
+            buffer is retrieved. ``1`` is the same as the trigger examples.
+        rate_hz :
+            - target trigger rate. Can not be used with ``schedule_sec``.
+        schedule_sec :
+            - an iterable of trigger times, in seconds, relative to the \
+            start of ``run()``. Must be increasing.
+        wait_for_next_leader :
+            - wait for the leader of each triggered image before the next \
+            trigger is fired, so the next trigger is fired as soon as the \
+            exposure is done instead of when the buffer is retrieved. \
+            Not every device supports it, so it is ``False`` by default.
+        timeout_millisec :
+            - timeout for ``get_buffer()``, ``wait_for_next_leader()`` and \
+            for ``TriggerArmed`` to be set before a trigger is fired. \
+            ``None`` uses ``device.GET_BUFFER_TIMEOUT_MILLISEC``.
+
+    **Raises**:
+        - ``ValueError`` :
+            - ``wait_for_next_leader`` is ``True`` and the device does \
+            not support it.
+
+    >>> scheduler = TriggerScheduler(device, triggers_in_flight=3,
+    >>>                              rate_hz=200)
+    >>> with device.start_stream(10):
+    >>>     for buffer in scheduler.run(1000):
+    >>>         process(buffer)
+    >>> print(scheduler.report())
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    """
+
+    def __init__(self, device, triggers_in_flight=1, rate_hz=None,
+                 schedule_sec=None, wait_for_next_leader=False,
+                 timeout_millisec=None):
+
+        if not isinstance(device, _Device):
+            raise TypeError(f'Device expected instead of '
+                            f'{type(device).__name__}')
+
+        if not isinstance(triggers_in_flight, int) or \
+                isinstance(triggers_in_flight, bool) or \
+                triggers_in_flight < 1:
+            raise ValueError('triggers_in_flight must be an int >= 1')
+
+        if rate_hz is not None and schedule_sec is not None:
+            raise ValueError('rate_hz and schedule_sec can not be used '
+                             'together')
+
+        if rate_hz is not None and not rate_hz > 0:
+            raise ValueError('rate_hz must be > 0')
+
+        if schedule_sec is not None:
+            schedule_sec = [float(offset) for offset in schedule_sec]
+            if any(later < earlier for earlier, later in
+                   zip(schedule_sec, schedule_sec[1:])):
+                raise ValueError('schedule_sec must be increasing')
+
+        if timeout_millisec is None:
+            timeout_millisec = device.GET_BUFFER_TIMEOUT_MILLISEC
+
+        if wait_for_next_leader:
+            # fails on devices, and arenac versions, without leader events
+            # instead of on the first trigger
+            try:
+                device.reset_wait_for_next_leader()
+            except NotImplementedError:
+                raise ValueError('wait_for_next_leader is not supported by '
+                                 'this device')
+
+        self.__device = device
+        self.__triggers_in_flight = triggers_in_flight
+        self.__rate_hz = rate_hz
+        self.__schedule_sec = schedule_sec
+        self.__wait_for_next_leader = wait_for_next_leader
+        self.__timeout_millisec = timeout_millisec
+
+        nodes = device.nodemap.get_node(['TriggerArmed', 'TriggerSoftware'])
+        self.__trigger_armed_node = nodes['TriggerArmed']
+        self.__trigger_software_node = nodes['TriggerSoftware']
+
+        self.__scheduled_times = []
+        self.__fired_times = []
+
+    # ---------------------------------------------------------------------
+
+    def __trigger_offsets(self, number_of_triggers):
+        if self.__schedule_sec is not None:
+            offsets = self.__schedule_sec
+            if number_of_triggers is not None:
+                offsets = offsets[:number_of_triggers]
+            for offset in offsets:
+                yield offset
+            return
+
+        index = 0
+        while number_of_triggers is None or index < number_of_triggers:
+            if self.__rate_hz is None:
+                # as fast as the device arms
+                yield None
+            else:
+                yield index / self.__rate_hz
+            index += 1
+
+    @staticmethod
+    def __sleep_until(deadline):
+        remaining = deadline - time.perf_counter()
+        if remaining > _SPIN_WINDOW_SEC:
+            time.sleep(remaining - _SPIN_WINDOW_SEC)
+        while time.perf_counter() < deadline:
+            pass
+
+    def __fire(self):
+        trigger_armed_node = self.__trigger_armed_node
+        if not trigger_armed_node.value:
+            deadline = time.perf_counter() + self.__timeout_millisec / 1000
+            while not trigger_armed_node.value:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f'TriggerArmed was not set within '
+                                       f'{self.__timeout_millisec} millisec')
+
+        if self.__wait_for_next_leader:
+            self.__device.reset_wait_for_next_leader()
+
+        fired_time = time.perf_counter()
+        self.__trigger_software_node.execute()
+
+        if self.__wait_for_next_leader:
+            self.__device.wait_for_next_leader(self.__timeout_millisec)
+
+        return fired_time
+
+    def run(self, number_of_triggers=None):
+        """
+        Fires the triggers and yields the triggered buffers in order.
+        A yielded buffer is requeued when the loop asks for the next one,
+        so do not keep a reference to it; copy it with
+        ``BufferFactory.copy()`` if it is needed later.
+
+        **Args**:
+            number_of_triggers :
+                - number of triggers to fire. ``None`` fires every entry of \
+                ``schedule_sec``, or runs until the loop is broken when a \
+                rate is used.
+
+        **Raises**:
+            - ``TimeoutError`` :
+                - the device did not arm, or deliver a buffer, within \
+                ``timeout_millisec``.
+
+        **Returns**:
+            - a generator of ``Buffer`` instances.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        device = self.__device
+        timeout_millisec = self.__timeout_millisec
+        self.__scheduled_times = []
+        self.__fired_times = []
+
+        # buffers of triggers that are never retrieved, because the loop
+        # was broken, are left in the output queue for stop_stream()
+        pending = 0
+        start_time = time.perf_counter()
+        for offset in self.__trigger_offsets(number_of_triggers):
+            while pending >= self.__triggers_in_flight:
+                pending -= 1
+                yield from self.__retrieve(device, timeout_millisec)
+
+            if offset is not None:
+                scheduled_time = start_time + offset
+                self.__sleep_until(scheduled_time)
+            else:
+                scheduled_time = None
+
+            fired_time = self.__fire()
+            pending += 1
+            self.__scheduled_times.append(scheduled_time)
+            self.__fired_times.append(fired_time)
+
+        while pending:
+            pending -= 1
+            yield from self.__retrieve(device, timeout_millisec)
+
+    @staticmethod
+    def __retrieve(device, timeout_millisec):
+        buffer = device.get_buffer(timeout=timeout_millisec)
+        try:
+            yield buffer
+        finally:
+            device.requeue_buffer(buffer)
+
+    # ---------------------------------------------------------------------
+
+    def report(self):
+        """
+        Timing of the last ``run()``. Times are in microseconds.
+
+        **Returns**:
+            - a ``dict`` with the keys:\n
+                - ``triggers`` number of triggers fired.
+                - ``target_period_us`` period requested, ``None`` when \
+                no rate was given.
+                - ``mean_period_us`` mean time between fired triggers.
+                - ``period_jitter_us`` standard deviation of the time \
+                between fired triggers.
+                - ``mean_lateness_us`` and ``max_lateness_us`` how late \
+                triggers were fired relative to their scheduled time.
+                - ``lateness_jitter_us`` standard deviation of lateness.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        """
+        fired_times = self.__fired_times
+        periods = [(later - earlier) * 1e6 for earlier, later in
+                   zip(fired_times, fired_times[1:])]
+        lateness = [(fired - scheduled) * 1e6 for scheduled, fired in
+                    zip(self.__scheduled_times, fired_times)
+                    if scheduled is not None]
+
+        def mean(values):
+            return statistics.mean(values) if values else math.nan
+
+        def stdev(values):
+            return statistics.pstdev(values) if len(values) > 1 else 0.0
+
+        return {
+            'triggers': len(fired_times),
+            'target_period_us': (1e6 / self.__rate_hz
+                                 if self.__rate_hz is not None else None),
+            'mean_period_us': mean(periods),
+            'period_jitter_us': stdev(periods),
+            'mean_lateness_us': mean(lateness),
+            'max_lateness_us': max(lateness) if lateness else math.nan,
+            'lateness_jitter_us': stdev(lateness),
+        }
@@ -33,6 +33,7 @@
 
 """
 import subprocess
+from collections.abc import Mapping as _Mapping
 
 from arena_api._xlayer.info import Info as _Info
 
@@ -93,6 +94,19 @@ for platform in supported_dll_versions.keys():
 # __version__ -----------------------------------------------------------------
 
 
+def __get_version_from_metadata():
+    # reads the installed package metadata, much faster than running pip.
+    # importlib.metadata is new in Python 3.8
+    try:
+        from importlib import metadata
+    except ImportError:
+        return None
+    try:
+        return metadata.version('arena_api')
+    except metadata.PackageNotFoundError:
+        return None
+
+
 def __get_version_from_pip():
     try:
         raw = subprocess.check_output(['pip', 'show', '-V', 'arena_api'],
@@ -109,7 +123,7 @@ def __get_version_from_pip():
     return version_number
 
 
-__version__ = __get_version_from_pip()
+__version__ = __get_version_from_metadata() or __get_version_from_pip()
 
 
 # loaded_binary_versions ------------------------------------------------------
@@ -139,7 +153,30 @@ def __get_savec_build_version():
     return version_tuple
 
 
-loaded_binary_versions = {
-    'ArenaC': __get_arenac_build_version(),
-    'SaveC': __get_savec_build_version()
-}
+class _LoadedBinaryVersions(_Mapping):
+    # reads a version the first time it is looked up, so SaveC is not
+    # loaded at import by processes that never save
+
+    def __init__(self, getters):
+        self.__getters = getters
+        self.__versions = {}
+
+    def __getitem__(self, name):
+        if name not in self.__versions:
+            self.__versions[name] = self.__getters[name]()
+        return self.__versions[name]
+
+    def __iter__(self):
+        return iter(self.__getters)
+
+    def __len__(self):
+        return len(self.__getters)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+loaded_binary_versions = _LoadedBinaryVersions({
+    'ArenaC': __get_arenac_build_version,
+    'SaveC': __get_savec_build_version
+})
@@ -0,0 +1,44 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Command line shared by the benchmarks. --simulated runs a benchmark on
+the simulated ArenaC, no SDK or device needed. It has to be applied before
+arena_api.system is imported, so the benchmarks import it in their
+functions.
+'''
+
+import argparse
+
+from arena_api import arena_api_config
+
+
+def add_simulated_argument(parser):
+    parser.add_argument('--simulated', action='store_true',
+                        help='use the simulated ArenaC instead of a device')
+
+
+def use_simulated(simulation=None):
+    arena_api_config.ARENAC_SIMULATED = True
+    arena_api_config.ARENAC_SIMULATION = dict(simulation or {})
+
+
+def parse_args(prog, description, argv=None, simulation=None):
+    # for the benchmarks that only have --simulated. simulation is the
+    # ARENAC_SIMULATION they run with
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    add_simulated_argument(parser)
+    args = parser.parse_args(argv)
+    if args.simulated:
+        use_simulated(simulation)
+    return args
@@ -0,0 +1,150 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Call overhead of the hottest ArenaC entry points with the default bindings
+then with the fast bindings of arena_api_config.ARENAC_FAST_BINDINGS.
+Values are written back unchanged. acDeviceGetBuffer/acDeviceRequeueBuffer
+are timed as a pair while streaming, so they include the wait for a frame.
+The fast bindings need the ArenaC binary, with --simulated only the
+default bindings are timed.
+
+    python -m benchmarks.bench_bindings [--simulated]
+'''
+
+import timeit
+
+from arena_api import arena_api_config
+from benchmarks import _cli
+
+NUMBER_OF_CALLS = 2000
+NUMBER_OF_FRAMES = 50
+# with --simulated, a small sensor so the frame wait stays short
+SIMULATION = {'sensor_width': 640, 'sensor_height': 480,
+              'frame_rate': 1000.0, 'exposure_time': 100.0}
+
+
+def node_calls(nodemap):
+    nodes = nodemap.get_node(['Width', 'ExposureTime', 'ReverseX',
+                              'DeviceModelName', 'PixelFormat',
+                              'TimestampLatch'])
+    xinteger = nodes['Width'].xinteger
+    xfloat = nodes['ExposureTime'].xfloat
+    xboolean = nodes['ReverseX'].xboolean
+    xstring = nodes['DeviceModelName'].xstring
+    xenumeration = nodes['PixelFormat'].xenumeration
+    xcommand = nodes['TimestampLatch'].xcommand
+    xnode = nodes['Width'].xnode
+
+    width = xinteger.xIntegerGetValue()
+    exposure_time = xfloat.xFloatGetValue()
+    reverse_x = xboolean.xBooleanGetValue()
+    pixel_format = xenumeration.xEnumerationGetCurrentSymbolic()
+
+    return {
+        'acIntegerGetValue': xinteger.xIntegerGetValue,
+        'acIntegerSetValue': lambda: xinteger.xIntegerSetValue(width),
+        'acFloatGetValue': xfloat.xFloatGetValue,
+        'acFloatSetValue': lambda: xfloat.xFloatSetValue(exposure_time),
+        'acBooleanGetValue': xboolean.xBooleanGetValue,
+        'acBooleanSetValue': lambda: xboolean.xBooleanSetValue(reverse_x),
+        'acStringGetValue': xstring.xStringGetValue,
+        'acEnumerationGetCurrentSymbolic':
+            xenumeration.xEnumerationGetCurrentSymbolic,
+        'acEnumerationSetBySymbolic':
+            lambda: xenumeration.xEnumerationSetBySymbolic(pixel_format),
+        'acCommandExecute': xcommand.xCommandExecute,
+        'acNodeGetName': xnode.xNodeGetName,
+        'acNodeGetAccessMode': xnode.xNodeGetAccessMode,
+        # through the nodemap, the same overhead is added in both modes
+        'acNodeMapGetNode':
+            lambda: nodemap._clear_node_cache() or nodemap['Width'],
+        'acNodeMapGetIntegerValue': lambda: nodemap.get_values(['Width']),
+        'acNodeMapGetFloatValue':
+            lambda: nodemap.get_values(['ExposureTime'])
+    }
+
+
+def buffer_calls(buffer):
+    xbuffer = buffer.xbuffer
+    return {
+        'acImageGetWidth': xbuffer.xImageGetWidth,
+        'acImageGetHeight': xbuffer.xImageGetHeight,
+        'acImageGetTimestampNs': xbuffer.xImageGetTimestampNs
+    }
+
+
+def time_calls(calls, number):
+    return {name: timeit.timeit(call, number=number) / number
+            for name, call in calls.items()}
+
+
+def bench_bindings(device):
+
+    results = time_calls(node_calls(device.nodemap), NUMBER_OF_CALLS)
+
+    with device.start_stream():
+        buffer = device.get_buffer()
+        try:
+            results.update(time_calls(buffer_calls(buffer), NUMBER_OF_CALLS))
+        finally:
+            device.requeue_buffer(buffer)
+
+        def get_and_requeue():
+            device.requeue_buffer(device.get_buffer())
+
+        results['acDeviceGetBuffer+acDeviceRequeueBuffer'] = \
+            timeit.timeit(get_and_requeue,
+                          number=NUMBER_OF_FRAMES) / NUMBER_OF_FRAMES
+
+    return results
+
+
+def benchmark_entry_point(argv=None):
+
+    args = _cli.parse_args('python -m benchmarks.bench_bindings', __doc__,
+                           argv, SIMULATION)
+    if arena_api_config.ARENAC_FAST_BINDINGS:
+        raise Exception('run with arena_api_config.ARENAC_FAST_BINDINGS '
+                        'False, the benchmark enables it itself')
+    from arena_api.system import system
+
+    devices = system.create_device()
+    if not len(devices):
+        raise Exception(f'No device found!\n'
+                        f'Please connect a device and run the benchmark again.')
+
+    try:
+        default = bench_bindings(devices[0])
+        fast = None
+        if not args.simulated:
+            from arena_api._xlayer.xarena import _xfast
+            _xfast.install()
+            fast = bench_bindings(devices[0])
+    finally:
+        system.destroy_device()
+
+    if fast is None:
+        print(f'{"function":>42} {"default us":>11}')
+        for name in default:
+            print(f'{name:>42} {default[name] * 1e6:11.2f}')
+        return
+
+    print(f'{"function":>42} {"default us":>11} {"fast us":>9} {"speedup":>8}')
+    for name in default:
+        print(f'{name:>42} {default[name] * 1e6:11.2f} '
+              f'{fast[name] * 1e6:9.2f} {default[name] / fast[name]:7.2f}x')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
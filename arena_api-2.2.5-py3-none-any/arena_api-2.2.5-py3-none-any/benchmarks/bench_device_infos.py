@@ -0,0 +1,94 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Enumeration cost with the device info cache:
+    - first : the devices are enumerated and all their infos are read
+    - unchanged : the discovery broadcast only, infos come from the cache
+    - max age : within DEVICE_INFOS_MAX_AGE_SEC, no broadcast at all
+    - find_device_info : lookup by serial number within the max age
+DEVICE_INFOS_MAX_AGE_SEC is 0 by default, 'first' and 'unchanged' are the
+default cost. The last two cases only apply when the application sets it,
+they are measured with MAX_AGE_SEC. The discovery timeout is set to
+DISCOVERY_TIMEOUT_MILLISEC, it bounds the 'unchanged' case. No device is
+created and the system settings are restored.
+
+    python -m benchmarks.bench_device_infos [--simulated]
+'''
+
+import timeit
+
+from benchmarks import _cli
+
+DISCOVERY_TIMEOUT_MILLISEC = 100
+NUMBER_OF_ENUMERATIONS = 10
+MAX_AGE_SEC = 60.0
+# with --simulated, a discovery takes part of the timeout on each interface
+SIMULATION = {'devices': 4, 'interfaces': 2, 'discovery_sec': 0.02}
+
+
+def bench_device_infos():
+    from arena_api.system import system
+
+    timeout_millisec = system.DEVICE_INFOS_TIMEOUT_MILLISEC
+    max_age_sec = system.DEVICE_INFOS_MAX_AGE_SEC
+    system.DEVICE_INFOS_TIMEOUT_MILLISEC = DISCOVERY_TIMEOUT_MILLISEC
+    system.DEVICE_INFOS_MAX_AGE_SEC = 0.0
+    system.invalidate_device_infos()
+
+    results = {}
+    try:
+        results['first'] = timeit.timeit(lambda: system.device_infos,
+                                         number=1)
+        device_infos = system.device_infos
+        if not device_infos:
+            raise Exception(f'No device found!\n'
+                            f'Please connect a device and run the '
+                            f'benchmark again.')
+
+        results['unchanged'] = timeit.timeit(
+            lambda: system.device_infos,
+            number=NUMBER_OF_ENUMERATIONS) / NUMBER_OF_ENUMERATIONS
+
+        # not the default, only with DEVICE_INFOS_MAX_AGE_SEC configured
+        system.DEVICE_INFOS_MAX_AGE_SEC = MAX_AGE_SEC
+        results[f'max age {MAX_AGE_SEC:g} s'] = timeit.timeit(
+            lambda: system.device_infos,
+            number=NUMBER_OF_ENUMERATIONS) / NUMBER_OF_ENUMERATIONS
+
+        serial = device_infos[-1]['serial']
+        results[f'find max age {MAX_AGE_SEC:g} s'] = timeit.timeit(
+            lambda: system.find_device_info(serial=serial),
+            number=NUMBER_OF_ENUMERATIONS) / NUMBER_OF_ENUMERATIONS
+    finally:
+        system.DEVICE_INFOS_TIMEOUT_MILLISEC = timeout_millisec
+        system.DEVICE_INFOS_MAX_AGE_SEC = max_age_sec
+
+    return len(device_infos), results
+
+
+def benchmark_entry_point(argv=None):
+
+    _cli.parse_args('python -m benchmarks.bench_device_infos', __doc__, argv,
+                    SIMULATION)
+    number_of_devices, results = bench_device_infos()
+
+    print(f'{number_of_devices} devices, discovery timeout '
+          f'{DISCOVERY_TIMEOUT_MILLISEC} ms, DEVICE_INFOS_MAX_AGE_SEC '
+          f'default 0')
+    for name, duration in results.items():
+        print(f'{name:>18}: {duration * 1e3:10.3f} ms')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
@@ -0,0 +1,101 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Time for a new process to 'import arena_api.system', the way short lived
+worker processes pay it. Each import runs in its own interpreter:
+    - cold : empty binary validation cache, every binary is validated
+    - warm : the cache written by the previous run is reused
+    - no cache : arena_api_config.BINARY_VALIDATION_CACHE set to False
+The cache directory is a temporary one so the user cache is not touched.
+No device is needed. With --simulated the imports use the simulated
+ArenaC, only the arena_api modules are timed then.
+
+    python -m benchmarks.bench_import [--simulated]
+'''
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import _cli
+
+NUMBER_OF_IMPORTS = 10
+
+IMPORT = 'import arena_api.system'
+IMPORT_NO_CACHE = ('from arena_api import arena_api_config\n'
+                   'arena_api_config.BINARY_VALIDATION_CACHE = False\n'
+                   'import arena_api.system')
+SIMULATED = ('from arena_api import arena_api_config\n'
+             'arena_api_config.ARENAC_SIMULATED = True\n')
+
+
+def time_import(code, cache_dir):
+    env = dict(os.environ)
+    env['XDG_CACHE_HOME'] = cache_dir
+    env['LOCALAPPDATA'] = cache_dir
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
+    return time.perf_counter() - start
+
+
+def bench_import(simulated=False):
+    prefix = SIMULATED if simulated else ''
+
+    # the interpreter start up alone, to subtract from the others
+    with tempfile.TemporaryDirectory() as cache_dir:
+        baseline = [time_import('pass', cache_dir)
+                    for _ in range(NUMBER_OF_IMPORTS)]
+
+    cold = []
+    for _ in range(NUMBER_OF_IMPORTS):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(time_import(prefix + IMPORT, cache_dir))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        time_import(prefix + IMPORT, cache_dir)
+        warm = [time_import(prefix + IMPORT, cache_dir)
+                for _ in range(NUMBER_OF_IMPORTS)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        no_cache = [time_import(prefix + IMPORT_NO_CACHE, cache_dir)
+                    for _ in range(NUMBER_OF_IMPORTS)]
+
+    interpreter = statistics.median(baseline)
+    return {
+        'interpreter': interpreter,
+        'cold': statistics.median(cold) - interpreter,
+        'warm': statistics.median(warm) - interpreter,
+        'no cache': statistics.median(no_cache) - interpreter
+    }
+
+
+def benchmark_entry_point(argv=None):
+
+    # the simulation is set in the imports, not in this process
+    args = _cli.parse_args('python -m benchmarks.bench_import', __doc__,
+                           argv)
+    results = bench_import(args.simulated)
+
+    print(f'{"interpreter":>12}: {results["interpreter"] * 1e3:8.1f} ms')
+    for name in ('cold', 'warm', 'no cache'):
+        print(f'{name:>12}: {results[name] * 1e3:8.1f} ms '
+              f'(import only, median of {NUMBER_OF_IMPORTS})')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
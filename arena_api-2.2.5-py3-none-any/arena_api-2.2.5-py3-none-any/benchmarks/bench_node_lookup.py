@@ -0,0 +1,69 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Repeated node lookups by name, with and without the nodemap node cache.
+The uncached case clears the cache before every lookup, which is what
+every nodemap['name'] cost before the cache was added.
+
+    python -m benchmarks.bench_node_lookup [--simulated]
+'''
+
+import timeit
+
+from benchmarks import _cli
+
+NODE_NAMES = ('ExposureTime', 'Gain', 'Width', 'PixelFormat', 'TriggerMode')
+NUMBER_OF_LOOKUPS = 1000
+
+
+def bench_node_lookup(nodemap):
+
+    def cached():
+        for name in NODE_NAMES:
+            nodemap[name]
+
+    def uncached():
+        for name in NODE_NAMES:
+            nodemap._clear_node_cache()
+            nodemap[name]
+
+    results = {}
+    for label, func in (('uncached', uncached), ('cached', cached)):
+        seconds = timeit.timeit(func, number=NUMBER_OF_LOOKUPS)
+        results[label] = seconds / (NUMBER_OF_LOOKUPS * len(NODE_NAMES))
+    return results
+
+
+def benchmark_entry_point(argv=None):
+
+    _cli.parse_args('python -m benchmarks.bench_node_lookup', __doc__, argv)
+    from arena_api.system import system
+
+    devices = system.create_device()
+    if not len(devices):
+        raise Exception(f'No device found!\n'
+                        f'Please connect a device and run the benchmark again.')
+
+    try:
+        results = bench_node_lookup(devices[0].nodemap)
+    finally:
+        system.destroy_device()
+
+    for label, seconds in results.items():
+        print(f'{label:>10}: {seconds * 1e6:10.2f} us per lookup')
+    print(f'{"speedup":>10}: {results["uncached"] / results["cached"]:10.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
@@ -0,0 +1,91 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+Walks the whole device nodemap from the 'Root' category through
+NodeCategory.features, keeping every node alive, and reports the time and
+the memory it takes per node.
+
+Run it as a module from the package directory, the one that holds
+arena_api and benchmarks:
+
+    python -m benchmarks.bench_node_proxies [--simulated]
+'''
+
+import time
+import tracemalloc
+
+from benchmarks import _cli
+
+NUMBER_OF_WALKS = 5
+
+
+def walk(category, nodes):
+    # a NodeCategory, arena_api._node is not imported before --simulated
+    # is applied
+    for node in category.features.values():
+        nodes.append(node)
+        if isinstance(node, type(category)):
+            walk(node, nodes)
+    return nodes
+
+
+def bench_node_proxies(nodemap):
+
+    root = nodemap['Root']
+
+    start = time.perf_counter()
+    for _ in range(NUMBER_OF_WALKS):
+        nodes = walk(root, [])
+    seconds = (time.perf_counter() - start) / NUMBER_OF_WALKS
+    del nodes
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        nodes = walk(root, [])
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'nodes': len(nodes),
+        'sec_per_node': seconds / len(nodes),
+        'bytes_per_node': (after - before) / len(nodes),
+        'peak_bytes': peak - before
+    }
+
+
+def benchmark_entry_point(argv=None):
+
+    _cli.parse_args('python -m benchmarks.bench_node_proxies', __doc__, argv)
+    from arena_api.system import system
+
+    devices = system.create_device()
+    if not len(devices):
+        raise Exception(f'No device found!\n'
+                        f'Please connect a device and run the benchmark again.')
+
+    try:
+        results = bench_node_proxies(devices[0].nodemap)
+    finally:
+        system.destroy_device()
+
+    print(f'{"nodes":>16}: {results["nodes"]:10d}')
+    print(f'{"time per node":>16}: {results["sec_per_node"] * 1e6:10.2f} us')
+    print(f'{"memory per node":>16}: {results["bytes_per_node"]:10.0f} bytes')
+    print(f'{"peak memory":>16}: {results["peak_bytes"] / 1024:10.0f} KiB')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
@@ -0,0 +1,94 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+
+'''
+Startup cost with several devices, sequential against parallel:
+    - enumeration : system.device_infos, one update for all interfaces
+      against one update per interface on its own thread
+    - create_device : the devices of system.device_infos opened one at a
+      time against CREATE_DEVICE_MAX_WORKERS at a time
+The devices are destroyed after each creation. With a single interface the
+enumerations are the same.
+
+    python -m benchmarks.bench_open_devices [--simulated]
+'''
+
+import time
+
+from benchmarks import _cli
+
+DISCOVERY_TIMEOUT_MILLISEC = 100
+# with --simulated, discovery and opening take time like on a network
+SIMULATION = {'devices': 4, 'interfaces': 2, 'discovery_sec': 0.02,
+              'open_sec': 0.05}
+
+
+def bench_enumeration(per_interface):
+    from arena_api.system import system
+
+    system.DEVICE_INFOS_PER_INTERFACE = per_interface
+    system.invalidate_device_infos()
+    started_at = time.perf_counter()
+    device_infos = system.device_infos
+    return device_infos, time.perf_counter() - started_at
+
+
+def bench_create_device(device_infos, max_workers):
+    from arena_api.system import system
+
+    system.CREATE_DEVICE_MAX_WORKERS = max_workers
+    try:
+        system.create_device(device_infos)
+        report = system.create_device_report
+    finally:
+        system.destroy_device()
+    return report['total_sec'], sum(report['open_sec'].values())
+
+
+def benchmark_entry_point(argv=None):
+
+    _cli.parse_args('python -m benchmarks.bench_open_devices', __doc__, argv,
+                    SIMULATION)
+    from arena_api.system import system
+
+    system.DEVICE_INFOS_TIMEOUT_MILLISEC = DISCOVERY_TIMEOUT_MILLISEC
+    max_workers = system.CREATE_DEVICE_MAX_WORKERS
+    per_interface = system.DEVICE_INFOS_PER_INTERFACE
+    try:
+        _, sequential_sec = bench_enumeration(False)
+        device_infos, parallel_sec = bench_enumeration(True)
+        if not device_infos:
+            raise Exception(f'No device found!\n'
+                            f'Please connect a device and run the '
+                            f'benchmark again.')
+
+        print(f'{len(device_infos)} devices on '
+              f'{len(system.interface_infos)} interfaces, discovery '
+              f'timeout {DISCOVERY_TIMEOUT_MILLISEC} ms')
+        print(f'{"enumeration":>14}: {sequential_sec * 1e3:10.1f} ms '
+              f'sequential {parallel_sec * 1e3:10.1f} ms per interface')
+
+        sequential_sec, _ = bench_create_device(device_infos, 1)
+        parallel_sec, open_sec = bench_create_device(device_infos,
+                                                     max_workers)
+        print(f'{"create_device":>14}: {sequential_sec * 1e3:10.1f} ms '
+              f'sequential {parallel_sec * 1e3:10.1f} ms with '
+              f'{max_workers} workers, {open_sec * 1e3:.1f} ms of opens')
+    finally:
+        system.CREATE_DEVICE_MAX_WORKERS = max_workers
+        system.DEVICE_INFOS_PER_INTERFACE = per_interface
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
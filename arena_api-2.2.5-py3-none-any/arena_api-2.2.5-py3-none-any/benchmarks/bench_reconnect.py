@@ -0,0 +1,105 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+
+'''
+Recovery latency of ResilientDevice. The first device found streams while
+it is reset NUMBER_OF_RESETS times with DeviceReset, each reset is a
+disconnection and a reboot. For every incident:
+    - rediscovery : from the disconnection to the device enumerated again
+    - downtime : from the disconnection to the stream restarted
+    - first frame : from the disconnection to the first buffer after it
+    - restored nodes : nodes written to bring the configuration back
+A reboot takes seconds on a real device, it bounds the rediscovery.
+
+    python -m benchmarks.bench_reconnect [--simulated]
+'''
+
+import time
+
+from benchmarks import _cli
+
+NUMBER_OF_RESETS = 3
+NUMBER_OF_BUFFERS = 10
+RECONNECT_TIMEOUT_SEC = 60.0
+GET_BUFFER_TIMEOUT_MILLISEC = 2000
+# with --simulated, a small sensor and a short reboot
+SIMULATION = {'sensor_width': 640, 'sensor_height': 480, 'reset_sec': 0.5}
+
+
+def bench_reconnect(device):
+    from arena_api.resilient_device import ResilientDevice
+
+    first_frame_sec = []
+    with ResilientDevice(device,
+                         reconnect_timeout_sec=RECONNECT_TIMEOUT_SEC,
+                         poll_interval_sec=0.05) as resilient:
+        with resilient.start_stream(NUMBER_OF_BUFFERS):
+            for _ in range(NUMBER_OF_RESETS):
+                resilient.requeue_buffer(
+                    resilient.get_buffer(timeout=GET_BUFFER_TIMEOUT_MILLISEC))
+
+                number_of_incidents = len(resilient.incidents)
+                reset_at = time.monotonic()
+                resilient.nodemap.get_node('DeviceReset').execute()
+
+                # the disconnect callback clears is_connected
+                while resilient.is_connected() and \
+                        len(resilient.incidents) == number_of_incidents:
+                    if time.monotonic() - reset_at > RECONNECT_TIMEOUT_SEC:
+                        raise Exception('device was not disconnected by '
+                                        'DeviceReset')
+                    time.sleep(0.001)
+                if not resilient.wait_until_connected(RECONNECT_TIMEOUT_SEC):
+                    raise Exception(f'device did not recover: '
+                                    f'{resilient.incidents[-1]["error"]}')
+
+                buffer = resilient.get_buffer(
+                    timeout=GET_BUFFER_TIMEOUT_MILLISEC)
+                first_frame_sec.append(time.time() -
+                                       resilient.incidents[-1]
+                                       ['disconnected_at'])
+                resilient.requeue_buffer(buffer)
+        device = resilient.device
+    return device, resilient.incidents, first_frame_sec
+
+
+def benchmark_entry_point(argv=None):
+
+    _cli.parse_args('python -m benchmarks.bench_reconnect', __doc__, argv,
+                    SIMULATION)
+    from arena_api.system import system
+
+    device_infos = system.device_infos
+    if not device_infos:
+        raise Exception(f'No device found!\n'
+                        f'Please connect a device and run the benchmark '
+                        f'again.')
+    device = system.create_device(device_infos[0])[0]
+    try:
+        device, incidents, first_frame_sec = bench_reconnect(device)
+    finally:
+        system.destroy_device()
+
+    print(f'{"incident":>8} {"rediscovery ms":>15} {"downtime ms":>12} '
+          f'{"first frame ms":>15} {"restored nodes":>15}')
+    for number, (incident, first_frame) in enumerate(
+            zip(incidents, first_frame_sec)):
+        print(f'{number:8d} {incident["rediscovery_sec"] * 1e3:15.1f} '
+              f'{incident["downtime_sec"] * 1e3:12.1f} '
+              f'{first_frame * 1e3:15.1f} '
+              f'{incident["restored_nodes"]:15d}')
+
+
+if __name__ == '__main__':
+    benchmark_entry_point()
@@ -0,0 +1,619 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+'''
+End to end benchmark suite. Times the paths most applications go through,
+on the first device found or on the simulated ArenaC:
+    - stream : get_buffer/requeue_buffer round trips, includes the wait
+      for a frame
+    - buffer : metadata properties, 'data' copy against zero copy views
+    - buffer_factory : copy and convert per pixel format
+    - nodemap : node lookups, bulk and per node value reads and writes
+    - writer : Writer.save per file format
+    - recorder : Recorder.append per codec
+Every case is auto ranged then repeated, the per call median and best are
+written as JSON. A case that fails on its first call, like the image
+factory or SaveC on the simulator, is reported as skipped with the reason.
+A pure Python calibration loop is timed the same way before and after the
+cases.
+
+Results are compared with a stored baseline, by default the one in
+benchmarks/baselines/ for the backend used. The best time of a case over
+the repeats is divided by the calibration time of its run, so a machine
+that is uniformly faster or slower than the one of the baseline compares
+equal. The baseline is recorded over BASELINE_RUNS runs of the suite and
+keeps, for every case, the median of these calibrated times and its
+noise, how much slower the slowest run was. A case slower than the
+baseline by more than its noise plus the tolerance is a regression and
+makes the exit status 1, so a steady case is held to a tighter limit than
+a case like buffer.data whose time depends on the state of the allocator.
+The groups of the cases over their limit are run again, up to
+CONFIRM_RUNS times, and the fastest calibrated time of each case is kept,
+so a burst of load on the machine is not reported as a regression.
+Cases skipped by either run, for example without numpy, are not compared.
+
+    python -m benchmarks.suite --simulated
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --simulated --update-baseline
+'''
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from contextlib import contextmanager
+from pathlib import Path
+
+from arena_api import arena_api_config
+from benchmarks import _cli
+
+REPEAT = 10
+# margin on top of the noise of a case
+TOLERANCE = 0.25
+BASELINE_RUNS = 5
+CONFIRM_RUNS = 2
+BASELINES_DIR = Path(__file__).parent / 'baselines'
+
+# fast enough for the stream cases to measure the API, not the frame period
+SIMULATION = {
+    'width': 1024,
+    'height': 768,
+    'frame_rate': 50000.0,
+    'exposure_time': 20.0,
+    'seed': 0
+}
+
+PIXEL_FORMATS = ('Mono8', 'Mono12p', 'Mono16', 'BayerRG8', 'RGB8')
+CONVERT_TO = ('Mono8', 'BGR8')
+WRITER_EXTENSIONS = ('.jpg', '.png', '.bmp', '.tiff', '.raw')
+RECORDER_CODECS = (('h264', 'mp4', 'bgr8'),
+                   ('h264', 'mov', 'rgb8'),
+                   ('raw', 'avi', 'bgr8'))
+
+NUMBER_OF_BUFFERS = 10
+METADATA = ('width', 'height', 'pixel_format', 'bits_per_pixel', 'frame_id',
+            'timestamp_ns', 'payload_size', 'is_incomplete')
+NODE_NAMES = ('Width', 'Height', 'PixelFormat', 'ExposureTime', 'Gain')
+
+
+# cases -----------------------------------------------------------------------
+#
+# every group is a context manager that prepares the device and yields a
+# dict of case name to a callable taking no argument
+#
+
+
+@contextmanager
+def stream_cases(device):
+
+    def get_and_requeue():
+        device.requeue_buffer(device.get_buffer())
+
+    with device.start_stream(NUMBER_OF_BUFFERS):
+        yield {'stream.get_requeue': get_and_requeue}
+
+
+@contextmanager
+def buffer_cases(device):
+    from arena_api.buffer_lease import BufferLeaser
+
+    def metadata():
+        for name in METADATA:
+            getattr(buffer, name)
+
+    def ndarray():
+        return lease.ndarray()
+
+    with device.start_stream(NUMBER_OF_BUFFERS):
+        lease = BufferLeaser(device).get()
+        buffer = lease.buffer
+        try:
+            yield {
+                'buffer.metadata': metadata,
+                'buffer.data': lambda: buffer.data,
+                'buffer.memoryview': lease.memoryview,
+                'buffer.ndarray': ndarray
+            }
+        finally:
+            lease.release()
+
+
+@contextmanager
+def _pixel_format(device, pixel_format):
+    node = device.nodemap['PixelFormat']
+    previous = node.value
+    node.value = pixel_format
+    try:
+        yield
+    finally:
+        node.value = previous
+
+
+@contextmanager
+def buffer_factory_cases(device):
+    from arena_api.buffer import BufferFactory
+
+    def copy(buffer):
+        def function():
+            BufferFactory.destroy(BufferFactory.copy(buffer))
+        return function
+
+    def convert(buffer, pixel_format):
+        def function():
+            BufferFactory.destroy(BufferFactory.convert(buffer, pixel_format))
+        return function
+
+    def add_cases(cases, pixel_format, buffer=None, error=None):
+        cases[f'buffer_factory.copy[{pixel_format}]'] = \
+            _raiser(error) if error else copy(buffer)
+        for target in CONVERT_TO:
+            if target != pixel_format:
+                cases[f'buffer_factory.convert[{pixel_format}->{target}]'] = \
+                    _raiser(error) if error else convert(buffer, target)
+
+    # a copy of one buffer of each pixel format, the stream is stopped to
+    # change the pixel format
+    copies = []
+    cases = {}
+    try:
+        for pixel_format in PIXEL_FORMATS:
+            if pixel_format not in \
+                    device.nodemap['PixelFormat'].enumentry_names:
+                continue
+            with _pixel_format(device, pixel_format), \
+                    device.start_stream(1):
+                buffer = device.get_buffer()
+                try:
+                    buffer_copy = BufferFactory.copy(buffer)
+                except Exception as error:
+                    add_cases(cases, pixel_format, error=error)
+                    continue
+                finally:
+                    device.requeue_buffer(buffer)
+            copies.append(buffer_copy)
+            add_cases(cases, pixel_format, buffer_copy)
+        yield cases
+    finally:
+        for buffer_copy in copies:
+            BufferFactory.destroy(buffer_copy)
+
+
+@contextmanager
+def nodemap_cases(device):
+    nodemap = device.nodemap
+    nodes = nodemap.get_node(list(NODE_NAMES))
+    values = nodemap.get_values(list(NODE_NAMES))
+    width = nodes['Width']
+    exposure_time = nodes['ExposureTime']
+    pixel_format = nodes['PixelFormat']
+
+    def lookup_uncached():
+        nodemap._clear_node_cache()
+        return nodemap['ExposureTime']
+
+    cases = {
+        'nodemap.lookup': lambda: nodemap['ExposureTime'],
+        'nodemap.lookup_uncached': lookup_uncached,
+        'nodemap.get_values': lambda: nodemap.get_values(list(NODE_NAMES)),
+        'nodemap.set_values': lambda: nodemap.set_values(
+            {name: values[name] for name in ('Width', 'ExposureTime')}),
+        'nodemap.integer.get': lambda: width.value,
+        'nodemap.float.get': lambda: exposure_time.value,
+        'nodemap.enumeration.get': lambda: pixel_format.value,
+    }
+
+    def setter(node, value):
+        def function():
+            node.value = value
+        return function
+
+    cases['nodemap.integer.set'] = setter(width, values['Width'])
+    cases['nodemap.float.set'] = setter(exposure_time, values['ExposureTime'])
+    cases['nodemap.enumeration.set'] = setter(pixel_format,
+                                           values['PixelFormat'])
+    yield cases
+
+
+@contextmanager
+def writer_cases(device):
+    from arena_api.__future__.save import Writer
+
+    def save(writer, buffer):
+        def function():
+            writer.save(buffer)
+        return function
+
+    with tempfile.TemporaryDirectory() as output_dir, \
+            device.start_stream(NUMBER_OF_BUFFERS):
+        buffer = device.get_buffer()
+        try:
+            cases = {}
+            for extension in WRITER_EXTENSIONS:
+                try:
+                    writer = Writer()
+                except KeyboardInterrupt:
+                    raise
+                except BaseException as error:
+                    # SaveC raises BaseException when it is not installed
+                    cases[f'writer.save[{extension}]'] = _raiser(error)
+                    continue
+                writer.output_dir = output_dir
+                # the same file is overwritten
+                writer.pattern = f'image{extension}'
+                cases[f'writer.save[{extension}]'] = save(writer, buffer)
+            yield cases
+        finally:
+            device.requeue_buffer(buffer)
+
+
+@contextmanager
+def recorder_cases(device):
+    from arena_api.__future__.save import Recorder
+
+    recorders = []
+
+    def append(recorder, buffer):
+        def function():
+            recorder.append(buffer)
+        return function
+
+    with tempfile.TemporaryDirectory() as output_dir, \
+            device.start_stream(NUMBER_OF_BUFFERS):
+        buffer = device.get_buffer()
+        try:
+            cases = {}
+            for codec in RECORDER_CODECS:
+                name = f'recorder.append[{"/".join(codec)}]'
+                try:
+                    recorder = Recorder(buffer.width, buffer.height, 30)
+                    recorder.codec = codec
+                    recorder.output_dir = output_dir
+                    recorder.open()
+                except KeyboardInterrupt:
+                    raise
+                except BaseException as error:
+                    cases[name] = _raiser(error)
+                    continue
+                recorders.append(recorder)
+                cases[name] = append(recorder, buffer)
+            yield cases
+        finally:
+            for recorder in recorders:
+                recorder.close()
+            device.requeue_buffer(buffer)
+
+
+def _reason(error):
+    return f'{type(error).__name__}: {" ".join(str(error).split())}'
+
+
+def _raiser(error):
+    # a case that could not be set up, it is skipped on its first call
+    def function():
+        raise error
+    return function
+
+
+GROUPS = {
+    'stream': stream_cases,
+    'buffer': buffer_cases,
+    'buffer_factory': buffer_factory_cases,
+    'nodemap': nodemap_cases,
+    'writer': writer_cases,
+    'recorder': recorder_cases
+}
+
+
+# measure ---------------------------------------------------------------------
+
+
+def _calibration_loop():
+    # calls, attribute lookups and small allocations, what the API cases
+    # spend their Python time on
+    values = []
+    for index in range(200):
+        values.append(str(index))
+    return ''.join(values)
+
+
+def calibrate(repeat=REPEAT):
+    """
+    best per call time of the calibration loop in microseconds
+    """
+    return measure(_calibration_loop, repeat)['best_us']
+
+
+def measure(function, repeat=REPEAT):
+    """
+    per call time of function in seconds, auto ranged so one repeat takes
+    at least 0.2 seconds
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat, number)]
+    return {
+        'median_us': statistics.median(per_call) * 1e6,
+        'best_us': min(per_call) * 1e6,
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def run_group(device, group, repeat, results, skipped):
+    try:
+        with GROUPS[group](device) as cases:
+            for name, function in cases.items():
+                try:
+                    function()
+                except KeyboardInterrupt:
+                    raise
+                except BaseException as error:
+                    skipped[name] = _reason(error)
+                    continue
+                results[name] = measure(function, repeat)
+                print(f'{name:>40} {results[name]["median_us"]:12.2f} us')
+    except KeyboardInterrupt:
+        raise
+    except BaseException as error:
+        # the group could not be set up at all
+        skipped[group] = _reason(error)
+
+
+def run_suite(groups=None, repeat=REPEAT):
+    from arena_api.system import system
+    from arena_api.version import __version__
+
+    devices = system.create_device()
+    if not len(devices):
+        raise Exception(f'No device found!\n'
+                        f'Please connect a device or use --simulated and '
+                        f'run the benchmark again.')
+
+    device = devices[0]
+    results = {}
+    skipped = {}
+    # the lowest of before and after, the machine is least disturbed then
+    calibration_us = calibrate(repeat)
+    try:
+        snapshot = device.nodemap.snapshot()
+        try:
+            for group in groups or GROUPS:
+                run_group(device, group, repeat, results, skipped)
+        finally:
+            device.nodemap.restore(snapshot)
+        model = device.nodemap['DeviceModelName'].value
+    finally:
+        system.destroy_device()
+    calibration_us = min(calibration_us, calibrate(repeat))
+
+    simulated = arena_api_config.ARENAC_SIMULATED
+    return {
+        'meta': {
+            'backend': 'simulated' if simulated else 'hardware',
+            'simulation': dict(SIMULATION) if simulated else None,
+            'device_model': model,
+            'arena_api': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'calibration_us': calibration_us
+        },
+        'results': results,
+        'skipped': skipped
+    }
+
+
+# baseline --------------------------------------------------------------------
+
+
+def _is_skipped(name, report):
+    # the case, or its whole group, was skipped
+    skipped = report.get('skipped', {})
+    return name in skipped or name.split('.')[0] in skipped
+
+
+def _calibrated(result, report):
+    # results kept from a confirmation run have their own calibration
+    return result['best_us'] / result.get('calibration_us',
+                                          report['meta']['calibration_us'])
+
+
+def keep_fastest(report, rerun):
+    """
+    report with the cases of rerun that were faster, calibrated, in rerun
+    """
+    report = dict(report, results=dict(report['results']))
+    for name, result in rerun['results'].items():
+        result = dict(result,
+                      calibration_us=rerun['meta']['calibration_us'])
+        if name not in report['results'] or \
+                _calibrated(result, rerun) < \
+                _calibrated(report['results'][name], report):
+            report['results'][name] = result
+    return report
+
+
+def make_baseline(reports):
+    """
+    baseline of several reports of the same suite. Each case keeps the
+    result of its median run with 'calibrated', its calibrated best time
+    in that run, and 'noise', the slowest run over the median run minus 1
+    """
+    baseline = dict(reports[0])
+    baseline['meta'] = dict(reports[0]['meta'], runs=len(reports))
+    baseline['results'] = {}
+    for name in reports[0]['results']:
+        runs = sorted((_calibrated(report['results'][name], report),
+                       report['results'][name])
+                      for report in reports if name in report['results'])
+        if len(runs) < len(reports):
+            # failed in some runs only, not steady enough to compare
+            continue
+        calibrated, result = runs[len(runs) // 2]
+        baseline['results'][name] = dict(
+            result, calibrated=calibrated,
+            noise=runs[-1][0] / calibrated - 1)
+    return baseline
+
+
+def compare(report, baseline, tolerance=TOLERANCE, groups=None):
+    """
+    list of (name, baseline best us, best us, ratio, limit, status), status
+    is 'regression', 'improvement', 'ok', 'new', 'missing' or 'skipped'.
+    The ratio is of the best times, each divided by the calibration time
+    of its run. The limit of a case is (1 + noise) * (1 + tolerance), with
+    the noise of the case in the baseline. Only the cases of groups are
+    compared if it is given
+    """
+
+    rows = []
+    current = report['results']
+    previous = {name: result
+                for name, result in baseline['results'].items()
+                if not groups or name.split('.')[0] in groups}
+    for name in sorted(set(current) | set(previous)):
+        if name not in previous:
+            status = 'skipped' if _is_skipped(name, baseline) else 'new'
+            rows.append((name, None, current[name]['best_us'], None, None,
+                         status))
+            continue
+        if name not in current:
+            status = 'skipped' if _is_skipped(name, report) else 'missing'
+            rows.append((name, previous[name]['best_us'], None, None, None,
+                         status))
+            continue
+        ratio = _calibrated(current[name], report) / \
+            previous[name]['calibrated']
+        limit = (1 + previous[name]['noise']) * (1 + tolerance)
+        if ratio > limit:
+            status = 'regression'
+        elif ratio < 1 / limit:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, previous[name]['best_us'],
+                     current[name]['best_us'], ratio, limit, status))
+    return rows
+
+
+def print_comparison(rows):
+    print(f'{"case":>40} {"baseline us":>12} {"current us":>12} '
+          f'{"ratio":>7} {"limit":>7}  status (best times, ratio calibrated)')
+    for name, previous, current, ratio, limit, status in rows:
+        previous = f'{previous:12.2f}' if previous is not None else ' ' * 12
+        current = f'{current:12.2f}' if current is not None else ' ' * 12
+        ratio = f'{ratio:7.2f}' if ratio is not None else ' ' * 7
+        limit = f'{limit:7.2f}' if limit is not None else ' ' * 7
+        print(f'{name:>40} {previous} {current} {ratio} {limit}  {status}')
+
+
+def _write_json(pathname, report):
+    pathname = Path(pathname)
+    pathname.parent.mkdir(parents=True, exist_ok=True)
+    with open(str(pathname), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.suite',
+        description='arena_api end to end benchmark suite')
+    _cli.add_simulated_argument(parser)
+    parser.add_argument('--group', action='append', choices=list(GROUPS),
+                        help='run only this group, can be repeated')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--baseline',
+                        help='baseline to compare with, default '
+                             'benchmarks/baselines/<backend>.json')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed calibrated slow down on top of the '
+                             'noise of a case before it is a regression, '
+                             'default 0.25 for 25%%')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the results of --baseline-runs runs '
+                             'as the baseline')
+    parser.add_argument('--confirm-runs', type=int, default=CONFIRM_RUNS,
+                        help='times the groups of regressed cases are run '
+                             f'again, default {CONFIRM_RUNS}')
+    parser.add_argument('--baseline-runs', type=int, default=BASELINE_RUNS,
+                        help='runs the baseline noise of a case is measured '
+                             f'over, default {BASELINE_RUNS}')
+    return parser.parse_args(argv)
+
+
+def benchmark_entry_point(argv=None):
+
+    args = _parse_args(argv)
+
+    if args.simulated:
+        _cli.use_simulated(SIMULATION)
+
+    report = run_suite(args.group, args.repeat)
+
+    for name, reason in report['skipped'].items():
+        print(f'{name:>40} skipped, {reason}')
+
+    if args.output:
+        _write_json(args.output, report)
+
+    baseline_pathname = Path(args.baseline) if args.baseline else \
+        BASELINES_DIR / f'{report["meta"]["backend"]}.json'
+
+    if args.update_baseline:
+        reports = [report] + [run_suite(args.group, args.repeat)
+                              for _ in range(args.baseline_runs - 1)]
+        _write_json(baseline_pathname, make_baseline(reports))
+        print(f'baseline written to {baseline_pathname}')
+        return 0
+
+    if not baseline_pathname.exists():
+        print(f'no baseline at {baseline_pathname}, run with '
+              f'--update-baseline to create it')
+        return 0
+
+    with open(str(baseline_pathname), 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['meta']['backend'] != report['meta']['backend']:
+        print(f'warning: the baseline was measured on '
+              f'{baseline["meta"]["backend"]}')
+
+    if 'runs' not in baseline['meta']:
+        print(f'the baseline has no noise figures, record it again with '
+              f'--update-baseline')
+        return 1
+
+    rows = compare(report, baseline, args.tolerance, args.group)
+    for _ in range(args.confirm_runs):
+        groups = sorted({row[0].split('.')[0] for row in rows
+                         if row[5] == 'regression'})
+        if not groups:
+            break
+        print(f'running {groups} again to confirm')
+        report = keep_fastest(report, run_suite(groups, args.repeat))
+        rows = compare(report, baseline, args.tolerance, args.group)
+    if args.output:
+        _write_json(args.output, report)
+
+    print_comparison(rows)
+    return 1 if any(row[5] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(benchmark_entry_point())
@@ -0,0 +1,76 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2022, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+
+import ctypes
+import ctypes.util
+import unittest
+
+from arena_api import arena_api_config
+
+# _xfast imports harenac, the simulator avoids loading ArenaC
+arena_api_config.ARENAC_SIMULATED = True
+
+from arena_api._xlayer.xarena import _xfast  # noqa: E402
+
+
+class _Raised(Exception):
+    pass
+
+
+def _raising_errcheck(result, func, arguments):
+    raise _Raised()
+
+
+class TestReplaceErrchecks(unittest.TestCase):
+
+    def setUp(self):
+        name = ctypes.util.find_library('c')
+        if name is None:
+            self.skipTest('no C library to load')
+        self.library = ctypes.CDLL(name)
+
+    def test_configured_functions_get_the_new_errcheck(self):
+        labs = self.library.labs
+        labs.argtypes = [ctypes.c_long]
+        labs.restype = ctypes.c_long
+        labs.errcheck = _raising_errcheck
+
+        _xfast._replace_errchecks(self.library, _xfast._errcheck)
+
+        self.assertIs(labs.errcheck, _xfast._errcheck)
+        # a zero AC_ERROR passes the check
+        self.assertIsNone(labs(0))
+
+    def test_errcheck_set_after_is_still_called(self):
+        labs = self.library.labs
+        labs.errcheck = _raising_errcheck
+        _xfast._replace_errchecks(self.library, _xfast._errcheck)
+
+        # the _FuncPtr class keeps the ctypes errcheck descriptor
+        self.assertNotIn('errcheck', vars(self.library._FuncPtr))
+        strlen = self.library.strlen
+        strlen.argtypes = [ctypes.c_char_p]
+        strlen.restype = ctypes.c_size_t
+        strlen.errcheck = _raising_errcheck
+        with self.assertRaises(_Raised):
+            strlen(b'arena')
+
+    def test_functions_without_errcheck_are_left_alone(self):
+        strlen = self.library.strlen
+        _xfast._replace_errchecks(self.library, _xfast._errcheck)
+        self.assertIsNone(strlen.errcheck)
+
+
+if __name__ == '__main__':
+    unittest.main()